@@ -0,0 +1,67 @@
+"""
+Compares the enriched and compact chunk storage modes on a CV directory:
+stored bytes, embedding input tokens and prompt context tokens.
+
+Usage: python -m benchmarks.bench_chunk_storage [data/top100]
+No database or model calls are made; only the .env settings must load.
+"""
+import json
+import random
+import sys
+
+from src.services.ingestion import list_ingestible_files, _load_and_parse, _create_chunks, _candidate_record
+from src.services.context import format_context
+from src.utils.tokens import get_token_counter
+
+SESSION_ID = "bench"
+TRIALS = 200
+CANDIDATES_PER_PROMPT = 3
+CHUNKS_PER_CANDIDATE = 4
+
+def stored_bytes(documents, records=()) -> int:
+    size = sum(len(d.page_content.encode()) + len(json.dumps(d.metadata).encode()) for d in documents)
+    return size + sum(len(json.dumps(r).encode()) for r in records)
+
+def legacy_context(docs) -> str:
+    # Previous chat.format_docs: every chunk with its own header
+    return "\n\n".join(doc.page_content for doc in docs)
+
+def main(directory: str):
+    count_tokens, tokenizer = get_token_counter()
+    parsed = [_load_and_parse(path) for path in sorted(list_ingestible_files(directory))]
+    parsed = [p for p in parsed if p.email]
+
+    enriched = {p.email: _create_chunks(p, SESSION_ID, "enriched") for p in parsed}
+    compact = {p.email: _create_chunks(p, SESSION_ID, "compact") for p in parsed}
+    records = {p.email: _candidate_record(p, SESSION_ID) for p in parsed}
+
+    all_enriched = [d for docs in enriched.values() for d in docs]
+    all_compact = [d for docs in compact.values() for d in docs]
+
+    # Simulated retrieval: a few candidates, several chunks each
+    rng = random.Random(0)
+    emails = list(enriched)
+    old_prompt = new_prompt = 0
+    for _ in range(TRIALS):
+        picked = rng.sample(emails, CANDIDATES_PER_PROMPT)
+        indices = {e: rng.sample(range(len(enriched[e])), min(CHUNKS_PER_CANDIDATE, len(enriched[e]))) for e in picked}
+        old_docs = [enriched[e][i] for e in picked for i in indices[e]]
+        new_docs = [compact[e][i] for e in picked for i in indices[e]]
+        old_prompt += count_tokens(legacy_context(old_docs))
+        new_prompt += count_tokens(format_context(new_docs, records))
+
+    rows = [
+        ("stored bytes", stored_bytes(all_enriched), stored_bytes(all_compact, records.values())),
+        ("embedding tokens", sum(count_tokens(d.page_content) for d in all_enriched),
+         sum(count_tokens(d.page_content) for d in all_compact)),
+        ("prompt tokens / question", old_prompt / TRIALS, new_prompt / TRIALS),
+    ]
+
+    print(f"{len(parsed)} candidates, {len(all_enriched)} chunks, tokenizer: {tokenizer}")
+    print(f"prompt: {CANDIDATES_PER_PROMPT} candidates x {CHUNKS_PER_CANDIDATE} chunks, {TRIALS} trials")
+    print(f"{'metric':<26}{'enriched':>12}{'compact':>12}{'saved':>9}")
+    for name, old, new in rows:
+        print(f"{name:<26}{old:>12.0f}{new:>12.0f}{(1 - new / old) * 100:>8.1f}%")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "data/top100")
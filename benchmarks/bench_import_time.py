@@ -0,0 +1,86 @@
+"""
+Cold import time of the entry points, measured with `python -X importtime` in
+fresh interpreters, plus the provider SDKs each one loads. Only the configured
+LLM / embedding provider may be imported at startup; any other provider module
+showing up is reported as a regression (exit code 1).
+
+Usage: python -m benchmarks.bench_import_time [module ...] [--runs N]
+Defaults to src.main and src.cli; the .env settings must load.
+"""
+import statistics
+import subprocess
+import sys
+
+from src.core.providers import CHAT_MODEL_CLASSES, EMBEDDING_CLASSES
+
+DEFAULT_MODULES = ["src.main", "src.cli"]
+RUNS = 5
+TOP = 10
+
+PROVIDER_MODULES = {path.split(":")[0] for path in [*CHAT_MODEL_CLASSES.values(), *EMBEDDING_CLASSES.values()]}
+# Heavy optional modules that only one backend needs
+OPTIONAL_MODULES = PROVIDER_MODULES | {"langchain_mongodb"}
+
+def parse_importtime(stderr: str):
+    """(total microseconds, {top-level package: cumulative microseconds}, imported modules)."""
+    total, packages, modules = 0, {}, set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        modules.add(name)
+        if depth == 0:
+            total += int(cumulative)
+        # Attribute each package once, at its outermost import
+        top = name.split(".")[0]
+        if name == top and top not in packages:
+            packages[top] = int(cumulative)
+    return total, packages, modules
+
+def measure(module: str):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+def main(modules, runs):
+    from src.config import LLM_PROVIDER, EMBEDDING_LLM_PROVIDER, VECTOR_STORE_PROVIDER
+    allowed = {
+        CHAT_MODEL_CLASSES.get(LLM_PROVIDER, "").split(":")[0],
+        EMBEDDING_CLASSES.get(EMBEDDING_LLM_PROVIDER, "").split(":")[0],
+    }
+    if VECTOR_STORE_PROVIDER == "mongodb":
+        allowed.add("langchain_mongodb")
+
+    regressions = 0
+    print(f"LLM: {LLM_PROVIDER}, embeddings: {EMBEDDING_LLM_PROVIDER}, vector store: {VECTOR_STORE_PROVIDER}, {runs} runs")
+    for module in modules:
+        samples = [measure(module) for _ in range(runs)]
+        totals = [s[0] / 1000 for s in samples]
+        _, packages, imported = samples[-1]
+
+        print(f"\n{module}: min {min(totals):.0f} ms, median {statistics.median(totals):.0f} ms")
+        for name, cumulative in sorted(packages.items(), key=lambda kv: -kv[1])[:TOP]:
+            print(f"  {name:<28}{cumulative / 1000:>8.1f} ms")
+
+        unexpected = sorted((OPTIONAL_MODULES & imported) - allowed)
+        if unexpected:
+            regressions += 1
+            print(f"  REGRESSION: imported at startup: {', '.join(unexpected)}")
+        else:
+            print("  no unused provider modules imported")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    runs = RUNS
+    if "--runs" in args:
+        i = args.index("--runs")
+        runs = int(args[i + 1])
+        del args[i:i + 2]
+    sys.exit(main(args or DEFAULT_MODULES, runs))
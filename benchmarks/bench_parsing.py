@@ -0,0 +1,90 @@
+"""
+Micro-benchmark of CV field extraction: the previous four-scan extractors
+against the single-pass extract_fields_batch, on data/top100 scaled up
+synthetically (every CV copied with shuffled body lines).
+
+Usage: python -m benchmarks.bench_parsing [data/top100] [copies]
+"""
+import random
+import re
+import sys
+import time
+
+from src.utils.parsing import (
+    EMAIL_REGEX, ROLE_KEYWORDS, ADDRESS_KEYWORDS, CandidateFields, extract_fields_batch
+)
+
+# --- Previous implementation, kept here as the baseline ---
+
+def legacy_extract_email(text):
+    match = re.search(EMAIL_REGEX, text)
+    return match.group(0).lower() if match else None
+
+def legacy_extract_name(text):
+    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    if lines:
+        first_line = lines[0]
+        if len(first_line) < 50 and "@" not in first_line:
+            return first_line
+    return "Not Found"
+
+def legacy_extract_address(text):
+    lines = [l.strip() for l in text.split("\n")]
+    for line in lines:
+        if any(kw in line for kw in ADDRESS_KEYWORDS) and len(line) < 100:
+            return line
+    return "Not Found"
+
+def legacy_extract_job_role(text):
+    lines = [l.strip() for l in text.split("\n")]
+    for line in lines:
+        if any(kw.lower() in line.lower() for kw in ROLE_KEYWORDS) and len(line) < 60:
+            return line
+    return "Not Found"
+
+def legacy_extract(text):
+    return CandidateFields(
+        email=legacy_extract_email(text),
+        name=legacy_extract_name(text),
+        address=legacy_extract_address(text),
+        role=legacy_extract_job_role(text),
+    )
+
+# --- Corpus ---
+
+def build_corpus(directory, copies):
+    from src.services.ingestion import list_ingestible_files, read_file_content
+
+    originals = [read_file_content(p) for p in sorted(list_ingestible_files(directory))]
+    rng = random.Random(0)
+    corpus = list(originals)
+    for _ in range(copies - 1):
+        for text in originals:
+            head, *body = text.split("\n")
+            rng.shuffle(body)
+            corpus.append("\n".join([head, *body]))
+    return corpus
+
+def best_of(fn, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def main(directory, copies):
+    corpus = build_corpus(directory, copies)
+    megabytes = sum(len(t) for t in corpus) / 1e6
+
+    legacy_time, legacy_result = best_of(lambda: [legacy_extract(t) for t in corpus])
+    new_time, new_result = best_of(lambda: extract_fields_batch(corpus))
+
+    mismatches = sum(1 for a, b in zip(legacy_result, new_result) if a != b)
+    print(f"{len(corpus)} documents, {megabytes:.1f} MB")
+    print(f"legacy (4 scans):   {legacy_time:.3f}s  {len(corpus) / legacy_time:,.0f} docs/s")
+    print(f"extract_fields:     {new_time:.3f}s  {len(corpus) / new_time:,.0f} docs/s")
+    print(f"speedup: {legacy_time / new_time:.1f}x, mismatches: {mismatches}")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "data/top100", int(sys.argv[2]) if len(sys.argv) > 2 else 50)
@@ -0,0 +1,59 @@
+"""
+Benchmark of the offset-based SectionTextSplitter against LangChain's
+RecursiveCharacterTextSplitter on a CV directory (chunk_size=1000, overlap=200).
+
+Usage: python -m benchmarks.bench_text_splitter [data/top100] [copies]
+"""
+import os
+import sys
+import time
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from src.services.text_splitter import SectionTextSplitter, COMPATIBLE_SEPARATORS
+
+def load_corpus(directory, copies):
+    texts = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".txt"):
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                texts.append(f.read())
+    return texts * copies
+
+def langchain_splitter():
+    return RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, separators=COMPATIBLE_SEPARATORS)
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def main(directory, copies):
+    corpus = load_corpus(directory, copies)
+    shared_langchain = langchain_splitter()
+    compatible = SectionTextSplitter.compatible()
+    sections = SectionTextSplitter.sections()
+
+    cases = [
+        ("langchain, new instance per CV", lambda: [langchain_splitter().split_text(t) for t in corpus]),
+        ("langchain, shared instance", lambda: [shared_langchain.split_text(t) for t in corpus]),
+        ("native compatible", lambda: [compatible.split_text(t) for t in corpus]),
+        ("native compatible, spans only", lambda: [list(compatible.iter_spans(t)) for t in corpus]),
+        ("native sections", lambda: [sections.split_text(t) for t in corpus]),
+    ]
+    print(f"{len(corpus)} documents, {sum(len(t) for t in corpus) / 1e6:.1f} MB")
+    results = {}
+    baseline = None
+    for name, fn in cases:
+        elapsed, result = best_of(fn)
+        results[name] = result
+        baseline = baseline or elapsed
+        chunks = sum(len(r) for r in result)
+        print(f"{name:<34}{elapsed:8.3f}s  {len(corpus) / elapsed:>10,.0f} docs/s  {chunks:>6} chunks  {baseline / elapsed:5.1f}x")
+    identical = results["native compatible"] == results["langchain, shared instance"]
+    print(f"compatible output identical to langchain: {identical}")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "data/top100", int(sys.argv[2]) if len(sys.argv) > 2 else 10)
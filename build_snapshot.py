@@ -0,0 +1,15 @@
+import asyncio
+import os
+import sys
+from src.services.snapshot import build_snapshot
+from src.config import SAMPLE_DATA_DIR, SAMPLE_SNAPSHOT_PATH
+
+# Usage: python build_snapshot.py [directory] [output.npz]
+# Embeds the directory with the configured embedding model; rebuild after changing model or chunking.
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.join("data", SAMPLE_DATA_DIR)
+    output = sys.argv[2] if len(sys.argv) > 2 else SAMPLE_SNAPSHOT_PATH
+    manifest = asyncio.run(build_snapshot(directory, output))
+    size_mb = os.path.getsize(output) / 1e6
+    print(f"Wrote {output} ({size_mb:.1f} MB): {manifest['files']} files, {manifest['chunks']} chunks, "
+          f"{manifest['provider']}/{manifest['model']} dim={manifest['dim']}")
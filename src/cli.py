@@ -4,7 +4,7 @@ import glob
 from src.services.chat import ask_question
 from src.services.ingestion import ingest_single_cv, ingest_directory
 from src.utils.formatting import print_ingestion_info
-from src.database import get_db_client, DB_NAME, COLLECTION_NAME as RESUME_COLLECTION
+from src.database import close_db_clients
 
 async def process_ingestion(path: str, session_id: str):
     if not os.path.exists(path):
@@ -24,6 +24,14 @@ async def process_ingestion(path: str, session_id: str):
         print(f"  Total: {summary['total']}")
         print(f"  Successful: {summary['successful']}")
         print(f"  Failed: {summary['failed']}")
+        print(f"  Chunks: {summary['chunks']} in {summary['durationSeconds']}s ({summary['throughput']['filesPerSecond']} files/s)")
+        diff = summary['chunkDiff']
+        print(f"  Chunk diff: {diff['added']} added, {diff['kept']} kept, {diff['removed']} removed, {diff['linked']} linked")
+        for stage, timing in summary['stages'].items():
+            print(f"    {stage}: {timing['items']} items, {timing['busySeconds']}s busy")
+        writes = summary['writes']
+        print(f"  Writes: {writes['batches']} batches of <= {writes['batchSize']} (w={writes['writeConcern']}), "
+              f"mean {writes['meanSeconds']}s, max {writes['maxSeconds']}s, {writes['documentsPerSecond']} docs/s")
         if summary['errors']:
             print("  Errors:")
             for err in summary['errors']:
@@ -83,5 +91,7 @@ async def main():
         except Exception as e:
             print(f"Error: {e}")
 
+    close_db_clients()
+
 if __name__ == "__main__":
     asyncio.run(main())
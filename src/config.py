@@ -13,13 +13,19 @@ def get_required_env(key: str) -> str:
 # General
 LLM_PROVIDER = get_required_env("LLM_PROVIDER").lower()
 EMBEDDING_LLM_PROVIDER = get_required_env("EMBEDDING_LLM_PROVIDER").lower()
-# VECTOR_STORE_PROVIDER removed, implicitly mongodb
+# Options: mongodb (Atlas Vector Search), local (embedded NumPy store, no MongoDB needed)
+VECTOR_STORE_PROVIDER = os.getenv("VECTOR_STORE_PROVIDER", "mongodb").lower()
+LOCAL_VECTOR_STORE_DIR = os.getenv("LOCAL_VECTOR_STORE_DIR", os.path.join("data", "vector_store"))
 
-# MongoDB
-MONGODB_URI = get_required_env("MONGODB_URI")
-DB_NAME = get_required_env("MONGODB_DB_NAME")
-COLLECTION_NAME = get_required_env("MONGODB_COLLECTION")
-MONGODB_VECTOR_INDEX = get_required_env("MONGODB_VECTOR_INDEX")
+# MongoDB (only required when it is the vector store)
+_get_mongo_env = get_required_env if VECTOR_STORE_PROVIDER == "mongodb" else os.getenv
+MONGODB_URI = _get_mongo_env("MONGODB_URI")
+DB_NAME = _get_mongo_env("MONGODB_DB_NAME")
+COLLECTION_NAME = _get_mongo_env("MONGODB_COLLECTION")
+MONGODB_VECTOR_INDEX = _get_mongo_env("MONGODB_VECTOR_INDEX")
+# Connection pool shared by every request in the process
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
 
 # Model Specific
 # We allow these to be None if the user is not using that specific provider.
@@ -34,6 +40,18 @@ GOOGLE_EMBEDDING_MODEL = os.getenv("GOOGLE_EMBEDDING_MODEL")
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
+# Embedding Cache (document/chunk vectors keyed by provider, model and text hash)
+# Options: mongodb, disk, none
+EMBEDDING_CACHE_BACKEND = os.getenv(
+    "EMBEDDING_CACHE_BACKEND", "mongodb" if VECTOR_STORE_PROVIDER == "mongodb" else "disk"
+).lower()
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+EMBEDDING_CACHE_COLLECTION = os.getenv("EMBEDDING_CACHE_COLLECTION", "embedding_cache")
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join("data", "embedding_cache.sqlite3"))
+# In-memory query embedding cache (0 disables)
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL_SECONDS", "3600"))
+
 from src.core.constants import LangSmithConstants, QueryTranslationConstants
 
 # Security
@@ -41,8 +59,60 @@ ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",
 APP_API_KEY = os.getenv("APP_API_KEY")
 
 # Query Translation
-# Options: multi_query, hyde, decomposition, step_back, identity
+# Options: multi_query, hyde, decomposition, step_back, identity, adaptive (per question: identity, multi_query or decomposition)
 QUERY_TRANSLATION_TYPE = os.getenv("QUERY_TRANSLATION_TYPE", QueryTranslationConstants.DEFAULT_STRATEGY).lower()
+# Translation results cached by (strategy, model, normalised question); 0 disables the in-memory tier
+QUERY_TRANSLATION_CACHE_SIZE = int(os.getenv("QUERY_TRANSLATION_CACHE_SIZE", "1024"))
+QUERY_TRANSLATION_CACHE_TTL_SECONDS = float(os.getenv("QUERY_TRANSLATION_CACHE_TTL_SECONDS", "86400"))
+# Options: memory, mongodb (adds a tier shared by every replica, expired by a TTL index)
+QUERY_TRANSLATION_CACHE_BACKEND = os.getenv("QUERY_TRANSLATION_CACHE_BACKEND", "memory").lower()
+QUERY_TRANSLATION_CACHE_COLLECTION = os.getenv("QUERY_TRANSLATION_CACHE_COLLECTION", "query_translation_cache")
+# Adaptive routing: questions up to this many words use the original query only
+ADAPTIVE_SHORT_QUERY_WORDS = int(os.getenv("ADAPTIVE_SHORT_QUERY_WORDS", "4"))
+# ...and compound questions (joined clauses, compare/vs, ";", several "?") of at least this many words are decomposed
+ADAPTIVE_DECOMPOSE_MIN_WORDS = int(os.getenv("ADAPTIVE_DECOMPOSE_MIN_WORDS", "8"))
+
+# Full /chat answers cached by (session, session content version, strategy, model, question); 0 disables the in-memory tier
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "512"))
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600"))
+# Options: memory, mongodb (shared answer tier and session versions, needed with several replicas)
+ANSWER_CACHE_BACKEND = os.getenv("ANSWER_CACHE_BACKEND", "memory").lower()
+ANSWER_CACHE_COLLECTION = os.getenv("ANSWER_CACHE_COLLECTION", "answer_cache")
+SESSION_VERSION_COLLECTION = os.getenv("SESSION_VERSION_COLLECTION", "session_versions")
+
+# Retrieval fan-out over the translated queries
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "4"))
+RETRIEVAL_MAX_CONCURRENCY = int(os.getenv("RETRIEVAL_MAX_CONCURRENCY", "4"))
+RETRIEVAL_QUERY_TIMEOUT_SECONDS = float(os.getenv("RETRIEVAL_QUERY_TIMEOUT_SECONDS", "10"))
+# Merging of the per-query results: rrf (reciprocal rank fusion) or max (best similarity score)
+RETRIEVAL_FUSION = os.getenv("RETRIEVAL_FUSION", "rrf").lower()
+RETRIEVAL_RRF_K = int(os.getenv("RETRIEVAL_RRF_K", "60"))
+# Chunks passed on after fusion (0 keeps every unique chunk)
+RETRIEVAL_FINAL_TOP_K = int(os.getenv("RETRIEVAL_FINAL_TOP_K", "10"))
+# Search the original question while the translation LLM call runs
+RETRIEVAL_SPECULATIVE = os.getenv("RETRIEVAL_SPECULATIVE", "false").lower() == "true"
+# Speculative mode only: answer with the results available after this many seconds (0 waits for all)
+RETRIEVAL_DEADLINE_SECONDS = float(os.getenv("RETRIEVAL_DEADLINE_SECONDS", "0"))
+# Lexical (BM25) retrieval from an in-process per-session index. Options: off, hybrid (fused with vector search)
+RETRIEVAL_LEXICAL = os.getenv("RETRIEVAL_LEXICAL", "off").lower()
+RETRIEVAL_LEXICAL_TOP_K = int(os.getenv("RETRIEVAL_LEXICAL_TOP_K", "8"))
+# Hybrid mode: keyword-only questions (up to this many terms, all present in the session) skip embedding
+RETRIEVAL_LEXICAL_FAST_PATH = os.getenv("RETRIEVAL_LEXICAL_FAST_PATH", "true").lower() == "true"
+LEXICAL_FAST_PATH_MAX_TERMS = int(os.getenv("LEXICAL_FAST_PATH_MAX_TERMS", "3"))
+LEXICAL_INDEX_MAX_SESSIONS = int(os.getenv("LEXICAL_INDEX_MAX_SESSIONS", "32"))
+# Rebuild a session's index after this many seconds so writes from other replicas show up (0 = never)
+LEXICAL_INDEX_MAX_AGE_SECONDS = float(os.getenv("LEXICAL_INDEX_MAX_AGE_SECONDS", "300"))
+# Narrow the vector search to the candidates a question names (email, full name, role keyword)
+RETRIEVAL_QUERY_ANALYSIS = os.getenv("RETRIEVAL_QUERY_ANALYSIS", "false").lower() == "true"
+# Role keywords (utils/parsing.ROLE_KEYWORDS) narrow to candidates whose stored role contains them
+RETRIEVAL_ROLE_FILTER = os.getenv("RETRIEVAL_ROLE_FILTER", "true").lower() == "true"
+# A question naming exactly one candidate reads all of that candidate's chunks instead of searching
+RETRIEVAL_DIRECT_LOOKUP = os.getenv("RETRIEVAL_DIRECT_LOOKUP", "true").lower() == "true"
+QUERY_ANALYSIS_CANDIDATES_TTL_SECONDS = float(os.getenv("QUERY_ANALYSIS_CANDIDATES_TTL_SECONDS", "30"))
+
+# Prompt context: chunks are added in relevance order until the token budget is used (0 = no limit)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000"))
+CONTEXT_TOKENIZER_ENCODING = os.getenv("CONTEXT_TOKENIZER_ENCODING", "cl100k_base")
 
 # LangSmith Tracing
 LANGCHAIN_API_KEY = os.getenv("LANGCHAIN_API_KEY")
@@ -54,6 +124,42 @@ if LANGCHAIN_API_KEY:
     os.environ["LANGCHAIN_PROJECT"] = LangSmithConstants.PROJECT_NAME
     # LangChain will now automatically trace all calls
 
+# Directory ingestion pipeline
+INGEST_PARSE_WORKERS = int(os.getenv("INGEST_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+INGEST_PREPARE_CONCURRENCY = int(os.getenv("INGEST_PREPARE_CONCURRENCY", "4"))
+INGEST_EMBED_BATCH_SIZE = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "100"))
+INGEST_EMBED_CONCURRENCY = int(os.getenv("INGEST_EMBED_CONCURRENCY", "2"))
+INGEST_WRITE_CONCURRENCY = int(os.getenv("INGEST_WRITE_CONCURRENCY", "2"))
+# Chunks per unordered insert_many / bulk_write, and its write concern ("" = collection default, "majority", "1", "0")
+INGEST_WRITE_BATCH_SIZE = int(os.getenv("INGEST_WRITE_BATCH_SIZE", "500"))
+INGEST_WRITE_CONCERN = os.getenv("INGEST_WRITE_CONCERN", "").lower()
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "32"))
+
+# Text splitting (chunk_size=1000, chunk_overlap=200)
+# Options: compatible (same chunks as the LangChain recursive splitter), sections (CV headings, roles, bullets)
+TEXT_SPLITTER_MODE = os.getenv("TEXT_SPLITTER_MODE", "compatible").lower()
+
+# Chunk storage
+# Options: enriched (identity header repeated in every chunk), compact (header stored once per candidate)
+CHUNK_STORAGE_MODE = os.getenv("CHUNK_STORAGE_MODE", "enriched").lower()
+CANDIDATE_COLLECTION_NAME = os.getenv("CANDIDATE_COLLECTION_NAME", "candidates")
+# Options: per_session (one copy of every chunk per session),
+# shared (MongoDB only: chunks stored once per candidate and content, sessions listed in sessionId)
+CHUNK_STORAGE_LAYOUT = os.getenv("CHUNK_STORAGE_LAYOUT", "per_session").lower()
+
+# Background ingestion jobs
+# Options: memory, mongodb
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "memory").lower()
+JOB_STORE_COLLECTION = os.getenv("JOB_STORE_COLLECTION", "ingestion_jobs")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+# Finished jobs are kept this long (TTL index with the mongodb backend; 0 keeps them)
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+# In-memory backend: finished jobs kept at most (oldest dropped first)
+JOB_MAX_FINISHED = int(os.getenv("JOB_MAX_FINISHED", "1000"))
+
 # Startup Hacks
 ENABLE_SAMPLE_SEEDING = os.getenv("ENABLE_SAMPLE_SEEDING", "false").lower() == "true"
 SAMPLE_DATA_DIR = os.getenv("SAMPLE_DATA_DIR", "top100")
+# Prebuilt chunks + vectors for the sample data (python build_snapshot.py); used when the embedding model matches
+SAMPLE_SNAPSHOT_PATH = os.getenv("SAMPLE_SNAPSHOT_PATH", os.path.join("data", f"{SAMPLE_DATA_DIR}.snapshot.npz"))
@@ -0,0 +1,44 @@
+import importlib
+import threading
+
+# Provider name -> "module:Class". Modules are imported on first use, so a deployment
+# only loads the SDK of the provider it is configured for (each one costs 0.1-1.3s).
+CHAT_MODEL_CLASSES = {
+    "openai": "langchain_openai:ChatOpenAI",
+    "local": "langchain_ollama:ChatOllama",
+    "ollama": "langchain_ollama:ChatOllama",
+    "google": "langchain_google_genai:ChatGoogleGenerativeAI",
+}
+
+EMBEDDING_CLASSES = {
+    "openai": "langchain_openai:OpenAIEmbeddings",
+    "local": "langchain_ollama:OllamaEmbeddings",
+    "google": "langchain_google_genai:GoogleGenerativeAIEmbeddings",
+}
+
+# Unknown providers fall back to Google, as before
+DEFAULT_PROVIDER = "google"
+
+_classes = {}
+_lock = threading.Lock()
+
+def load_provider_class(classes: dict, provider: str):
+    """Class registered for a provider in one of the tables above, imported once."""
+    path = classes.get(provider) or classes[DEFAULT_PROVIDER]
+    cls = _classes.get(path)
+    if cls is None:
+        with _lock:
+            cls = _classes.get(path)
+            if cls is None:
+                module_name, class_name = path.split(":")
+                try:
+                    module = importlib.import_module(module_name)
+                except ImportError as e:
+                    raise ImportError(f"Provider '{provider}' requires the '{module_name}' package: {e}") from e
+                cls = _classes[path] = getattr(module, class_name)
+    return cls
+
+def model_name(llm) -> str:
+    """Model identifier of a chat model instance, used in cache keys."""
+    # ChatOpenAI exposes model_name, the Google and Ollama chat models expose model
+    return str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__)
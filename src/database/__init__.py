@@ -1,13 +1,27 @@
-from .connection import get_db_client
+from .connection import get_db_client, get_async_db_client, close_db_clients
 from .embeddings import get_embeddings, get_embedding_info
-from .factory import get_vector_store
+from .embedding_cache import aembed_queries
+from .factory import get_vector_store, warm_up_vector_store
+from .repository import ResumeRepository, SharedResumeRepository, LocalResumeRepository, get_repository
+from .local_store import LocalVectorStore
+from .bulk_writer import BulkChunkWriter
 from .config import DB_NAME, COLLECTION_NAME
 
 __all__ = [
     "get_db_client",
+    "get_async_db_client",
+    "close_db_clients",
     "get_embeddings",
     "get_embedding_info",
+    "aembed_queries",
     "get_vector_store",
+    "warm_up_vector_store",
+    "ResumeRepository",
+    "SharedResumeRepository",
+    "LocalResumeRepository",
+    "LocalVectorStore",
+    "BulkChunkWriter",
+    "get_repository",
     "DB_NAME",
     "COLLECTION_NAME",
 ]
@@ -0,0 +1,73 @@
+import time
+from typing import List, Optional
+from langchain_core.documents import Document
+from pymongo import WriteConcern
+from .config import INGEST_WRITE_BATCH_SIZE, INGEST_WRITE_CONCERN, CHUNK_STORAGE_LAYOUT
+
+def parse_write_concern(value: str) -> Optional[WriteConcern]:
+    """"majority", "1", "0"... -> WriteConcern; empty keeps the collection default."""
+    if not value:
+        return None
+    return WriteConcern(w=int(value) if value.isdigit() else value)
+
+class BulkChunkWriter:
+    """
+    Writes embedded chunks to the vector store in fixed-size unordered batches:
+    insert_many for the per-session layout, upserts into the sessionId array for
+    the shared one. No embedding happens here; vectors come from the caller, so
+    one write can span many candidates. Each batch's duration is recorded.
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        batch_size: int = INGEST_WRITE_BATCH_SIZE,
+        write_concern: str = INGEST_WRITE_CONCERN,
+        layout: str = CHUNK_STORAGE_LAYOUT,
+    ):
+        self.vector_store = vector_store
+        self.batch_size = max(1, batch_size)
+        self.write_concern_name = write_concern or "default"
+        self.write_concern = parse_write_concern(write_concern)
+        self.shared = layout == "shared"
+        # (documents, seconds) per batch, in completion order
+        self.timings = []
+
+    async def write(self, documents: List[Document], vectors: List[List[float]]) -> int:
+        """Writes all documents; returns the number of batches issued."""
+        batches = 0
+        for start in range(0, len(documents), self.batch_size):
+            batch = documents[start:start + self.batch_size]
+            started = time.perf_counter()
+            await self._write_batch(batch, vectors[start:start + len(batch)])
+            self.timings.append((len(batch), time.perf_counter() - started))
+            batches += 1
+        return batches
+
+    async def _write_batch(self, documents: List[Document], vectors: List[List[float]]):
+        options = {"write_concern": self.write_concern} if self.write_concern is not None else {}
+        texts = [d.page_content for d in documents]
+        if not self.shared:
+            await self.vector_store.aadd_vectors(texts, vectors, [d.metadata for d in documents], **options)
+            return
+        # One pipeline / single ingest always writes for one session
+        session_id = documents[0].metadata["sessionId"]
+        metadatas = [{k: v for k, v in d.metadata.items() if k != "sessionId"} for d in documents]
+        await self.vector_store.aupsert_shared_vectors(
+            [d.id for d in documents], texts, vectors, metadatas, session_id, **options
+        )
+
+    def stats(self) -> dict:
+        seconds = [s for _, s in self.timings]
+        documents = sum(n for n, _ in self.timings)
+        return {
+            "batchSize": self.batch_size,
+            "writeConcern": self.write_concern_name,
+            "batches": len(self.timings),
+            "documents": documents,
+            "totalSeconds": round(sum(seconds), 3),
+            "meanSeconds": round(sum(seconds) / len(seconds), 4) if seconds else 0.0,
+            "maxSeconds": round(max(seconds), 4) if seconds else 0.0,
+            "documentsPerSecond": round(documents / sum(seconds), 2) if sum(seconds) else 0.0,
+            "timings": [{"documents": n, "seconds": round(s, 4)} for n, s in self.timings],
+        }
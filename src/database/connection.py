@@ -1,7 +1,47 @@
+import threading
 from pymongo import MongoClient
-from .config import MONGODB_URI
+from motor.motor_asyncio import AsyncIOMotorClient
+from .config import MONGODB_URI, MONGODB_MAX_POOL_SIZE, MONGODB_MIN_POOL_SIZE
 
-def get_db_client():
+# Process-wide clients. Each one owns a connection pool, so they are built once
+# and shared; callers must never close them (use close_db_clients on shutdown).
+_sync_client = None
+_async_client = None
+_lock = threading.Lock()
+
+def _client_options() -> dict:
     if not MONGODB_URI:
         raise ValueError("MONGODB_URI is not set")
-    return MongoClient(MONGODB_URI)
+    return {
+        "maxPoolSize": MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": MONGODB_MIN_POOL_SIZE,
+    }
+
+def get_db_client() -> MongoClient:
+    """Shared synchronous client (used by LangChain's vector store and scripts)."""
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_client = MongoClient(MONGODB_URI, **_client_options())
+    return _sync_client
+
+def get_async_db_client() -> AsyncIOMotorClient:
+    """Shared Motor client for code running on the event loop."""
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = AsyncIOMotorClient(MONGODB_URI, **_client_options())
+    return _async_client
+
+def close_db_clients():
+    """Closes the shared clients. Called from the application shutdown hook."""
+    global _sync_client, _async_client
+    with _lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+        if _async_client is not None:
+            _async_client.close()
+            _async_client = None
@@ -0,0 +1,251 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from bson.binary import Binary
+from pymongo import ReplaceOne
+from langchain_core.embeddings import Embeddings
+from src.utils.cache import LRUCache, normalize_query
+
+def _pack(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+def _unpack(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(bytes(blob))
+    return vector.tolist()
+
+async def aembed_queries(embeddings: Embeddings, texts: List[str], **kwargs) -> List[List[float]]:
+    """Embeds several queries with a single batched provider call."""
+    if not texts:
+        return []
+    if hasattr(embeddings, "aembed_queries"):
+        return await embeddings.aembed_queries(texts, **kwargs)
+    return await embeddings.aembed_documents(texts, **kwargs)
+
+class DiskEmbeddingStore:
+    """SQLite-backed vector store for the embedding cache, evicting least recently used rows."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings (last_access)")
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", keys
+            ).fetchall()
+            if rows:
+                self._conn.execute(
+                    f"UPDATE embeddings SET last_access = ? WHERE key IN ({','.join('?' * len(rows))})",
+                    [time.time(), *[row[0] for row in rows]],
+                )
+                self._conn.commit()
+        return {key: _unpack(blob) for key, blob in rows}
+
+    def put_many(self, items: Dict[str, List[float]]) -> int:
+        """Stores the vectors and returns the number of evicted entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                [(key, _pack(vector), now) for key, vector in items.items()],
+            )
+            size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            evicted = max(0, size - self.max_entries)
+            if evicted:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_access LIMIT ?)",
+                    (evicted,),
+                )
+            self._conn.commit()
+        return evicted
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+class MongoEmbeddingStore:
+    """MongoDB-backed vector store for the embedding cache, shared by every replica."""
+
+    def __init__(self, collection, max_entries: int):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.collection.create_index("lastAccess")
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        if not keys:
+            return {}
+        docs = list(self.collection.find({"_id": {"$in": keys}}, projection={"vector": 1}))
+        if docs:
+            self.collection.update_many(
+                {"_id": {"$in": [d["_id"] for d in docs]}},
+                {"$set": {"lastAccess": datetime.now(timezone.utc)}},
+            )
+        return {d["_id"]: _unpack(d["vector"]) for d in docs}
+
+    def put_many(self, items: Dict[str, List[float]]) -> int:
+        now = datetime.now(timezone.utc)
+        self.collection.bulk_write(
+            [
+                ReplaceOne({"_id": key}, {"_id": key, "vector": Binary(_pack(vector)), "lastAccess": now}, upsert=True)
+                for key, vector in items.items()
+            ],
+            ordered=False,
+        )
+        evicted = max(0, self.collection.estimated_document_count() - self.max_entries)
+        if evicted:
+            oldest = self.collection.find({}, projection={"_id": 1}).sort("lastAccess", 1).limit(evicted)
+            self.collection.delete_many({"_id": {"$in": [d["_id"] for d in oldest]}})
+        return evicted
+
+    def size(self) -> int:
+        return self.collection.estimated_document_count()
+
+class CachedEmbeddings(Embeddings):
+    """
+    Content-addressed cache in front of any LangChain embeddings object.
+    Document vectors are keyed by (provider, model, sha256(text)), so identical
+    chunks are embedded once no matter which session or upload they come from.
+    Query embeddings are passed through untouched.
+    """
+
+    def __init__(self, underlying: Embeddings, store, provider: str, model: str):
+        self.underlying = underlying
+        self.store = store
+        self.namespace = f"{provider}:{model}"
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, text: str) -> str:
+        return f"{self.namespace}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+    def _lookup(self, texts: List[str]):
+        keys = [self._key(t) for t in texts]
+        cached = self.store.get_many(list(set(keys)))
+        # Unique texts that still need embedding, in first-seen order
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        hits = sum(1 for key in keys if key in cached)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return keys, cached, missing
+
+    def _store(self, cached: dict, missing: dict, vectors: List[List[float]]):
+        fresh = dict(zip(missing.keys(), vectors))
+        if fresh:
+            self.evictions += self.store.put_many(fresh)
+        cached.update(fresh)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._lookup(texts)
+        vectors = self.underlying.embed_documents(list(missing.values())) if missing else []
+        self._store(cached, missing, vectors)
+        return [cached[key] for key in keys]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = await asyncio.to_thread(self._lookup, texts)
+        vectors = await self.underlying.aembed_documents(list(missing.values())) if missing else []
+        await asyncio.to_thread(self._store, cached, missing, vectors)
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.underlying.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.underlying.aembed_query(text)
+
+    async def aembed_queries(self, texts: List[str], **kwargs) -> List[List[float]]:
+        # Queries bypass the persistent document cache
+        return await aembed_queries(self.underlying, texts, **kwargs)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+            "size": self.store.size(),
+            "maxEntries": self.store.max_entries,
+        }
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    In-memory LRU/TTL cache for query embeddings, keyed by model and normalised
+    question text. Recruiters repeat the same questions across sessions, so a hit
+    saves one provider round trip per (translated) query. Documents pass through.
+    """
+
+    def __init__(self, underlying: Embeddings, provider: str, model: str, max_size: int, ttl_seconds: float):
+        self.underlying = underlying
+        self.namespace = f"{provider}:{model}"
+        self.cache = LRUCache(max_size, ttl_seconds)
+        # Batched query embeddings go through embed_documents; keep Google's query task type
+        self.batch_kwargs = {"task_type": "RETRIEVAL_QUERY"} if provider == "google" else {}
+
+    def _key(self, text: str):
+        return (self.namespace, normalize_query(text))
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self.underlying.embed_query(text)
+            self.cache.set(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = await self.underlying.aembed_query(text)
+            self.cache.set(key, vector)
+        return vector
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Cached lookup per query; all misses are embedded in one batched call."""
+        keys = [self._key(t) for t in texts]
+        vectors = [self.cache.get(key) for key in keys]
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = text
+        if missing:
+            fresh = await aembed_queries(self.underlying, list(missing.values()), **self.batch_kwargs)
+            for key, vector in zip(missing.keys(), fresh):
+                self.cache.set(key, vector)
+            fresh_by_key = dict(zip(missing.keys(), fresh))
+            vectors = [v if v is not None else fresh_by_key[key] for key, v in zip(keys, vectors)]
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.underlying.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.underlying.aembed_documents(texts)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
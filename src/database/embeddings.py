@@ -1,26 +1,57 @@
 import os
-from langchain_openai import OpenAIEmbeddings
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_ollama import OllamaEmbeddings
 from .config import (
     EMBEDDING_LLM_PROVIDER,
     OPENAI_EMBEDDING_MODEL,
     LOCAL_EMBEDDING_MODEL,
-    GOOGLE_EMBEDDING_MODEL
+    GOOGLE_EMBEDDING_MODEL,
+    DB_NAME,
+    EMBEDDING_CACHE_BACKEND,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_CACHE_COLLECTION,
+    EMBEDDING_CACHE_PATH,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS
 )
+from .connection import get_db_client
+from .embedding_cache import CachedEmbeddings, CachedQueryEmbeddings, DiskEmbeddingStore, MongoEmbeddingStore
+from .registry import InstanceRegistry
+from src.utils.cache import register_cache_stats
+from src.core.providers import EMBEDDING_CLASSES, load_provider_class
+
+# One embeddings client (and its HTTP session) per (provider, model)
+_embeddings_registry = InstanceRegistry()
+
+def _build_embeddings(provider: str, model_name: str):
+    # Only the configured provider's SDK is imported
+    return load_provider_class(EMBEDDING_CLASSES, provider)(model=model_name)
+
+def _with_caches(embeddings, provider: str, model_name: str):
+    # Persistent document cache first, then the in-memory query cache in front of it
+    store = None
+    if EMBEDDING_CACHE_BACKEND == "mongodb":
+        collection = get_db_client()[DB_NAME][EMBEDDING_CACHE_COLLECTION]
+        store = MongoEmbeddingStore(collection, EMBEDDING_CACHE_MAX_ENTRIES)
+    elif EMBEDDING_CACHE_BACKEND == "disk":
+        store = DiskEmbeddingStore(EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES)
+    if store is not None:
+        embeddings = CachedEmbeddings(embeddings, store, provider, model_name)
+        register_cache_stats("documentEmbeddings", embeddings.stats)
+
+    # Always wrapped (a size of 0 only disables caching) so batched query embedding is uniform
+    embeddings = CachedQueryEmbeddings(
+        embeddings, provider, model_name,
+        max_size=QUERY_EMBEDDING_CACHE_SIZE,
+        ttl_seconds=QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+    )
+    register_cache_stats("queryEmbeddings", embeddings.stats)
+    return embeddings
 
 def get_embeddings():
-    provider = EMBEDDING_LLM_PROVIDER
-    
-    if provider == "openai":
-        return OpenAIEmbeddings(model=OPENAI_EMBEDDING_MODEL)
-    elif provider == "local":
-        return OllamaEmbeddings(model=LOCAL_EMBEDDING_MODEL)
-    elif provider == "google":
-        return GoogleGenerativeAIEmbeddings(model=GOOGLE_EMBEDDING_MODEL)
-    else:
-        # Default fallback
-        return GoogleGenerativeAIEmbeddings(model=GOOGLE_EMBEDDING_MODEL)
+    info = get_embedding_info()
+    key = (info["provider"], info["model"])
+    return _embeddings_registry.get_or_create(
+        key, lambda: _with_caches(_build_embeddings(info["provider"], info["model"]), info["provider"], info["model"])
+    )
 
 def get_embedding_info() -> dict:
     provider = EMBEDDING_LLM_PROVIDER
@@ -1,22 +1,62 @@
-import os
-from langchain_mongodb import MongoDBAtlasVectorSearch
+import asyncio
 from .config import (
-    MONGODB_URI,
     DB_NAME, 
     COLLECTION_NAME, 
-    MONGODB_VECTOR_INDEX
+    MONGODB_VECTOR_INDEX,
+    VECTOR_STORE_PROVIDER,
+    LOCAL_VECTOR_STORE_DIR
 )
-from .connection import get_db_client
-from .embeddings import get_embeddings
+from .connection import get_db_client, get_async_db_client
+from .embeddings import get_embeddings, get_embedding_info
+from .local_store import LocalVectorStore
+from .registry import InstanceRegistry
 
-def get_vector_store():
-    embeddings = get_embeddings()
-    # Always Mongo
-    return MongoDBAtlasVectorSearch.from_connection_string(
-        connection_string=MONGODB_URI,
-        namespace=DB_NAME+"."+COLLECTION_NAME,
-        embedding=embeddings,
+# One vector store per (provider, model, namespace, index), reused across requests
+_vector_store_registry = InstanceRegistry()
+
+def _build_mongo_vector_store():
+    # Imported here: langchain_mongodb is not needed by the local store
+    from .mongo_store import MongoVectorStore
+
+    # Reuses the shared client's pool instead of opening a connection per call
+    collection = get_db_client()[DB_NAME][COLLECTION_NAME]
+    return MongoVectorStore(
+        collection=collection,
+        embedding=get_embeddings(),
         index_name=MONGODB_VECTOR_INDEX,
     )
 
-# Wrapper removed
+def _build_local_vector_store():
+    return LocalVectorStore(LOCAL_VECTOR_STORE_DIR, embedding=get_embeddings())
+
+def get_vector_store():
+    emb_info = get_embedding_info()
+    if VECTOR_STORE_PROVIDER == "local":
+        key = (emb_info["provider"], emb_info["model"], LOCAL_VECTOR_STORE_DIR, "local")
+        return _vector_store_registry.get_or_create(key, _build_local_vector_store)
+
+    key = (emb_info["provider"], emb_info["model"], DB_NAME + "." + COLLECTION_NAME, MONGODB_VECTOR_INDEX)
+    return _vector_store_registry.get_or_create(key, _build_mongo_vector_store)
+
+async def warm_up_vector_store():
+    """
+    Builds the shared vector store and opens the connection pools at startup,
+    so the first request does not pay for client construction and handshakes.
+    With MongoDB it also creates the (sessionId, email) lookup indexes.
+    """
+    vector_store = get_vector_store()
+    if VECTOR_STORE_PROVIDER == "local":
+        return vector_store
+    try:
+        await get_async_db_client().admin.command("ping")
+        await asyncio.to_thread(get_db_client().admin.command, "ping")
+    except Exception as e:
+        print(f"Warning: MongoDB warm-up failed: {e}")
+        return vector_store
+    try:
+        # Imported here: the repository module builds on this one
+        from .repository import get_repository
+        await get_repository().ensure_indexes()
+    except Exception as e:
+        print(f"Warning: could not create the chunk and candidate indexes: {e}")
+    return vector_store
@@ -0,0 +1,531 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+INITIAL_CAPACITY = 64
+# A partition's change log is compacted into its snapshot past this size (or the snapshot's, if larger)
+MIN_COMPACT_BYTES = 1 << 20
+DEFAULT_SESSION = "_default"
+
+def matches_filter(record: dict, query: Optional[dict]) -> bool:
+    """
+    Evaluates the subset of MongoDB filter syntax used by this codebase
+    (plain equality, $eq, $ne, $in) against a flat record.
+    """
+    for key, condition in (query or {}).items():
+        value = record.get(key)
+        if isinstance(condition, dict):
+            for op, operand in condition.items():
+                if op == "$eq":
+                    ok = value == operand
+                elif op == "$ne":
+                    ok = value != operand
+                elif op == "$in":
+                    ok = value in operand
+                else:
+                    raise ValueError(f"Unsupported filter operator for local vector store: {op}")
+                if not ok:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+class _SessionPartition:
+    """
+    Vectors of one session: a float32 matrix in a memory-mapped file plus the
+    matching records. Rows are L2-normalised on insert so scoring is a single
+    matrix-vector product. The file grows geometrically to keep appends cheap,
+    and deletes swap the last row into the freed slot to keep the matrix dense.
+
+    Records persist as a JSON snapshot (index.json) plus an append-only log of
+    the appends, deletes and updates since (log-<generation>.jsonl), so a write
+    costs its own size rather than a rewrite of every record. The log is folded
+    into a new snapshot generation once it outgrows the snapshot.
+    """
+
+    def __init__(self, path: str, session_id: str):
+        self.path = path
+        self.session_id = session_id
+        self.index_path = os.path.join(path, "index.json")
+        self.vectors_path = os.path.join(path, "vectors.f32")
+        self.dim = 0
+        self.capacity = 0
+        self.generation = 0
+        self.records = []
+        self._positions = {}
+        self._matrix = None
+        self._log_bytes = 0
+        self._snapshot_bytes = 0
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.dim = state["dim"]
+            self.capacity = state["capacity"]
+            self.generation = state.get("generation", 0)
+            self.records = state["records"]
+            self._positions = {r["_id"]: i for i, r in enumerate(self.records)}
+            self._snapshot_bytes = os.path.getsize(self.index_path)
+            self._replay()
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.path, f"log-{self.generation}.jsonl")
+
+    def matrix(self) -> np.ndarray:
+        """The populated rows of the memory-mapped matrix."""
+        if self.capacity == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        if self._matrix is None:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim))
+        return self._matrix[:self.count]
+
+    def _reserve(self, needed: int):
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, self.capacity * 2, INITIAL_CAPACITY)
+        self.close()
+        os.makedirs(self.path, exist_ok=True)
+        mode = "r+b" if os.path.exists(self.vectors_path) else "wb"
+        with open(self.vectors_path, mode) as f:
+            f.truncate(new_capacity * self.dim * np.dtype(np.float32).itemsize)
+        self.capacity = new_capacity
+
+    def append(self, vectors: np.ndarray, records: List[dict]):
+        if self.dim == 0:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match stored dimension {self.dim}.")
+
+        start = self.count
+        self._reserve(start + len(records))
+        self._matrix = None
+        matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim))
+        matrix[start:start + len(records)] = vectors
+        matrix.flush()
+        self._matrix = matrix
+
+        entry = {"op": "append", "dim": self.dim, "capacity": self.capacity, "records": records}
+        self._apply(entry)
+        self._persist(entry)
+
+    def delete_positions(self, positions: Iterable[int]) -> int:
+        positions = sorted(set(positions), reverse=True)
+        if not positions:
+            return 0
+        matrix = self.matrix()
+        # Records are only swapped in _apply, so the i-th removal swaps with row count - 1 - i
+        for removed, pos in enumerate(positions):
+            last = self.count - 1 - removed
+            if pos != last:
+                matrix[pos] = matrix[last]
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+        entry = {"op": "delete", "positions": positions}
+        self._apply(entry)
+        self._persist(entry)
+        return len(positions)
+
+    def update(self, ids: List[str], fields: dict):
+        """Sets metadata fields on the records with these ids."""
+        entry = {"op": "update", "ids": ids, "fields": fields}
+        self._apply(entry)
+        self._persist(entry)
+
+    def position_of(self, doc_id: str) -> Optional[int]:
+        return self._positions.get(doc_id)
+
+    def _apply(self, entry: dict):
+        """Applies one logged change to the records (the matrix is already written)."""
+        op = entry["op"]
+        if op == "append":
+            self.dim, self.capacity = entry["dim"], entry["capacity"]
+            for record in entry["records"]:
+                self._positions[record["_id"]] = len(self.records)
+                self.records.append(record)
+        elif op == "delete":
+            # Descending positions, each swapped with the current last record
+            for pos in entry["positions"]:
+                last = self.count - 1
+                del self._positions[self.records[pos]["_id"]]
+                if pos != last:
+                    moved = self.records[last]
+                    self.records[pos] = moved
+                    self._positions[moved["_id"]] = pos
+                self.records.pop()
+        elif op == "update":
+            for doc_id in entry["ids"]:
+                pos = self._positions.get(doc_id)
+                if pos is not None:
+                    self.records[pos].update(entry["fields"])
+
+    def _replay(self):
+        if not os.path.exists(self.log_path):
+            return
+        valid = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A write cut short by a crash: drop it so later entries stay readable
+                    break
+                self._apply(entry)
+                valid += len(line)
+        if valid != os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(valid)
+        self._log_bytes = valid
+
+    def _persist(self, entry: dict):
+        if not os.path.exists(self.index_path) or self._log_bytes > max(MIN_COMPACT_BYTES, self._snapshot_bytes):
+            self.save()
+            return
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with open(self.log_path, "ab") as f:
+            f.write(line)
+        self._log_bytes += len(line)
+
+    def save(self):
+        """Writes a new snapshot generation and drops the log it replaces."""
+        os.makedirs(self.path, exist_ok=True)
+        old_log = self.log_path
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "sessionId": self.session_id,
+                "dim": self.dim,
+                "capacity": self.capacity,
+                "generation": self.generation + 1,
+                "records": self.records,
+            }, f)
+        os.replace(tmp_path, self.index_path)
+        self.generation += 1
+        if os.path.exists(old_log):
+            os.remove(old_log)
+        self._log_bytes = 0
+        self._snapshot_bytes = os.path.getsize(self.index_path)
+
+    def close(self):
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+        self._matrix = None
+
+class LocalCandidateStore:
+    """Candidate records of the local backend, kept in one JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._records = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._records = {(r["sessionId"], r["email"]): r for r in json.load(f)}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(list(self._records.values()), f)
+        os.replace(tmp_path, self.path)
+
+    def upsert(self, record: dict):
+        with self._lock:
+            self._records[(record["sessionId"], record["email"])] = dict(record)
+            self._save()
+
+    def find(self, session_id: str, emails: List[str]) -> List[dict]:
+        with self._lock:
+            return [dict(self._records[(session_id, e)]) for e in emails if (session_id, e) in self._records]
+
+    def list_session(self, session_id: str) -> List[dict]:
+        with self._lock:
+            return [dict(r) for key, r in self._records.items() if key[0] == session_id]
+
+    def drop_session(self, session_id: str) -> int:
+        with self._lock:
+            keys = [key for key in self._records if key[0] == session_id]
+            for key in keys:
+                del self._records[key]
+            if keys:
+                self._save()
+            return len(keys)
+
+class LocalVectorStore(VectorStore):
+    """
+    Embedded, in-process vector store (NumPy + memory-mapped files).
+    Implements the same add / similarity_search(pre_filter=...) contract as the
+    Atlas store, partitioned per sessionId, for single-node and offline runs.
+    Scores follow Atlas' cosine convention: (1 + cosine) / 2.
+    """
+
+    def __init__(self, root_dir: str, embedding: Embeddings):
+        self.root_dir = root_dir
+        self._embedding = embedding
+        self._partitions = {}
+        self._lock = threading.RLock()
+        os.makedirs(root_dir, exist_ok=True)
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    # --- Partitions ---
+
+    def _partition(self, session_id: str, create: bool = False) -> Optional[_SessionPartition]:
+        """
+        The session's partition, or None when it has nothing stored and create is
+        False: reads of unknown session ids must not leave empty partitions behind.
+        """
+        partition = self._partitions.get(session_id)
+        if partition is None:
+            dirname = hashlib.sha256(session_id.encode()).hexdigest()[:32]
+            path = os.path.join(self.root_dir, dirname)
+            if not create and not os.path.exists(os.path.join(path, "index.json")):
+                return None
+            partition = _SessionPartition(path, session_id)
+            self._partitions[session_id] = partition
+        return partition
+
+    def _all_partitions(self) -> List[_SessionPartition]:
+        # Pick up sessions persisted by a previous process
+        loaded = {os.path.basename(p.path) for p in self._partitions.values()}
+        for dirname in os.listdir(self.root_dir):
+            if dirname in loaded:
+                continue
+            index_path = os.path.join(self.root_dir, dirname, "index.json")
+            if not os.path.exists(index_path):
+                continue
+            with open(index_path, "r", encoding="utf-8") as f:
+                session_id = json.load(f)["sessionId"]
+            self._partition(session_id)
+        return list(self._partitions.values())
+
+    def _partitions_for(self, query: Optional[dict]) -> List[_SessionPartition]:
+        session_id = (query or {}).get("sessionId")
+        if isinstance(session_id, str):
+            partition = self._partition(session_id)
+            return [partition] if partition is not None else []
+        return self._all_partitions()
+
+    # --- Writes ---
+
+    @staticmethod
+    def _normalise(vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def add_vectors(
+        self,
+        texts: List[str],
+        vectors: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Adds pre-computed embeddings (no embedding call)."""
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        matrix = self._normalise(vectors)
+
+        # Group rows per session so each partition gets a single append
+        groups = {}
+        for row, (text, metadata, doc_id) in enumerate(zip(texts, metadatas, ids)):
+            record = {**metadata, "_id": str(doc_id), "text": text}
+            session_id = metadata.get("sessionId") or DEFAULT_SESSION
+            groups.setdefault(session_id, ([], []))
+            groups[session_id][0].append(row)
+            groups[session_id][1].append(record)
+
+        with self._lock:
+            for session_id, (rows, records) in groups.items():
+                partition = self._partition(session_id, create=True)
+                existing = [partition.position_of(r["_id"]) for r in records]
+                partition.delete_positions(p for p in existing if p is not None)
+                partition.append(matrix[rows], records)
+        return [str(i) for i in ids]
+
+    async def aadd_vectors(
+        self,
+        texts: List[str],
+        vectors: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        # Write options of the MongoDB store (write_concern) do not apply here
+        return await asyncio.to_thread(self.add_vectors, texts, vectors, metadatas, ids)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        vectors = self._embedding.embed_documents(texts)
+        return self.add_vectors(texts, vectors, metadatas, ids)
+
+    async def aadd_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        vectors = await self._embedding.aembed_documents(texts)
+        return await asyncio.to_thread(self.add_vectors, texts, vectors, metadatas, ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if ids is None:
+            return False
+        wanted = set(str(i) for i in ids)
+        with self._lock:
+            for partition in self._all_partitions():
+                positions = [partition.position_of(i) for i in wanted]
+                partition.delete_positions(p for p in positions if p is not None)
+        return True
+
+    def delete_where(self, query: dict) -> int:
+        """Deletes every record matching the filter. Returns the number deleted."""
+        with self._lock:
+            if set(query.keys()) == {"sessionId"} and isinstance(query["sessionId"], str):
+                return self.drop_session(query["sessionId"])
+            deleted = 0
+            for partition in self._partitions_for(query):
+                positions = [i for i, r in enumerate(partition.records) if matches_filter(r, query)]
+                deleted += partition.delete_positions(positions)
+            return deleted
+
+    def update_where(self, query: dict, fields: dict) -> int:
+        """Sets metadata fields on every record matching the filter. Returns the number updated."""
+        updated = 0
+        with self._lock:
+            for partition in self._partitions_for(query):
+                matched = [r["_id"] for r in partition.records if matches_filter(r, query)]
+                if matched:
+                    partition.update(matched, fields)
+                    updated += len(matched)
+        return updated
+
+    def drop_session(self, session_id: str) -> int:
+        with self._lock:
+            partition = self._partition(session_id)
+            if partition is None:
+                return 0
+            deleted = partition.count
+            partition.close()
+            shutil.rmtree(partition.path, ignore_errors=True)
+            del self._partitions[session_id]
+            return deleted
+
+    # --- Reads ---
+
+    def find(self, query: dict, limit: int = 0) -> List[dict]:
+        """Returns matching records (without vectors), Mongo-document shaped."""
+        results = []
+        with self._lock:
+            for partition in self._partitions_for(query):
+                for record in partition.records:
+                    if matches_filter(record, query):
+                        results.append(dict(record))
+                        if limit and len(results) >= limit:
+                            return results
+        return results
+
+    def count(self, query: dict) -> int:
+        with self._lock:
+            if set(query.keys()) == {"sessionId"} and isinstance(query["sessionId"], str):
+                partition = self._partition(query["sessionId"])
+                return partition.count if partition is not None else 0
+        return len(self.find(query))
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        pre_filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        query_vector = self._normalise(embedding)[0]
+        candidates = []
+        with self._lock:
+            for partition in self._partitions_for(pre_filter):
+                if partition.count == 0:
+                    continue
+                scores = partition.matrix() @ query_vector
+                extra_filter = {key: v for key, v in (pre_filter or {}).items() if key != "sessionId"}
+                if extra_filter:
+                    mask = np.fromiter(
+                        (matches_filter(r, extra_filter) for r in partition.records),
+                        dtype=bool, count=partition.count,
+                    )
+                    scores = np.where(mask, scores, -np.inf)
+                top = min(k, len(scores))
+                # argpartition is O(n); only the k winners get sorted
+                idx = np.argpartition(-scores, top - 1)[:top] if top < len(scores) else np.arange(len(scores))
+                for i in idx:
+                    if np.isfinite(scores[i]):
+                        candidates.append((float(scores[i]), partition.records[i]))
+
+        candidates.sort(key=lambda item: item[0], reverse=True)
+        results = []
+        for cosine, record in candidates[:k]:
+            metadata = {key: v for key, v in record.items() if key != "text"}
+            doc = Document(page_content=record["text"], metadata=metadata, id=record["_id"])
+            results.append((doc, (1.0 + cosine) / 2.0))
+        return results
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        embedding = self._embedding.embed_query(query)
+        return self.similarity_search_with_score_by_vector(embedding, k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    async def asimilarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return await asyncio.to_thread(self.similarity_search_with_score_by_vector, embedding, k, **kwargs)
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        embedding = await self._embedding.aembed_query(query)
+        results = await self.asimilarity_search_with_score_by_vector(embedding, k, **kwargs)
+        return [doc for doc, _ in results]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        root_dir: str = "data/vector_store",
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        store = cls(root_dir, embedding)
+        store.add_texts(texts, metadatas, **kwargs)
+        return store
@@ -0,0 +1,95 @@
+from typing import Any, List, Optional, Tuple
+from pymongo import UpdateOne, WriteConcern
+from langchain_core.documents import Document
+from langchain_mongodb import MongoDBAtlasVectorSearch
+from langchain_mongodb.pipelines import vector_search_stage
+from langchain_mongodb.utils import make_serializable
+from .connection import get_async_db_client
+
+class MongoVectorStore(MongoDBAtlasVectorSearch):
+    """
+    Atlas vector store with a native async search path.
+    LangChain's async methods run the sync driver in a thread pool; this runs the
+    $vectorSearch pipeline through the shared Motor client instead.
+    """
+
+    def _async_collection(self, write_concern: Optional[WriteConcern] = None):
+        collection = self._collection
+        async_collection = get_async_db_client()[collection.database.name][collection.name]
+        if write_concern is not None:
+            async_collection = async_collection.with_options(write_concern=write_concern)
+        return async_collection
+
+    async def aadd_vectors(
+        self,
+        texts: List[str],
+        vectors: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        write_concern: Optional[WriteConcern] = None,
+    ) -> List[str]:
+        """Inserts pre-computed embeddings in one unordered insert_many (no embedding call)."""
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        docs = []
+        for i, (text, vector, metadata) in enumerate(zip(texts, vectors, metadatas)):
+            doc = {self._text_key: text, self._embedding_key: vector, **metadata}
+            if ids:
+                doc["_id"] = ids[i]
+            docs.append(doc)
+        result = await self._async_collection(write_concern).insert_many(docs, ordered=False)
+        return [str(i) for i in result.inserted_ids]
+
+    async def aupsert_shared_vectors(
+        self,
+        ids: List[str],
+        texts: List[str],
+        vectors: List[List[float]],
+        metadatas: List[dict],
+        session_id: str,
+        write_concern: Optional[WriteConcern] = None,
+    ) -> int:
+        """
+        Shared layout write: inserts each content-addressed chunk if it is new and adds
+        the session to its sessionId array either way. Concurrent sessions writing the
+        same chunk converge on one document. Returns the number of inserted chunks.
+        """
+        if not ids:
+            return 0
+        operations = [
+            UpdateOne(
+                {"_id": doc_id},
+                {
+                    "$setOnInsert": {self._text_key: text, self._embedding_key: vector, **metadata},
+                    "$addToSet": {"sessionId": session_id},
+                },
+                upsert=True,
+            )
+            for doc_id, text, vector, metadata in zip(ids, texts, vectors, metadatas)
+        ]
+        result = await self._async_collection(write_concern).bulk_write(operations, ordered=False)
+        return result.upserted_count if result.acknowledged else 0
+
+    async def asimilarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        pre_filter: Optional[dict] = None,
+        oversampling_factor: int = 10,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        pipeline = [
+            vector_search_stage(embedding, self._embedding_key, self._index_name, k, pre_filter, oversampling_factor),
+            {"$set": {"score": {"$meta": "vectorSearchScore"}}},
+            {"$project": {self._embedding_key: 0}},
+        ]
+        docs = []
+        async for res in self._async_collection().aggregate(pipeline):
+            if self._text_key not in res:
+                continue
+            text = res.pop(self._text_key)
+            score = res.pop("score")
+            make_serializable(res)
+            docs.append((Document(page_content=text, metadata=res, id=res["_id"]), score))
+        return docs
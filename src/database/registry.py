@@ -0,0 +1,28 @@
+import threading
+
+class InstanceRegistry:
+    """
+    Thread-safe keyed cache of long-lived client objects.
+    Each key is built once via its factory and then shared across requests.
+    """
+
+    def __init__(self):
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, factory):
+        instance = self._instances.get(key)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(key)
+                if instance is None:
+                    instance = factory()
+                    self._instances[key] = instance
+        return instance
+
+    def keys(self) -> list:
+        return list(self._instances.keys())
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
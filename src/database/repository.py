@@ -0,0 +1,218 @@
+import asyncio
+import os
+from typing import Optional
+from .connection import get_async_db_client
+from .config import (
+    DB_NAME, COLLECTION_NAME, CANDIDATE_COLLECTION_NAME, VECTOR_STORE_PROVIDER, LOCAL_VECTOR_STORE_DIR,
+    CHUNK_STORAGE_LAYOUT
+)
+from .factory import get_vector_store
+from .local_store import LocalCandidateStore
+
+class ResumeRepository:
+    """
+    Async access to the resume chunk collection.
+    All queries go through the shared Motor client so they never block the event loop.
+    """
+
+    # Chunks belong to exactly one session (see SharedResumeRepository for the alternative)
+    shared = False
+
+    @property
+    def collection(self):
+        return get_async_db_client()[DB_NAME][COLLECTION_NAME]
+
+    @property
+    def candidates(self):
+        return get_async_db_client()[DB_NAME][CANDIDATE_COLLECTION_NAME]
+
+    async def ensure_indexes(self):
+        """Creates the (sessionId, email) indexes behind per-candidate chunk and identity lookups."""
+        await self.collection.create_index([("sessionId", 1), ("email", 1)])
+        await self.candidates.create_index([("sessionId", 1), ("email", 1)])
+
+    async def is_session_empty(self, session_id: str) -> bool:
+        """Check if the given session has any documents in the database."""
+        doc = await self.collection.find_one({"sessionId": session_id}, projection={"_id": 1})
+        return doc is None
+
+    async def count_session_documents(self, session_id: str) -> int:
+        return await self.collection.count_documents({"sessionId": session_id})
+
+    async def find_candidate_document(self, session_id: str, email: str):
+        """Returns any stored chunk for this candidate in this session (or None)."""
+        # Mongo keys are flattened
+        return await self.collection.find_one(
+            {"sessionId": session_id, "email": email},
+            projection={"embedding": 0},
+        )
+
+    async def find_candidate_chunks(self, session_id: str, email: str) -> list:
+        """All stored chunks of a candidate (hashes and text only, no vectors)."""
+        cursor = self.collection.find(
+            {"sessionId": session_id, "email": email},
+            projection={"_id": 1, "chunkHash": 1, "contentHash": 1, "text": 1},
+        )
+        return [doc async for doc in cursor]
+
+    async def find_session_chunks(self, session_id: str, emails: Optional[list] = None) -> list:
+        """All chunks of a session (optionally of some candidates) with text and metadata, without vectors."""
+        query = {"sessionId": session_id}
+        if emails is not None:
+            query["email"] = {"$in": emails}
+        cursor = self.collection.find(query, projection={"embedding": 0})
+        return [doc async for doc in cursor]
+
+    async def delete_candidate_documents(self, session_id: str, email: str) -> int:
+        result = await self.collection.delete_many({"sessionId": session_id, "email": email})
+        return result.deleted_count
+
+    async def delete_documents(self, ids: list) -> int:
+        result = await self.collection.delete_many({"_id": {"$in": ids}})
+        return result.deleted_count
+
+    async def update_documents(self, ids: list, fields: dict) -> int:
+        result = await self.collection.update_many({"_id": {"$in": ids}}, {"$set": fields})
+        return result.modified_count
+
+    async def remove_chunks(self, session_id: str, ids: list) -> int:
+        """Removes chunks from a session (deletes them in the per-session layout)."""
+        return await self.delete_documents(ids)
+
+    async def delete_session_documents(self, session_id: str) -> int:
+        await self.candidates.delete_many({"sessionId": session_id})
+        result = await self.collection.delete_many({"sessionId": session_id})
+        return result.deleted_count
+
+    async def upsert_candidate(self, record: dict):
+        """Stores the identity record of a candidate (one per session and email)."""
+        await self.candidates.replace_one(
+            {"_id": f"{record['sessionId']}:{record['email']}"}, record, upsert=True
+        )
+
+    async def find_candidates(self, session_id: str, emails: list) -> list:
+        cursor = self.candidates.find({"sessionId": session_id, "email": {"$in": emails}}, projection={"_id": 0})
+        return [doc async for doc in cursor]
+
+    async def list_candidates(self, session_id: str) -> list:
+        """Identity records of every candidate in a session."""
+        cursor = self.candidates.find({"sessionId": session_id}, projection={"_id": 0})
+        return [doc async for doc in cursor]
+
+class SharedResumeRepository(ResumeRepository):
+    """
+    Shared chunk layout: a chunk is stored once per candidate and content (its _id
+    derives from email and chunkHash) and sessionId holds the array of sessions it
+    belongs to. Session queries ({"sessionId": s}) and the vector search pre-filter
+    match array members unchanged. Removing a session pulls it from the array and
+    garbage-collects chunks no session references anymore.
+    Documents left from the per-session layout (sessionId is a string) are deleted
+    outright, so both layouts can coexist in one collection during a migration.
+    """
+
+    shared = True
+
+    async def link_chunks(self, session_id: str, ids: list) -> set:
+        """Adds the session to already stored chunks. Returns the ids that now include it."""
+        if not ids:
+            return set()
+        await self.collection.update_many(
+            {"_id": {"$in": ids}, "sessionId.0": {"$exists": True}},
+            {"$addToSet": {"sessionId": session_id}},
+        )
+        cursor = self.collection.find({"_id": {"$in": ids}, "sessionId": session_id}, projection={"_id": 1})
+        return {doc["_id"] async for doc in cursor}
+
+    async def _unlink(self, query: dict, session_id: str) -> int:
+        ids = [doc["_id"] async for doc in self.collection.find(query, projection={"_id": 1})]
+        if not ids:
+            return 0
+        legacy = await self.collection.delete_many({"_id": {"$in": ids}, "sessionId.0": {"$exists": False}})
+        pulled = await self.collection.update_many(
+            {"_id": {"$in": ids}, "sessionId.0": {"$exists": True}},
+            {"$pull": {"sessionId": session_id}},
+        )
+        # Reference-counted garbage collection: the array length is the refcount
+        await self.collection.delete_many({"_id": {"$in": ids}, "sessionId": {"$size": 0}})
+        return legacy.deleted_count + pulled.modified_count
+
+    async def remove_chunks(self, session_id: str, ids: list) -> int:
+        return await self._unlink({"_id": {"$in": ids}, "sessionId": session_id}, session_id)
+
+    async def delete_candidate_documents(self, session_id: str, email: str) -> int:
+        return await self._unlink({"sessionId": session_id, "email": email}, session_id)
+
+    async def delete_session_documents(self, session_id: str) -> int:
+        await self.candidates.delete_many({"sessionId": session_id})
+        return await self._unlink({"sessionId": session_id}, session_id)
+
+class LocalResumeRepository:
+    """Same API as ResumeRepository, served by the embedded LocalVectorStore."""
+
+    shared = False
+
+    def __init__(self, store, candidates: LocalCandidateStore):
+        self.store = store
+        self.candidates = candidates
+
+    async def is_session_empty(self, session_id: str) -> bool:
+        return await self.count_session_documents(session_id) == 0
+
+    async def count_session_documents(self, session_id: str) -> int:
+        return await asyncio.to_thread(self.store.count, {"sessionId": session_id})
+
+    async def find_candidate_document(self, session_id: str, email: str):
+        docs = await asyncio.to_thread(self.store.find, {"sessionId": session_id, "email": email}, 1)
+        return docs[0] if docs else None
+
+    async def find_candidate_chunks(self, session_id: str, email: str) -> list:
+        return await asyncio.to_thread(self.store.find, {"sessionId": session_id, "email": email})
+
+    async def find_session_chunks(self, session_id: str, emails: Optional[list] = None) -> list:
+        query = {"sessionId": session_id}
+        if emails is not None:
+            query["email"] = {"$in": emails}
+        return await asyncio.to_thread(self.store.find, query)
+
+    async def delete_candidate_documents(self, session_id: str, email: str) -> int:
+        return await asyncio.to_thread(self.store.delete_where, {"sessionId": session_id, "email": email})
+
+    async def delete_documents(self, ids: list) -> int:
+        return await asyncio.to_thread(self.store.delete_where, {"_id": {"$in": ids}})
+
+    async def update_documents(self, ids: list, fields: dict) -> int:
+        return await asyncio.to_thread(self.store.update_where, {"_id": {"$in": ids}}, fields)
+
+    async def remove_chunks(self, session_id: str, ids: list) -> int:
+        return await self.delete_documents(ids)
+
+    async def delete_session_documents(self, session_id: str) -> int:
+        await asyncio.to_thread(self.candidates.drop_session, session_id)
+        return await asyncio.to_thread(self.store.drop_session, session_id)
+
+    async def upsert_candidate(self, record: dict):
+        await asyncio.to_thread(self.candidates.upsert, record)
+
+    async def find_candidates(self, session_id: str, emails: list) -> list:
+        return await asyncio.to_thread(self.candidates.find, session_id, emails)
+
+    async def list_candidates(self, session_id: str) -> list:
+        return await asyncio.to_thread(self.candidates.list_session, session_id)
+
+_repository = None
+
+def get_repository():
+    """Returns the repository matching VECTOR_STORE_PROVIDER and CHUNK_STORAGE_LAYOUT."""
+    global _repository
+    if _repository is None:
+        if CHUNK_STORAGE_LAYOUT == "shared":
+            if VECTOR_STORE_PROVIDER != "mongodb":
+                raise ValueError("CHUNK_STORAGE_LAYOUT=shared requires VECTOR_STORE_PROVIDER=mongodb.")
+            _repository = SharedResumeRepository()
+        elif VECTOR_STORE_PROVIDER == "local":
+            _repository = LocalResumeRepository(
+                get_vector_store(), LocalCandidateStore(os.path.join(LOCAL_VECTOR_STORE_DIR, "candidates.json"))
+            )
+        else:
+            _repository = ResumeRepository()
+    return _repository
@@ -1,13 +1,11 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, Depends, Security
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, Response, Depends, Security
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import APIKeyHeader
 from dotenv import load_dotenv
+import json
 import os
-import shutil
-import tempfile
 from pydantic import BaseModel
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
 
 # Rate Limiting
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -16,11 +14,16 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 # Import services
-from src.services.ingestion import ingest_single_cv, ingest_directory
-from src.services.chat import ask_question
-from src.database import get_db_client, DB_NAME, COLLECTION_NAME
+from src.services.jobs import get_job_manager, JobQueueFullError
+from src.services.ingestion import get_parse_executor, shutdown_parse_executor
+from src.services.chat import answer_question, stream_question
+from src.services.answer_cache import get_answer_cache
+from src.services.lexical_index import get_lexical_index
+from src.services.query_analysis import forget_session
+from src.database import get_repository, close_db_clients, warm_up_vector_store
 from src.config import ALLOWED_ORIGINS, APP_API_KEY
 from src.core.constants import PrototypeConstants
+from src.utils.cache import get_cache_stats
 from src.services.prototype_seeding import seed_prototype_data_if_needed
 
 load_dotenv()
@@ -78,6 +81,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Cache"],
 )
 
 # Rate Limiter Middleware
@@ -87,9 +91,23 @@ app.add_middleware(SlowAPIMiddleware)
 
 @app.on_event("startup")
 async def startup_event():
+    # Build shared embedding / vector store clients before the first request
+    await warm_up_vector_store()
+
+    # Background ingestion workers; the parse pool is created before serving requests
+    get_job_manager().start()
+    get_parse_executor()
+
     # Automated Seeding for Prototypes
     await seed_prototype_data_if_needed()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await get_job_manager().stop()
+    shutdown_parse_executor()
+    # Release the shared MongoDB connection pools
+    close_db_clients()
+
 # Standardized Error Handling
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -119,11 +137,69 @@ class IngestTextRequest(BaseModel):
 class WipeSessionRequest(BaseModel):
     sessionId: str
 
+class StageTiming(BaseModel):
+    items: int
+    busySeconds: float
+
+class IngestionThroughput(BaseModel):
+    filesPerSecond: float
+    chunksPerSecond: float
+
+class WriteBatchTiming(BaseModel):
+    documents: int
+    seconds: float
+
+class WriteStats(BaseModel):
+    batchSize: int
+    writeConcern: str
+    batches: int
+    documents: int
+    totalSeconds: float
+    meanSeconds: float
+    maxSeconds: float
+    documentsPerSecond: float
+    timings: list[WriteBatchTiming] = []
+
+class ChunkDiff(BaseModel):
+    added: int = 0
+    kept: int = 0
+    removed: int = 0
+    linked: int = 0
+
 class IngestionSummaryResponse(BaseModel):
     total: int
     successful: int
     failed: int
     errors: list[str]
+    chunks: int = 0
+    chunkDiff: ChunkDiff | None = None
+    durationSeconds: float = 0.0
+    throughput: IngestionThroughput | None = None
+    stages: dict[str, StageTiming] = {}
+    writes: WriteStats | None = None
+
+class JobSubmissionResponse(BaseModel):
+    status: str
+    message: str
+    jobId: str
+
+class JobFileStatus(BaseModel):
+    name: str
+    status: str
+    error: str | None = None
+    chunks: int | None = None
+
+class JobResponse(BaseModel):
+    jobId: str
+    kind: str
+    sessionId: str
+    status: str
+    createdAt: str
+    updatedAt: str
+    finishedAt: str | None = None
+    files: list[JobFileStatus]
+    summary: IngestionSummaryResponse | None = None
+    error: str | None = None
 
 class StandardResponse(BaseModel):
     status: str
@@ -143,7 +219,11 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
-@app.post("/ingest", tags=["Ingestion"], summary="Ingest Document", response_model=StandardResponse, dependencies=[Depends(get_api_key)])
+@app.get("/metrics/cache", tags=["General"], summary="Cache Metrics", dependencies=[Depends(get_api_key)])
+def cache_metrics():
+    return {"caches": get_cache_stats()}
+
+@app.post("/ingest", tags=["Ingestion"], summary="Ingest Document", response_model=JobSubmissionResponse, status_code=202, dependencies=[Depends(get_api_key)])
 @limiter.limit("10/minute")
 async def ingest_document(
     request: Request,
@@ -160,45 +240,32 @@ async def ingest_document(
         if size > MAX_FILE_SIZE:
              raise HTTPException(status_code=413, detail="File too large (Max 10MB)")
 
-        # Create temp file
-        suffix = os.path.splitext(file.filename)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            shutil.copyfileobj(file.file, tmp)
-            tmp_path = tmp.name
-
-        content = ""
-        try:
-            if suffix.lower() == ".pdf":
-                loader = PyPDFLoader(tmp_path)
-                docs = loader.load()
-                content = "\n".join([d.page_content for d in docs])
-            else:
-                loader = TextLoader(tmp_path)
-                docs = loader.load()
-                content = "\n".join([d.page_content for d in docs])
-        finally:
-            os.unlink(tmp_path)
-
-        await ingest_single_cv(content, file.filename, sessionId)
-        return {"status": "success", "message": f"Ingested {file.filename}"}
+        # Parsing, embedding and storage happen in a background job
+        data = await file.read()
+        job = await get_job_manager().submit_file(file.filename, data, sessionId)
+        return {"status": "accepted", "message": f"Queued {file.filename}", "jobId": job["jobId"]}
     except HTTPException:
         raise
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/ingest/text", tags=["Ingestion"], summary="Ingest Raw Text", response_model=StandardResponse, dependencies=[Depends(get_api_key)])
+@app.post("/ingest/text", tags=["Ingestion"], summary="Ingest Raw Text", response_model=JobSubmissionResponse, status_code=202, dependencies=[Depends(get_api_key)])
 @limiter.limit("10/minute")
 async def ingest_text(
     request: Request,
     ingest_req: IngestTextRequest,
 ):
     try:
-        await ingest_single_cv(ingest_req.text, "raw_text_input", ingest_req.sessionId)
-        return {"status": "success", "message": "Ingested text"}
+        job = await get_job_manager().submit_text(ingest_req.text, ingest_req.sessionId)
+        return {"status": "accepted", "message": "Queued text", "jobId": job["jobId"]}
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/ingest/sample", tags=["Ingestion"], summary="Ingest Sample Data (data/top10)", response_model=IngestionSummaryResponse, dependencies=[Depends(get_api_key)])
+@app.post("/ingest/sample", tags=["Ingestion"], summary="Ingest Sample Data (data/top10)", response_model=JobSubmissionResponse, status_code=202, dependencies=[Depends(get_api_key)])
 @limiter.limit("5/minute")
 async def ingest_sample_data(
     request: Request,
@@ -206,20 +273,32 @@ async def ingest_sample_data(
 ):
     try:
         sample_dir = os.path.join(os.getcwd(), "data", "top10")
-        summary = await ingest_directory(sample_dir, ingest_req.sessionId)
-        return summary
+        job = await get_job_manager().submit_directory(sample_dir, ingest_req.sessionId)
+        return {"status": "accepted", "message": f"Queued {len(job['files'])} sample files", "jobId": job["jobId"]}
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/jobs/{jobId}", tags=["Ingestion"], summary="Get Ingestion Job", response_model=JobResponse, dependencies=[Depends(get_api_key)])
+async def get_job(jobId: str):
+    job = await get_job_manager().store.get(jobId)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/jobs", tags=["Ingestion"], summary="List Ingestion Jobs", response_model=list[JobResponse], dependencies=[Depends(get_api_key)])
+async def list_jobs(sessionId: str | None = None):
+    return await get_job_manager().store.list(sessionId)
+
 @app.post("/wipe", tags=["Session Management"], summary="Wipe Session Data", response_model=StandardResponse, dependencies=[Depends(get_api_key)])
 async def wipe_session(request: WipeSessionRequest):
     try:
         sessionId = request.sessionId
-        client = get_db_client() 
-        collection = client[DB_NAME][COLLECTION_NAME]
-        
-        # Real Mongo
-        collection.delete_many({"sessionId": sessionId})
+        await get_repository().delete_session_documents(sessionId)
+        get_lexical_index().drop_session(sessionId)
+        forget_session(sessionId)
+        await get_answer_cache().invalidate(sessionId)
              
         return {"status": "success", "message": "Session wiped"}
     except Exception as e:
@@ -228,23 +307,47 @@ async def wipe_session(request: WipeSessionRequest):
 @app.get("/status", tags=["Session Management"], summary="Get Session Status", response_model=StatusResponse, dependencies=[Depends(get_api_key)])
 async def get_status(sessionId: str):
     # Check if any docs exist for session
-    client = get_db_client() 
-    collection = client[DB_NAME][COLLECTION_NAME]
-    
-    count = collection.count_documents({"sessionId": sessionId})
-            
-    return {"isEmpty": count == 0}
+    is_empty = await get_repository().is_session_empty(sessionId)
+    return {"isEmpty": is_empty}
 
 @app.post("/chat", tags=["Chat"], summary="Chat with RAG", response_model=ChatResponse, dependencies=[Depends(get_api_key)])
 @limiter.limit("20/minute")
-async def chat_endpoint(request: Request, chat_req: ChatRequest):
+async def chat_endpoint(request: Request, response: Response, chat_req: ChatRequest):
     try:
-        response = await ask_question(chat_req.question, chat_req.sessionId)
-        return {"response": response}
+        result = await answer_question(chat_req.question, chat_req.sessionId)
+        # HIT / MISS of the answer cache (BYPASS when it is disabled)
+        response.headers["X-Cache"] = result.cache_status
+        return {"response": result.answer}
     except Exception as e:
         # This is caught by global handler for 500s usually, but valid to raise explicit HTTPExceptions
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _chat_events(question: str, session_id: str):
+    try:
+        async for event, data in stream_question(question, session_id):
+            yield _sse(event, data)
+    except Exception as e:
+        # The 200 status is already sent; the failure is reported in the stream
+        print(f"Chat stream error: {e}")
+        yield _sse("error", {"message": str(e)})
+
+@app.post("/chat/stream", tags=["Chat"], summary="Chat with RAG (Server-Sent Events)", dependencies=[Depends(get_api_key)])
+@limiter.limit("20/minute")
+async def chat_stream_endpoint(request: Request, chat_req: ChatRequest):
+    """
+    Streams the answer as server-sent events: session, retrieval and context
+    stage events, then token events as the LLM generates, then done (or error).
+    """
+    return StreamingResponse(
+        _chat_events(chat_req.question, chat_req.sessionId),
+        media_type="text/event-stream",
+        # Disable proxy buffering (nginx) so tokens reach the client as they are generated
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 if __name__ == "__main__":
     import uvicorn
     # Use src.main:app since we are inside src but running from root usually
@@ -0,0 +1,129 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from src.config import (
+    DB_NAME,
+    ANSWER_CACHE_BACKEND,
+    ANSWER_CACHE_COLLECTION,
+    ANSWER_CACHE_SIZE,
+    ANSWER_CACHE_TTL_SECONDS,
+    SESSION_VERSION_COLLECTION,
+)
+from src.utils.cache import LRUCache, normalize_query, register_cache_stats
+
+class SessionVersions:
+    """
+    Content version per session, bumped whenever ingestion or a wipe changes what
+    the session contains. Answers are cached under the version they were built
+    from, so a bump makes every older answer of the session unreachable. With a
+    collection the counter is shared by all replicas; otherwise it is in-process.
+    """
+
+    def __init__(self, collection=None):
+        self.collection = collection
+        self._versions: Dict[str, int] = {}
+
+    async def get(self, session_id: str) -> int:
+        if self.collection is None:
+            return self._versions.get(session_id, 0)
+        doc = await self.collection.find_one({"_id": session_id}, projection={"version": 1})
+        return doc["version"] if doc else 0
+
+    async def bump(self, session_id: str):
+        if self.collection is None:
+            self._versions[session_id] = self._versions.get(session_id, 0) + 1
+            return
+        await self.collection.update_one({"_id": session_id}, {"$inc": {"version": 1}}, upsert=True)
+
+class MongoAnswerStore:
+    """Shared answer tier; entries expire through a TTL index on expiresAt (also checked on read)."""
+
+    def __init__(self, collection, ttl_seconds: float):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self._indexed = False
+
+    async def _ensure_index(self):
+        if not self._indexed:
+            await self.collection.create_index("expiresAt", expireAfterSeconds=0)
+            self._indexed = True
+
+    async def get(self, key: str) -> Optional[str]:
+        doc = await self.collection.find_one(
+            {"_id": key, "expiresAt": {"$gt": datetime.now(timezone.utc)}}, projection={"answer": 1}
+        )
+        return doc["answer"] if doc else None
+
+    async def set(self, key: str, answer: str, **fields):
+        await self._ensure_index()
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.ttl_seconds) if self.ttl_seconds else datetime.max.replace(tzinfo=timezone.utc)
+        await self.collection.replace_one(
+            {"_id": key},
+            {"_id": key, "answer": answer, "createdAt": now, "expiresAt": expires_at, **fields},
+            upsert=True,
+        )
+
+class AnswerCache:
+    """
+    Full /chat answers keyed by (session, session version, strategy, model,
+    normalised question). Lookups go to the in-process LRU first, then the
+    optional shared store. Store failures are logged and treated as misses.
+    """
+
+    def __init__(self, cache: LRUCache, versions: SessionVersions, shared_store: Optional[MongoAnswerStore] = None):
+        self.cache = cache
+        self.versions = versions
+        self.shared_store = shared_store
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache.max_size > 0 or self.shared_store is not None
+
+    async def key(self, session_id: str, question: str, strategy: str, model: str) -> str:
+        version = await self.versions.get(session_id)
+        raw = f"{session_id}:{version}:{strategy}:{model}:{normalize_query(question)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        answer = self.cache.get(key)
+        if answer is not None or self.shared_store is None:
+            return answer
+        try:
+            answer = await self.shared_store.get(key)
+        except Exception as e:
+            print(f"Warning: answer cache lookup failed: {e}")
+        if answer is not None:
+            self.cache.set(key, answer)
+        return answer
+
+    async def set(self, key: str, answer: str, session_id: str):
+        self.cache.set(key, answer)
+        if self.shared_store is not None:
+            try:
+                await self.shared_store.set(key, answer, sessionId=session_id)
+            except Exception as e:
+                print(f"Warning: answer cache write failed: {e}")
+
+    async def invalidate(self, session_id: str):
+        """Bumps the session version; answers built from the old content are no longer looked up."""
+        try:
+            await self.versions.bump(session_id)
+        except Exception as e:
+            print(f"Warning: could not bump the version of session '{session_id}': {e}")
+
+_answer_cache = None
+
+def get_answer_cache() -> AnswerCache:
+    global _answer_cache
+    if _answer_cache is None:
+        versions_collection = shared_store = None
+        if ANSWER_CACHE_BACKEND == "mongodb":
+            from src.database import get_async_db_client
+            db = get_async_db_client()[DB_NAME]
+            versions_collection = db[SESSION_VERSION_COLLECTION]
+            shared_store = MongoAnswerStore(db[ANSWER_CACHE_COLLECTION], ANSWER_CACHE_TTL_SECONDS)
+        cache = LRUCache(ANSWER_CACHE_SIZE, ANSWER_CACHE_TTL_SECONDS)
+        _answer_cache = AnswerCache(cache, SessionVersions(versions_collection), shared_store)
+        register_cache_stats("answers", cache.stats)
+    return _answer_cache
@@ -1,65 +1,174 @@
 from langchain_core.messages import HumanMessage, SystemMessage
-from src.database import get_vector_store
-from src.config import OPENAI_LLM_MODEL, GOOGLE_LLM_MODEL, LOCAL_LLM_MODEL, LLM_PROVIDER, GOOGLE_API_KEY, QUERY_TRANSLATION_TYPE
-from src.services.query_translation import TranslatorFactory, QueryTranslationService
+from src.database import get_vector_store, get_repository
+from src.config import (
+    OPENAI_LLM_MODEL, GOOGLE_LLM_MODEL, LOCAL_LLM_MODEL, LLM_PROVIDER, GOOGLE_API_KEY, QUERY_TRANSLATION_TYPE,
+    RETRIEVAL_TOP_K, RETRIEVAL_MAX_CONCURRENCY, RETRIEVAL_QUERY_TIMEOUT_SECONDS,
+    RETRIEVAL_FINAL_TOP_K, RETRIEVAL_FUSION, RETRIEVAL_RRF_K, RETRIEVAL_SPECULATIVE, RETRIEVAL_DEADLINE_SECONDS,
+    RETRIEVAL_LEXICAL, RETRIEVAL_LEXICAL_TOP_K, RETRIEVAL_LEXICAL_FAST_PATH,
+    RETRIEVAL_QUERY_ANALYSIS, RETRIEVAL_ROLE_FILTER, RETRIEVAL_DIRECT_LOOKUP
+)
+from src.services.query_translation import TranslatorFactory, QueryTranslationService, QueryTranslationType
+from src.services.context import assemble_context
+from src.services.lexical_index import get_lexical_index
+from src.services.query_analysis import QueryAnalyzer
 from src.core.constants import PrototypeConstants
-from src.database.helpers import is_session_empty
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_ollama import ChatOllama
+from src.services.answer_cache import get_answer_cache
+from src.core.providers import CHAT_MODEL_CLASSES, load_provider_class, model_name
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Tuple
 import os
+import time
 
 def get_llm():
     provider = LLM_PROVIDER
+    # The provider's SDK is imported on first use, not when this module loads
+    chat_model = load_provider_class(CHAT_MODEL_CLASSES, provider)
     
     if provider == "openai":
-        return ChatOpenAI(model=OPENAI_LLM_MODEL)
+        return chat_model(model=OPENAI_LLM_MODEL)
     elif provider in ["ollama", "local"]:
-        return ChatOllama(model=LOCAL_LLM_MODEL, temperature=0.7)
-    elif provider == "google":
-        return ChatGoogleGenerativeAI(model=GOOGLE_LLM_MODEL, api_key=GOOGLE_API_KEY)
+        return chat_model(model=LOCAL_LLM_MODEL, temperature=0.7)
     else:
-        return ChatGoogleGenerativeAI(model=GOOGLE_LLM_MODEL, api_key=GOOGLE_API_KEY)
+        return chat_model(model=GOOGLE_LLM_MODEL, api_key=GOOGLE_API_KEY)
 
 def format_docs(docs):
     return "\n\n".join(doc.page_content for doc in docs)
 
-async def ask_question(question: str, session_id: str):
-    vector_store = get_vector_store()
-    llm = get_llm()
-    
-    # Initialize Query Translation
-    translator = TranslatorFactory.get_translator(QUERY_TRANSLATION_TYPE, llm=llm)
-    translation_service = QueryTranslationService(translator)
+SYSTEM_PROMPT = """You are an expert AI Recruiter Assistant.
+    Use the following context (resumes/CVs) to answer the user's question.
+    If the answer is not in the context, say you don't know.
     
-    effective_session_id = session_id
-    if is_session_empty(session_id):
+    Context:
+    {context}
+    """
+
+@dataclass
+class ChatAnswer:
+    answer: str
+    # HIT, MISS, or BYPASS when the answer cache is disabled
+    cache_status: str
+
+async def _effective_session(session_id: str) -> str:
+    if await get_repository().is_session_empty(session_id):
         print(f"Session '{session_id}' is empty. Falling back to prototype sample data ('{PrototypeConstants.SAMPLE_SESSION_ID}')...")
-        effective_session_id = PrototypeConstants.SAMPLE_SESSION_ID
+        return PrototypeConstants.SAMPLE_SESSION_ID
+    return session_id
+
+async def _cached_answer(answer_cache, llm, session_id: str, question: str) -> Tuple[Optional[str], Optional[str]]:
+    """(cache key, cached answer); the key is None when the answer cache is disabled."""
+    if not answer_cache.enabled:
+        return None, None
+    # The key carries the session version read now: if ingestion changes the session
+    # while this answer is generated, it is stored under a version no longer looked up
+    cache_key = await answer_cache.key(session_id, question, QUERY_TRANSLATION_TYPE, model_name(llm))
+    cached = await answer_cache.get(cache_key)
+    if cached is not None:
+        print(f"Answer cache hit for session '{session_id}'.")
+    return cache_key, cached
+
+async def _retrieve_context(question: str, llm, session_id: str):
+    """(retrieved docs, packed prompt context) for a question."""
+    # Initialize Query Translation; only the adaptive translator routes on the named candidates
+    adaptive = QUERY_TRANSLATION_TYPE.lower() == QueryTranslationType.ADAPTIVE.value
+    translator = TranslatorFactory.get_translator(
+        QUERY_TRANSLATION_TYPE,
+        llm=llm,
+        lexical_index=get_lexical_index() if RETRIEVAL_LEXICAL == "hybrid" else None,
+        query_analyzer=QueryAnalyzer(role_filter=False) if adaptive else None,
+    )
+    translation_service = QueryTranslationService(
+        translator,
+        top_k=RETRIEVAL_TOP_K,
+        max_concurrency=RETRIEVAL_MAX_CONCURRENCY,
+        query_timeout=RETRIEVAL_QUERY_TIMEOUT_SECONDS,
+        final_top_k=RETRIEVAL_FINAL_TOP_K,
+        fusion=RETRIEVAL_FUSION,
+        rrf_k=RETRIEVAL_RRF_K,
+        speculative=RETRIEVAL_SPECULATIVE,
+        deadline=RETRIEVAL_DEADLINE_SECONDS,
+        lexical_index=get_lexical_index() if RETRIEVAL_LEXICAL == "hybrid" else None,
+        lexical_top_k=RETRIEVAL_LEXICAL_TOP_K,
+        lexical_fast_path=RETRIEVAL_LEXICAL_FAST_PATH,
+        query_analyzer=QueryAnalyzer(role_filter=RETRIEVAL_ROLE_FILTER) if RETRIEVAL_QUERY_ANALYSIS else None,
+        direct_lookup=RETRIEVAL_DIRECT_LOOKUP,
+    )
 
     # Retrieve documents using translation (handles multi-query, decomposition, etc.)
     docs = await translation_service.retrieve_with_translation(
         query=question, 
-        vector_store=vector_store, 
-        session_id=effective_session_id
+        vector_store=get_vector_store(), 
+        session_id=session_id
     )
     
-    context = format_docs(docs)
+    # Identity header once per candidate instead of once per chunk, within the token budget
+    return docs, await assemble_context(docs, session_id)
 
-    system_prompt = """You are an expert AI Recruiter Assistant.
-    Use the following context (resumes/CVs) to answer the user's question.
-    If the answer is not in the context, say you don't know.
-    
-    Context:
-    {context}
-    """
-    
-    formatted_system = system_prompt.format(context=context)
-    
-    messages = [
-        SystemMessage(content=formatted_system),
+def _messages(question: str, context: str) -> list:
+    return [
+        SystemMessage(content=SYSTEM_PROMPT.format(context=context)),
         HumanMessage(content=question)
     ]
-    
-    response = await llm.ainvoke(messages)
-    return response.content
+
+async def answer_question(question: str, session_id: str) -> ChatAnswer:
+    llm = get_llm()
+    effective_session_id = await _effective_session(session_id)
+
+    answer_cache = get_answer_cache()
+    cache_key, cached = await _cached_answer(answer_cache, llm, effective_session_id, question)
+    if cached is not None:
+        return ChatAnswer(answer=cached, cache_status="HIT")
+
+    _, context = await _retrieve_context(question, llm, effective_session_id)
+    response = await llm.ainvoke(_messages(question, context.text))
+    if cache_key is None:
+        return ChatAnswer(answer=response.content, cache_status="BYPASS")
+    await answer_cache.set(cache_key, response.content, effective_session_id)
+    return ChatAnswer(answer=response.content, cache_status="MISS")
+
+async def ask_question(question: str, session_id: str) -> str:
+    return (await answer_question(question, session_id)).answer
+
+async def stream_question(question: str, session_id: str) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Same pipeline as answer_question, as (event, data) pairs: a "session" and a
+    "retrieval" and "context" stage event, then the answer as "token" events
+    from llm.astream, then "done" with timings. A cached answer is sent as a
+    single token. The answer is cached only once the stream completes.
+    """
+    started = time.perf_counter()
+    llm = get_llm()
+    effective_session_id = await _effective_session(session_id)
+    yield "session", {"sessionId": effective_session_id, "sampleFallback": effective_session_id != session_id}
+
+    answer_cache = get_answer_cache()
+    cache_key, cached = await _cached_answer(answer_cache, llm, effective_session_id, question)
+    if cached is not None:
+        yield "token", {"text": cached}
+        yield "done", {"cache": "HIT", "seconds": round(time.perf_counter() - started, 3)}
+        return
+
+    docs, context = await _retrieve_context(question, llm, effective_session_id)
+    yield "retrieval", {"chunks": len(docs), "seconds": round(time.perf_counter() - started, 3)}
+    yield "context", context.report()
+
+    parts = []
+    first_token = None
+    async for chunk in llm.astream(_messages(question, context.text)):
+        # Some providers stream content blocks; only text is forwarded
+        text = chunk.content if isinstance(chunk.content, str) else chunk.text
+        if not text:
+            continue
+        if first_token is None:
+            first_token = time.perf_counter() - started
+        parts.append(text)
+        yield "token", {"text": text}
+
+    status = "BYPASS"
+    if cache_key is not None:
+        await answer_cache.set(cache_key, "".join(parts), effective_session_id)
+        status = "MISS"
+    yield "done", {
+        "cache": status,
+        "seconds": round(time.perf_counter() - started, 3),
+        "timeToFirstTokenSeconds": round(first_token, 3) if first_token is not None else None,
+    }
@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from langchain_core.documents import Document
+from src.database import get_repository
+from src.config import CONTEXT_TOKEN_BUDGET, CONTEXT_TOKENIZER_ENCODING
+from src.utils.formatting import format_candidate_header, SECTION_MARKER
+from src.utils.tokens import get_token_counter
+
+HEADER_PREFIX = "CANDIDATE IDENTITY:"
+SECTION_PREFIX = "--- SECTION CONTENT ---\n"
+BLOCK_SEPARATOR = "\n\n"
+
+def split_enriched_content(content: str):
+    """Splits an enriched chunk into (header, section text). Compact chunks have no header."""
+    if content.startswith(HEADER_PREFIX) and SECTION_MARKER in content:
+        header, section = content.split(SECTION_MARKER, 1)
+        return header, section
+    return None, content
+
+def group_by_candidate(docs: List[Document]) -> Dict[str, List[Document]]:
+    """Groups chunks per candidate email, keeping the retrieval order of first appearance."""
+    groups = {}
+    for doc in docs:
+        groups.setdefault(doc.metadata.get("email"), []).append(doc)
+    return groups
+
+def format_context(docs: List[Document], candidates: Dict[str, dict]) -> str:
+    """
+    Renders the prompt context with the identity header written once per candidate,
+    followed by that candidate's sections. Works for both enriched and compact chunks.
+    """
+    blocks = []
+    for email, group in group_by_candidate(docs).items():
+        header = candidate_header(email, group, candidates)
+        parts = [header] if header else []
+        parts.extend(SECTION_PREFIX + split_enriched_content(doc.page_content)[1] for doc in group)
+        blocks.append(BLOCK_SEPARATOR.join(parts))
+    return BLOCK_SEPARATOR.join(blocks)
+
+def candidate_header(email: Optional[str], group: List[Document], candidates: Dict[str, dict]) -> Optional[str]:
+    """Header of a candidate: its record, else the header stored in its chunks, else chunk metadata."""
+    record = candidates.get(email)
+    if record:
+        return format_candidate_header(record["email"], record["name"], record["address"], record["role"])
+    for doc in group:
+        stored_header, _ = split_enriched_content(doc.page_content)
+        if stored_header:
+            return stored_header
+    if email:
+        meta = group[0].metadata
+        return format_candidate_header(email, meta.get("name", "Not Found"), "Not Found", meta.get("role", "Not Found"))
+    return None
+
+@dataclass
+class PackedContext:
+    """Prompt context that fits a token budget, with what had to be left out."""
+    text: str
+    tokens: int
+    budget: int
+    tokenizer: str
+    chunks: int
+    candidates: int
+    # {"email", "chunk", "tokens", "score"} per dropped chunk, in relevance order
+    dropped: List[dict] = field(default_factory=list)
+    # Candidates none of whose chunks made it into the context
+    dropped_candidates: List[str] = field(default_factory=list)
+
+    def report(self) -> dict:
+        return {
+            "tokens": self.tokens,
+            "budget": self.budget,
+            "tokenizer": self.tokenizer,
+            "chunks": self.chunks,
+            "candidates": self.candidates,
+            "droppedChunks": len(self.dropped),
+            "droppedCandidates": self.dropped_candidates,
+        }
+
+def _dropped_entry(doc: Document, tokens: int) -> dict:
+    return {
+        "email": doc.metadata.get("email"),
+        "chunk": doc.metadata.get("chunkHash") or doc.id,
+        "tokens": tokens,
+        "score": doc.metadata.get("retrievalScore"),
+    }
+
+def pack_context(
+    docs: List[Document],
+    candidates: Dict[str, dict],
+    budget: int = CONTEXT_TOKEN_BUDGET,
+    count_tokens: Optional[Callable[[str], int]] = None,
+    tokenizer: str = CONTEXT_TOKENIZER_ENCODING,
+) -> PackedContext:
+    """
+    Fills the token budget with chunks in the given (relevance) order, grouped per
+    candidate as in format_context. A chunk costs its section tokens, plus the header
+    the first time its candidate appears; chunks that do not fit are skipped and the
+    next ones still get a chance. A budget of 0 keeps everything.
+    """
+    if count_tokens is None:
+        count_tokens, tokenizer = get_token_counter(tokenizer)
+    separator = count_tokens(BLOCK_SEPARATOR)
+
+    included, dropped, headers = [], [], {}
+    used = 0
+    for doc in docs:
+        email = doc.metadata.get("email")
+        cost = count_tokens(SECTION_PREFIX + split_enriched_content(doc.page_content)[1]) + separator
+        header_cost = 0
+        if email not in headers:
+            header = candidate_header(email, [doc], candidates)
+            header_cost = count_tokens(header) + separator if header else 0
+        if budget <= 0 or used + header_cost + cost <= budget:
+            included.append(doc)
+            headers.setdefault(email, header_cost)
+            used += header_cost + cost
+        else:
+            dropped.append(_dropped_entry(doc, cost))
+
+    text = format_context(included, candidates)
+    tokens = count_tokens(text)
+    # Per-piece counts can differ slightly from the joined text; trim from the least relevant end
+    while budget > 0 and tokens > budget and included:
+        doc = included.pop()
+        dropped.insert(0, _dropped_entry(doc, count_tokens(split_enriched_content(doc.page_content)[1])))
+        text = format_context(included, candidates)
+        tokens = count_tokens(text)
+
+    emails = {doc.metadata.get("email") for doc in included}
+    return PackedContext(
+        text=text,
+        tokens=tokens,
+        budget=budget,
+        tokenizer=tokenizer,
+        chunks=len(included),
+        candidates=len(emails),
+        dropped=dropped,
+        dropped_candidates=sorted({d["email"] for d in dropped if d["email"]} - emails),
+    )
+
+async def assemble_context(docs: List[Document], session_id: str, budget: int = CONTEXT_TOKEN_BUDGET) -> PackedContext:
+    """Loads the candidate records referenced by the retrieved chunks and packs the context."""
+    emails = [email for email in group_by_candidate(docs) if email]
+    records = await get_repository().find_candidates(session_id, emails) if emails else []
+    packed = pack_context(docs, {r["email"]: r for r in records}, budget)
+    if packed.dropped:
+        left_out = f" (candidates left out: {', '.join(packed.dropped_candidates)})" if packed.dropped_candidates else ""
+        print(
+            f"Context: {packed.chunks} chunks from {packed.candidates} candidates, {packed.tokens}/{budget} tokens; "
+            f"dropped {len(packed.dropped)} chunks{left_out}"
+        )
+    return packed
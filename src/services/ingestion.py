@@ -1,127 +1,674 @@
+import asyncio
 import hashlib
 import os
 import glob
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 from langchain_core.documents import Document as LCDocument
-from src.database import get_vector_store, DB_NAME, COLLECTION_NAME
-from src.utils.parsing import extract_email, extract_name, extract_address, extract_job_role
-from src.utils.formatting import generate_id
+from src.database import get_vector_store, get_repository, BulkChunkWriter
+from src.services.text_splitter import SectionTextSplitter
+from src.services.lexical_index import get_lexical_index
+from src.services.query_analysis import forget_session
+from src.services.answer_cache import get_answer_cache
+from src.utils.parsing import extract_fields
+from src.utils.formatting import generate_id, format_candidate_header, SECTION_MARKER
+from src.config import (
+    CHUNK_STORAGE_MODE,
+    CHUNK_STORAGE_LAYOUT,
+    TEXT_SPLITTER_MODE,
+    INGEST_PARSE_WORKERS,
+    INGEST_PREPARE_CONCURRENCY,
+    INGEST_EMBED_BATCH_SIZE,
+    INGEST_EMBED_CONCURRENCY,
+    INGEST_WRITE_CONCURRENCY,
+    INGEST_QUEUE_SIZE
+)
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
 
-async def ingest_single_cv(full_content: str, source_name: str, session_id: str):
+# Optional async callback: progress(source, status, error=None, chunks=None)
+# with status one of "parsing", "embedding", "done", "failed" (see services/jobs.py)
+ProgressCallback = Callable[..., Awaitable[None]]
+
+async def _report(progress: Optional[ProgressCallback], source: str, status: str, **info):
+    if progress is not None:
+        await progress(source, status, **info)
+
+@dataclass
+class ParsedCandidate:
+    """CPU-side result for one CV: extracted fields and raw chunk texts (picklable)."""
+    source: str
+    content_hash: str
+    email: Optional[str]
+    name: str
+    role: str
+    address: str
+    chunks: List[str]
+
+@dataclass
+class PreparedCandidate:
+    """
+    A changed candidate: new chunks to embed and write, plus the stored chunks
+    to keep (re-stamped with the new contentHash) or delete once the write succeeded.
+    """
+    source: str
+    email: str
+    content_hash: str
+    candidate: dict
+    documents: List[LCDocument]
+    kept_ids: list = field(default_factory=list)
+    removed_ids: list = field(default_factory=list)
+    # Shared layout: new chunks already stored for another session, linked instead of embedded
+    linked: int = 0
+    # Every chunk of the new version (kept ones included), for the lexical index
+    chunks: List[LCDocument] = field(default_factory=list)
+
+@dataclass
+class EmbeddingBatch:
+    candidates: List[PreparedCandidate]
+    vectors: List[List[float]] = field(default_factory=list)
+
+    @property
+    def documents(self) -> List[LCDocument]:
+        return [doc for c in self.candidates for doc in c.documents]
+
+async def ingest_single_cv(full_content: str, source_name: str, session_id: str, progress: Optional[ProgressCallback] = None):
     # Only Mongo
-    await _ingest_mongo(full_content, source_name, session_id)
+    return await _ingest_mongo(full_content, source_name, session_id, progress)
 
 # _ingest_json removed
 
-async def _ingest_mongo(full_content: str, source_name: str, session_id: str):
+async def _ingest_mongo(full_content: str, source_name: str, session_id: str, progress: Optional[ProgressCallback] = None):
     """Full-featured ingestion for MongoDB with state tracking."""
     vector_store = get_vector_store()
-    
-    content_hash = hashlib.sha256(full_content.encode()).hexdigest()
-    email = extract_email(full_content)
-    
+
+    try:
+        await _report(progress, source_name, "parsing")
+        parsed = await asyncio.to_thread(_parse_candidate, full_content, source_name)
+        prepared = await _prepare_candidate(parsed, session_id)
+        if prepared is None:
+            await _report(progress, source_name, "done", chunks=0)
+            return {"added": 0, "kept": 0, "removed": 0, "linked": 0}
+
+        documents = prepared.documents
+        if documents:
+            await _report(progress, source_name, "embedding")
+            vectors = await vector_store.embeddings.aembed_documents([d.page_content for d in documents])
+            await BulkChunkWriter(vector_store).write(documents, vectors)
+        await _finalize_candidate(prepared)
+    except Exception as e:
+        await _report(progress, source_name, "failed", error=str(e))
+        raise
+    print(f"Ingested {len(documents)} chunks for {prepared.email} into MongoDB ({_diff_label(prepared)}).")
+    await _report(progress, source_name, "done", chunks=len(documents))
+    return _diff_counts(prepared)
+
+def read_file_content(file_path: str) -> str:
+    """Text of a PDF or plain-text CV."""
+    if file_path.lower().endswith(".pdf"):
+        loader = PyPDFLoader(file_path)
+        docs = loader.load()
+        return "\n".join([d.page_content for d in docs])
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def _parse_candidate(full_content: str, source_name: str) -> ParsedCandidate:
+    """Hashing, field extraction and splitting. Pure CPU work, safe to run in a worker process."""
+    fields = extract_fields(full_content)
+    return ParsedCandidate(
+        source=source_name,
+        content_hash=hashlib.sha256(full_content.encode()).hexdigest(),
+        email=fields.email,
+        name=fields.name,
+        role=fields.role,
+        address=fields.address,
+        chunks=_split_content(full_content),
+    )
+
+def _load_and_parse(file_path: str, source_name: str) -> ParsedCandidate:
+    return _parse_candidate(read_file_content(file_path), source_name)
+
+async def _prepare_candidate(parsed: ParsedCandidate, session_id: str) -> Optional[PreparedCandidate]:
+    """Change detection against stored chunks. Returns None when nothing has to be written."""
+    repository = get_repository()
+    email = parsed.email
+    content_hash = parsed.content_hash
+
     if not email:
-        raise ValueError(f"Could not find email in candidate data ({source_name}).")
-        
-    # Check existence
-    # Check for existing documents for this candidate in this session
-    from src.database import get_db_client
-    client = get_db_client()
-    collection = client[DB_NAME][COLLECTION_NAME]
-    
-    # query for any document with this session and email
-    # Mongo keys are flattened
-    existing_doc = collection.find_one({"sessionId": session_id, "email": email})
-    
-    if existing_doc:
-        old_hash = existing_doc.get("contentHash")
-        if old_hash == content_hash:
-            print(f"Skipping Mongo ingest: Content unchanged for {email} (Hash: {content_hash[:8]}...).")
-            return
-        else:
-            print(f"Content changed for {email} in session {session_id} (old={str(old_hash)[:8]}..., new={content_hash[:8]}...). Updating MongoDB...")
-            collection.delete_many({"sessionId": session_id, "email": email})
-
-    name = extract_name(full_content)
-    role = extract_job_role(full_content)
-    
-    documents = _create_chunks(full_content, source_name, session_id, email, name, role, content_hash)
-    
-    if not documents:
-        return
-
-    await vector_store.aadd_documents(documents)
-    print(f"Ingested {len(documents)} chunks for {email} into MongoDB.")
-
-def _create_chunks(content, source, session_id, email, name, role, content_hash=None):
-    address = extract_address(content)
-    
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200,
-        separators=["\n----------------\n", "\nSECTION\n", "\n\n", "\n", " "]
+        raise ValueError(f"Could not find email in candidate data ({parsed.source}).")
+
+    # Check for existing chunks for this candidate in this session
+    existing = await repository.find_candidate_chunks(session_id, email)
+
+    if existing and await _is_unchanged(repository, existing, session_id, email, content_hash):
+        print(f"Skipping Mongo ingest: Content unchanged for {email} (Hash: {content_hash[:8]}...).")
+        return None
+
+    documents = _create_chunks(parsed, session_id)
+    if not documents and not existing:
+        return None
+
+    new_documents, kept_ids, removed_ids = _diff_chunks(existing, documents)
+    linked = 0
+    if repository.shared and new_documents:
+        # Identical chunks of one CV share an id; chunks another session already
+        # stored only need this session added to them
+        new_documents = list({d.id: d for d in new_documents}.values())
+        linked_ids = await repository.link_chunks(session_id, [d.id for d in new_documents])
+        new_documents = [d for d in new_documents if d.id not in linked_ids]
+        linked = len(linked_ids)
+
+    prepared = PreparedCandidate(
+        source=parsed.source,
+        email=email,
+        content_hash=content_hash,
+        candidate=_candidate_record(parsed, session_id),
+        documents=new_documents,
+        kept_ids=kept_ids,
+        removed_ids=removed_ids,
+        linked=linked,
+        chunks=documents,
     )
-    
-    split_docs = splitter.split_text(content)
+    if existing:
+        print(f"Content changed for {email} in session {session_id} (new={content_hash[:8]}...): {_diff_label(prepared)}.")
+    return prepared
+
+async def _is_unchanged(repository, existing: List[dict], session_id: str, email: str, content_hash: str) -> bool:
+    if repository.shared:
+        # Shared chunks carry the contentHash of whichever session stored them first;
+        # the per-session candidate record holds this session's version
+        records = await repository.find_candidates(session_id, [email])
+        return bool(records) and records[0].get("contentHash") == content_hash
+    return all(doc.get("contentHash") == content_hash for doc in existing)
+
+def _chunk_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def _shared_chunk_id(email: str, chunk_hash: str) -> str:
+    """Content address of a chunk in the shared layout."""
+    return hashlib.sha256(f"{email}:{chunk_hash}".encode()).hexdigest()
+
+def _diff_chunks(existing: List[dict], documents: List[LCDocument]):
+    """
+    Matches new chunks against stored ones by chunkHash (as a multiset, so repeated
+    chunks are matched one-to-one). Returns (documents to add, ids to keep, ids to remove).
+    """
+    stored = defaultdict(list)
+    for doc in existing:
+        # Chunks written before chunkHash existed are hashed from their stored text
+        chunk_hash = doc.get("chunkHash") or _chunk_hash(doc.get("text", ""))
+        stored[chunk_hash].append(doc["_id"])
+
+    new_documents, kept_ids = [], []
+    for document in documents:
+        ids = stored.get(document.metadata["chunkHash"])
+        if ids:
+            kept_ids.append(ids.pop())
+        else:
+            new_documents.append(document)
+    removed_ids = [doc_id for ids in stored.values() for doc_id in ids]
+    return new_documents, kept_ids, removed_ids
+
+async def _finalize_candidate(prepared: PreparedCandidate):
+    """
+    Applies the rest of the diff after the new chunks are written: removed chunks are
+    deleted and kept ones take the new contentHash. Until then the old hash stays on
+    the kept chunks, so a failed write is retried in full on the next upload.
+    Shared chunks are left untouched; the candidate record carries the session's hash.
+    """
+    repository = get_repository()
+    await repository.upsert_candidate(prepared.candidate)
+    if prepared.removed_ids:
+        await repository.remove_chunks(prepared.candidate["sessionId"], prepared.removed_ids)
+    if prepared.kept_ids and not repository.shared:
+        await repository.update_documents(
+            prepared.kept_ids, {"contentHash": prepared.content_hash, "source": prepared.source}
+        )
+    get_lexical_index().replace_candidate(prepared.candidate["sessionId"], prepared.email, prepared.chunks)
+    forget_session(prepared.candidate["sessionId"])
+    await get_answer_cache().invalidate(prepared.candidate["sessionId"])
+
+async def _discard_written(prepared: PreparedCandidate):
+    """
+    Removes the new chunks a failed write may have stored (unordered inserts succeed
+    in part), so they do not sit next to the old version until the next upload.
+    They are the candidate's chunks carrying the new contentHash that are not kept ones.
+    """
+    repository = get_repository()
+    session_id = prepared.candidate["sessionId"]
+    try:
+        if repository.shared:
+            ids = [doc.id for doc in prepared.documents]
+        else:
+            kept = set(prepared.kept_ids)
+            stored = await repository.find_candidate_chunks(session_id, prepared.email)
+            ids = [
+                doc["_id"] for doc in stored
+                if doc.get("contentHash") == prepared.content_hash and doc["_id"] not in kept
+            ]
+        if ids:
+            await repository.remove_chunks(session_id, ids)
+    except Exception as e:
+        print(f"Warning: could not remove the partly written chunks of {prepared.email}: {e}")
+
+def _diff_counts(prepared: PreparedCandidate) -> dict:
+    return {
+        "added": len(prepared.documents),
+        "kept": len(prepared.kept_ids),
+        "removed": len(prepared.removed_ids),
+        "linked": prepared.linked,
+    }
+
+def _diff_label(prepared: PreparedCandidate) -> str:
+    counts = _diff_counts(prepared)
+    label = f"{counts['added']} added, {counts['kept']} kept, {counts['removed']} removed"
+    return label + (f", {counts['linked']} linked" if counts["linked"] else "")
+
+# One configured splitter per process (ingestion worker processes build their own on import)
+_splitter = (
+    SectionTextSplitter.sections(chunk_size=1000, chunk_overlap=200)
+    if TEXT_SPLITTER_MODE == "sections"
+    else SectionTextSplitter.compatible(chunk_size=1000, chunk_overlap=200)
+)
+
+def _split_content(content: str) -> List[str]:
+    return _splitter.split_text(content)
+
+def _candidate_record(parsed: ParsedCandidate, session_id: str) -> dict:
+    """Identity fields stored once per candidate, used to build the prompt header."""
+    return {
+        "sessionId": session_id,
+        "email": parsed.email,
+        "name": parsed.name,
+        "address": parsed.address,
+        "role": parsed.role,
+        "source": parsed.source,
+        "contentHash": parsed.content_hash,
+    }
+
+def _create_chunks(
+    parsed: ParsedCandidate,
+    session_id: str,
+    storage_mode: str = CHUNK_STORAGE_MODE,
+    layout: str = CHUNK_STORAGE_LAYOUT,
+):
+    email, name, role, address = parsed.email, parsed.name, parsed.role, parsed.address
+    header = format_candidate_header(email, name, address, role)
     documents = []
-    
-    for i, chunk in enumerate(split_docs):
-        enriched_content = f"CANDIDATE IDENTITY: {email}\nFULL NAME: {name}\nADDRESS: {address}\nJOB ROLE: {role}\n\n--- SECTION CONTENT ---\n{chunk}"
-        
-        metadata = {
-            "sessionId": session_id,
-            "email": email,
-            "name": name,
-            "role": role,
-            "source": source
-        }
-        if content_hash:
-            metadata["contentHash"] = content_hash
-        
-        documents.append(LCDocument(page_content=enriched_content, metadata=metadata))
-    
+
+    for i, chunk in enumerate(parsed.chunks):
+        if storage_mode == "compact":
+            # Identity lives in the candidate record; the chunk only references it by email
+            content = chunk
+            metadata = {"sessionId": session_id, "email": email, "source": parsed.source}
+        else:
+            content = f"{header}{SECTION_MARKER}{chunk}"
+            metadata = {
+                "sessionId": session_id,
+                "email": email,
+                "name": name,
+                "role": role,
+                "source": parsed.source
+            }
+        metadata["chunkHash"] = _chunk_hash(content)
+        if parsed.content_hash:
+            metadata["contentHash"] = parsed.content_hash
+
+        doc_id = _shared_chunk_id(email, metadata["chunkHash"]) if layout == "shared" else None
+        documents.append(LCDocument(page_content=content, metadata=metadata, id=doc_id))
+
     return documents
 
-async def ingest_directory(directory_path: str, session_id: str):
+_END = object()
+
+_parse_executor = None
+
+def get_parse_executor() -> ProcessPoolExecutor:
     """
-    Ingest all .txt and .pdf files from a directory into the vector store.
-    Fault-tolerant: continues even if individual files fail.
+    Process pool for CV parsing, created once per process. Workers are spawned
+    rather than forked: the server holds Motor/pymongo threads, which a fork would
+    copy in an arbitrary state (spawn is also what Windows does anyway).
     """
+    global _parse_executor
+    if _parse_executor is None:
+        _parse_executor = ProcessPoolExecutor(
+            max_workers=max(1, INGEST_PARSE_WORKERS), mp_context=multiprocessing.get_context("spawn")
+        )
+    return _parse_executor
+
+def shutdown_parse_executor():
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
+
+class IngestionPipeline:
+    """
+    Staged directory ingestion with bounded queues between stages:
+      parse (process pool) -> prepare (change detection) -> batch -> embed -> write (bulk insert)
+    Embedding batches span several candidates, so the provider sees full batches
+    instead of one small request per CV. Writers coalesce embedded batches that are
+    already waiting into write batches of up to INGEST_WRITE_BATCH_SIZE chunks, cut
+    at candidate boundaries. A failure only fails the files it touches; a failed
+    write also removes whatever part of its candidates' new chunks was stored.
+
+    Change detection reads the stored chunks, so two files of one candidate must
+    not be in flight together (both would see no chunks and both get inserted).
+    The files run in rounds: a round takes at most one file per email, later
+    files of that email wait for the next round, and among the waiting ones only
+    the last listed is kept. The last listed file wins, as with sequential ingestion.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        parse_workers: int = INGEST_PARSE_WORKERS,
+        prepare_concurrency: int = INGEST_PREPARE_CONCURRENCY,
+        embed_batch_size: int = INGEST_EMBED_BATCH_SIZE,
+        embed_concurrency: int = INGEST_EMBED_CONCURRENCY,
+        write_concurrency: int = INGEST_WRITE_CONCURRENCY,
+        queue_size: int = INGEST_QUEUE_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        root: Optional[str] = None,
+    ):
+        self.session_id = session_id
+        # Sources (progress keys, stored "source") are paths relative to root, so
+        # equal file names in different subdirectories stay apart
+        self.root = root
+        self.progress = progress
+        self.parse_workers = max(1, parse_workers)
+        self.prepare_concurrency = max(1, prepare_concurrency)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.embed_concurrency = max(1, embed_concurrency)
+        self.write_concurrency = max(1, write_concurrency)
+        self.queue_size = max(1, queue_size)
+        self.vector_store = get_vector_store()
+        self.writer = BulkChunkWriter(self.vector_store)
+
+        self.successful = 0
+        self.failed = 0
+        self.chunks = 0
+        self.kept = 0
+        self.removed = 0
+        self.linked = 0
+        self.errors = []
+        self.stages = {
+            name: {"items": 0, "busySeconds": 0.0}
+            for name in ("parse", "prepare", "embed", "write")
+        }
+        # email -> index of the file ingested for it in the current round
+        self._claims: Dict[str, int] = {}
+        # email -> (index, parsed file) waiting for the next round
+        self._deferred: Dict[str, Tuple[int, ParsedCandidate]] = {}
+
+    async def _fail(self, sources: List[str], error: Exception):
+        for source in sources:
+            error_msg = f"Failed to ingest {source}: {str(error)}"
+            print(error_msg)
+            self.failed += 1
+            self.errors.append(error_msg)
+            await _report(self.progress, source, "failed", error=str(error))
+
+    def _record(self, stage: str, started: float, items: int = 1):
+        self.stages[stage]["items"] += items
+        self.stages[stage]["busySeconds"] += time.perf_counter() - started
+
+    async def _parse_stage(self, paths: asyncio.Queue, out: asyncio.Queue, executor):
+        loop = asyncio.get_running_loop()
+        while (item := await paths.get()) is not _END:
+            index, path = item
+            source = self._source(path)
+            started = time.perf_counter()
+            await _report(self.progress, source, "parsing")
+            try:
+                parsed = await loop.run_in_executor(executor, _load_and_parse, path, source)
+            except Exception as e:
+                await self._fail([source], e)
+                continue
+            finally:
+                self._record("parse", started)
+            await out.put((index, parsed))
+
+    def _source(self, path: str) -> str:
+        return os.path.relpath(path, self.root) if self.root else os.path.basename(path)
+
+    async def _skip_superseded(self, parsed: ParsedCandidate):
+        print(f"Skipping {parsed.source}: a later file in this run has the same email ({parsed.email}).")
+        self.successful += 1
+        await _report(self.progress, parsed.source, "done", chunks=0)
+
+    async def _defer_duplicate(self, index: int, parsed: ParsedCandidate) -> bool:
+        """True when another file of the same candidate is in this round (the file then waits or is dropped)."""
+        email = parsed.email
+        if not email:
+            return False
+        claimed = self._claims.setdefault(email, index)
+        if claimed == index:
+            return False
+        deferred = self._deferred.get(email)
+        if index < claimed or (deferred is not None and index < deferred[0]):
+            await self._skip_superseded(parsed)
+            return True
+        if deferred is not None:
+            await self._skip_superseded(deferred[1])
+        self._deferred[email] = (index, parsed)
+        return True
+
+    async def _prepare_stage(self, parsed_q: asyncio.Queue, out: asyncio.Queue):
+        while (item := await parsed_q.get()) is not _END:
+            index, parsed = item
+            if await self._defer_duplicate(index, parsed):
+                continue
+            started = time.perf_counter()
+            try:
+                prepared = await _prepare_candidate(parsed, self.session_id)
+            except Exception as e:
+                await self._fail([parsed.source], e)
+                continue
+            finally:
+                self._record("prepare", started)
+            if prepared is None:
+                # Unchanged content counts as a successful ingest
+                self.successful += 1
+                await _report(self.progress, parsed.source, "done", chunks=0)
+            elif not prepared.documents:
+                # Only removals or re-stamping, nothing to embed
+                try:
+                    await self._finish(prepared)
+                except Exception as e:
+                    await self._fail([prepared.source], e)
+            else:
+                await out.put(prepared)
+
+    async def _finish(self, candidate: PreparedCandidate):
+        await _finalize_candidate(candidate)
+        self.successful += 1
+        self.chunks += len(candidate.documents)
+        self.kept += len(candidate.kept_ids)
+        self.removed += len(candidate.removed_ids)
+        self.linked += candidate.linked
+        print(f"Ingested {len(candidate.documents)} chunks for {candidate.email} into MongoDB ({_diff_label(candidate)}).")
+        await _report(self.progress, candidate.source, "done", chunks=len(candidate.documents))
+
+    async def _batch_stage(self, prepared_q: asyncio.Queue, out: asyncio.Queue, producers: int):
+        """Groups whole candidates into embedding batches of ~embed_batch_size chunks."""
+        batch, size, finished = [], 0, 0
+        while finished < producers:
+            prepared = await prepared_q.get()
+            if prepared is _END:
+                finished += 1
+                continue
+            batch.append(prepared)
+            size += len(prepared.documents)
+            if size >= self.embed_batch_size:
+                await out.put(EmbeddingBatch(batch))
+                batch, size = [], 0
+        if batch:
+            await out.put(EmbeddingBatch(batch))
+        for _ in range(self.embed_concurrency):
+            await out.put(_END)
+
+    async def _embed_stage(self, batches: asyncio.Queue, out: asyncio.Queue):
+        embeddings = self.vector_store.embeddings
+        while (batch := await batches.get()) is not _END:
+            started = time.perf_counter()
+            documents = batch.documents
+            for candidate in batch.candidates:
+                await _report(self.progress, candidate.source, "embedding")
+            try:
+                batch.vectors = await embeddings.aembed_documents([d.page_content for d in documents])
+            except Exception as e:
+                await self._fail([c.source for c in batch.candidates], e)
+                continue
+            finally:
+                self._record("embed", started, len(documents))
+            await out.put(batch)
+
+    async def _write_stage(self, batches: asyncio.Queue):
+        finished = False
+        while not finished:
+            batch = await batches.get()
+            if batch is _END:
+                break
+            # Take embedded batches that are already waiting, up to one write batch
+            group, size = [batch], len(batch.documents)
+            while size < self.writer.batch_size and not batches.empty():
+                waiting = batches.get_nowait()
+                if waiting is _END:
+                    finished = True
+                    break
+                group.append(waiting)
+                size += len(waiting.documents)
+
+            vectors = [v for b in group for v in b.vectors]
+            offset = 0
+            for candidates in self._write_batches([c for b in group for c in b.candidates]):
+                documents = [d for c in candidates for d in c.documents]
+                batch_vectors = vectors[offset:offset + len(documents)]
+                offset += len(documents)
+                await self._write(candidates, documents, batch_vectors)
+
+    def _write_batches(self, candidates: List[PreparedCandidate]):
+        """Splits candidates into write batches of up to writer.batch_size chunks, never splitting a candidate."""
+        batch, size = [], 0
+        for candidate in candidates:
+            if batch and size + len(candidate.documents) > self.writer.batch_size:
+                yield batch
+                batch, size = [], 0
+            batch.append(candidate)
+            size += len(candidate.documents)
+        if batch:
+            yield batch
+
+    async def _write(self, candidates: List[PreparedCandidate], documents: List[LCDocument], vectors: List[List[float]]):
+        """Writes one batch; a failure fails (and cleans up) only the candidates in it."""
+        started = time.perf_counter()
+        try:
+            await self.writer.write(documents, vectors)
+        except Exception as e:
+            for candidate in candidates:
+                await _discard_written(candidate)
+            await self._fail([c.source for c in candidates], e)
+            return
+        finally:
+            self._record("write", started, len(documents))
+        for candidate in candidates:
+            try:
+                await self._finish(candidate)
+            except Exception as e:
+                await self._fail([candidate.source], e)
+
+    @staticmethod
+    async def _close(queue: asyncio.Queue, workers: int):
+        for _ in range(workers):
+            await queue.put(_END)
+
+    async def run(self, file_paths: List[str]) -> dict:
+        started = time.perf_counter()
+        executor = get_parse_executor()
+        await self._round(list(enumerate(file_paths)), [], executor)
+        while self._deferred:
+            waiting = sorted(self._deferred.values(), key=lambda item: item[0])
+            self._deferred, self._claims = {}, {}
+            await self._round([], waiting, executor)
+        return self.summary(len(file_paths), time.perf_counter() - started)
+
+    async def _round(self, paths: List[Tuple[int, str]], parsed: List[Tuple[int, ParsedCandidate]], executor):
+        """One pass through the stages over files to parse and files already parsed."""
+        paths_q = asyncio.Queue()
+        parsed_q = asyncio.Queue(self.queue_size)
+        prepared_q = asyncio.Queue(self.queue_size)
+        batch_q = asyncio.Queue(self.queue_size)
+        embedded_q = asyncio.Queue(self.queue_size)
+
+        for item in paths:
+            paths_q.put_nowait(item)
+        for _ in range(self.parse_workers):
+            paths_q.put_nowait(_END)
+
+        async def parse_all():
+            for item in parsed:
+                await parsed_q.put(item)
+            await asyncio.gather(*(self._parse_stage(paths_q, parsed_q, executor) for _ in range(self.parse_workers)))
+            await self._close(parsed_q, self.prepare_concurrency)
+
+        async def prepare_all():
+            await asyncio.gather(*(self._prepare_stage(parsed_q, prepared_q) for _ in range(self.prepare_concurrency)))
+            await prepared_q.put(_END)
+
+        async def embed_all():
+            await asyncio.gather(*(self._embed_stage(batch_q, embedded_q) for _ in range(self.embed_concurrency)))
+            await self._close(embedded_q, self.write_concurrency)
+
+        await asyncio.gather(
+            parse_all(),
+            prepare_all(),
+            self._batch_stage(prepared_q, batch_q, producers=1),
+            embed_all(),
+            *(self._write_stage(embedded_q) for _ in range(self.write_concurrency)),
+        )
+
+    def summary(self, total: int, elapsed: float) -> dict:
+        return {
+            "total": total,
+            "successful": self.successful,
+            "failed": self.failed,
+            "errors": self.errors,
+            "chunks": self.chunks,
+            "chunkDiff": {"added": self.chunks, "kept": self.kept, "removed": self.removed, "linked": self.linked},
+            "durationSeconds": round(elapsed, 3),
+            "throughput": {
+                "filesPerSecond": round(total / elapsed, 2) if elapsed else 0.0,
+                "chunksPerSecond": round(self.chunks / elapsed, 2) if elapsed else 0.0,
+            },
+            "stages": {
+                name: {"items": s["items"], "busySeconds": round(s["busySeconds"], 3)}
+                for name, s in self.stages.items()
+            },
+            "writes": self.writer.stats(),
+        }
+
+def list_ingestible_files(directory_path: str) -> List[str]:
+    """All .pdf and .txt files below a directory."""
     if not os.path.exists(directory_path):
         raise ValueError(f"Directory '{directory_path}' not found.")
 
     files_to_process = []
     files_to_process.extend(glob.glob(os.path.join(directory_path, "**/*.pdf"), recursive=True))
     files_to_process.extend(glob.glob(os.path.join(directory_path, "**/*.txt"), recursive=True))
+    return files_to_process
 
-    summary = {
-        "total": len(files_to_process),
-        "successful": 0,
-        "failed": 0,
-        "errors": []
-    }
+async def ingest_directory(directory_path: str, session_id: str, progress: Optional[ProgressCallback] = None):
+    """
+    Ingest all .txt and .pdf files from a directory into the vector store.
+    Fault-tolerant: continues even if individual files fail.
+    """
+    files_to_process = list_ingestible_files(directory_path)
 
     if not files_to_process:
-        return summary
-
-    for file_path in files_to_process:
-        try:
-            content = ""
-            if file_path.lower().endswith(".pdf"):
-                loader = PyPDFLoader(file_path)
-                docs = loader.load()
-                content = "\n".join([d.page_content for d in docs])
-            else:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-            await ingest_single_cv(content, os.path.basename(file_path), session_id)
-            summary["successful"] += 1
-        except Exception as e:
-            error_msg = f"Failed to ingest {os.path.basename(file_path)}: {str(e)}"
-            print(error_msg)
-            summary["failed"] += 1
-            summary["errors"].append(error_msg)
+        return IngestionPipeline(session_id).summary(0, 0.0)
 
-    return summary
\ No newline at end of file
+    return await IngestionPipeline(session_id, progress=progress, root=directory_path).run(files_to_process)
@@ -0,0 +1,262 @@
+import asyncio
+import copy
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional
+
+from src.config import (
+    JOB_STORE_BACKEND, JOB_STORE_COLLECTION, JOB_WORKERS, JOB_QUEUE_SIZE, JOB_RETENTION_SECONDS, JOB_MAX_FINISHED
+)
+from src.database import get_async_db_client, DB_NAME
+from src.services.ingestion import ingest_single_cv, ingest_directory, list_ingestible_files, read_file_content
+
+class JobStatus:
+    """Job and per-file states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    PARSING = "parsing"
+    EMBEDDING = "embedding"
+    DONE = "done"
+    # Directory job in which some files failed
+    PARTIAL = "partial"
+    FAILED = "failed"
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue cannot accept more work."""
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _final_status(summary: Optional[dict]) -> str:
+    """done, or from a directory summary: failed when every file failed, partial when some did."""
+    if not summary or not summary.get("failed"):
+        return JobStatus.DONE
+    return JobStatus.FAILED if summary["failed"] >= summary.get("total", 0) else JobStatus.PARTIAL
+
+def _new_job(kind: str, session_id: str, file_names: List[str]) -> dict:
+    now = _now()
+    return {
+        "jobId": uuid.uuid4().hex,
+        "kind": kind,
+        "sessionId": session_id,
+        "status": JobStatus.QUEUED,
+        "createdAt": now,
+        "updatedAt": now,
+        "files": [
+            {"name": name, "status": JobStatus.QUEUED, "error": None, "chunks": None}
+            for name in file_names
+        ],
+        "summary": None,
+        "error": None,
+        "finishedAt": None,
+    }
+
+class InMemoryJobStore:
+    """
+    Job state kept in the process (lost on restart). Finished jobs are dropped
+    after retention_seconds, and beyond max_finished the oldest ones go first.
+    """
+
+    def __init__(self, retention_seconds: float = JOB_RETENTION_SECONDS, max_finished: int = JOB_MAX_FINISHED):
+        self._jobs = {}
+        self.retention_seconds = retention_seconds
+        self.max_finished = max(0, max_finished)
+
+    def _prune(self):
+        finished = sorted(
+            (j for j in self._jobs.values() if j.get("finishedAt")), key=lambda j: j["finishedAt"]
+        )
+        if self.retention_seconds:
+            cutoff = (datetime.now(timezone.utc) - timedelta(seconds=self.retention_seconds)).isoformat()
+            expired = [j for j in finished if j["finishedAt"] < cutoff]
+            finished = finished[len(expired):]
+        else:
+            expired = []
+        expired.extend(finished[:max(0, len(finished) - self.max_finished)])
+        for job in expired:
+            del self._jobs[job["jobId"]]
+
+    async def create(self, job: dict):
+        self._prune()
+        self._jobs[job["jobId"]] = copy.deepcopy(job)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        return copy.deepcopy(job) if job else None
+
+    async def list(self, session_id: Optional[str] = None) -> List[dict]:
+        jobs = [j for j in self._jobs.values() if session_id is None or j["sessionId"] == session_id]
+        return copy.deepcopy(sorted(jobs, key=lambda j: j["createdAt"], reverse=True))
+
+    async def update(self, job_id: str, **fields):
+        job = self._jobs[job_id]
+        job.update(fields)
+        job["updatedAt"] = _now()
+
+    async def delete(self, job_id: str):
+        self._jobs.pop(job_id, None)
+
+    async def update_file(self, job_id: str, name: str, **fields):
+        job = self._jobs[job_id]
+        for entry in job["files"]:
+            if entry["name"] == name:
+                entry.update(fields)
+        job["updatedAt"] = _now()
+
+class MongoJobStore:
+    """
+    Job state in a MongoDB collection, visible to every replica. Finished jobs
+    get an expiresAt date, removed by a TTL index after retention_seconds.
+    """
+
+    def __init__(self, collection_name: str = JOB_STORE_COLLECTION, retention_seconds: float = JOB_RETENTION_SECONDS):
+        self.collection_name = collection_name
+        self.retention_seconds = retention_seconds
+        self._indexed = False
+
+    @property
+    def collection(self):
+        return get_async_db_client()[DB_NAME][self.collection_name]
+
+    @staticmethod
+    def _from_doc(doc: Optional[dict]) -> Optional[dict]:
+        if doc is not None:
+            doc.pop("_id", None)
+            doc.pop("expiresAt", None)
+        return doc
+
+    async def create(self, job: dict):
+        if not self._indexed:
+            await self.collection.create_index("expiresAt", expireAfterSeconds=0)
+            self._indexed = True
+        await self.collection.insert_one({"_id": job["jobId"], **job})
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return self._from_doc(await self.collection.find_one({"_id": job_id}))
+
+    async def list(self, session_id: Optional[str] = None) -> List[dict]:
+        query = {"sessionId": session_id} if session_id else {}
+        cursor = self.collection.find(query).sort("createdAt", -1).limit(100)
+        return [self._from_doc(doc) async for doc in cursor]
+
+    async def update(self, job_id: str, **fields):
+        if fields.get("finishedAt") and self.retention_seconds:
+            fields["expiresAt"] = datetime.now(timezone.utc) + timedelta(seconds=self.retention_seconds)
+        await self.collection.update_one({"_id": job_id}, {"$set": {**fields, "updatedAt": _now()}})
+
+    async def delete(self, job_id: str):
+        await self.collection.delete_one({"_id": job_id})
+
+    async def update_file(self, job_id: str, name: str, **fields):
+        updates = {f"files.$[f].{key}": value for key, value in fields.items()}
+        await self.collection.update_one(
+            {"_id": job_id},
+            {"$set": {**updates, "updatedAt": _now()}},
+            array_filters=[{"f.name": name}],
+        )
+
+# A job runner receives the progress callback and returns an optional summary dict
+JobRunner = Callable[[Callable[..., Awaitable[None]]], Awaitable[Optional[dict]]]
+
+class JobManager:
+    """
+    Bounded in-process worker pool for ingestion jobs.
+    Submissions return immediately; workers update per-file progress in the store.
+    """
+
+    def __init__(self, store, workers: int = JOB_WORKERS, queue_size: int = JOB_QUEUE_SIZE):
+        self.store = store
+        self.workers = max(1, workers)
+        self.queue = asyncio.Queue(max(1, queue_size))
+        self._tasks = []
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, kind: str, session_id: str, file_names: List[str], runner: JobRunner) -> dict:
+        if self.queue.full():
+            raise JobQueueFullError("Ingestion queue is full, try again later.")
+        job = _new_job(kind, session_id, file_names)
+        await self.store.create(job)
+        try:
+            self.queue.put_nowait((job["jobId"], runner))
+        except asyncio.QueueFull:
+            # Another submission took the last slot while the record was being written
+            await self.store.delete(job["jobId"])
+            raise JobQueueFullError("Ingestion queue is full, try again later.")
+        self.start()
+        return job
+
+    async def _worker(self):
+        while True:
+            job_id, runner = await self.queue.get()
+            await self.store.update(job_id, status=JobStatus.RUNNING)
+
+            async def progress(source: str, status: str, error: str = None, chunks: int = None):
+                fields = {"status": status}
+                if error is not None:
+                    fields["error"] = error
+                if chunks is not None:
+                    fields["chunks"] = chunks
+                await self.store.update_file(job_id, source, **fields)
+
+            try:
+                summary = await runner(progress)
+                await self.store.update(job_id, status=_final_status(summary), summary=summary, finishedAt=_now())
+            except Exception as e:
+                print(f"Job {job_id} failed: {e}")
+                await self.store.update(job_id, status=JobStatus.FAILED, error=str(e), finishedAt=_now())
+            finally:
+                self.queue.task_done()
+
+    async def submit_file(self, filename: str, data: bytes, session_id: str) -> dict:
+        """Queues an uploaded PDF/Text CV. The bytes are parsed by the worker."""
+        async def run(progress):
+            suffix = os.path.splitext(filename)[1]
+            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+                tmp.write(data)
+                tmp_path = tmp.name
+            try:
+                await progress(filename, JobStatus.PARSING)
+                content = await asyncio.to_thread(read_file_content, tmp_path)
+            except Exception as e:
+                await progress(filename, JobStatus.FAILED, error=str(e))
+                raise
+            finally:
+                os.unlink(tmp_path)
+            await ingest_single_cv(content, filename, session_id, progress=progress)
+
+        return await self.submit("file", session_id, [filename], run)
+
+    async def submit_text(self, text: str, session_id: str, source_name: str = "raw_text_input") -> dict:
+        async def run(progress):
+            await ingest_single_cv(text, source_name, session_id, progress=progress)
+
+        return await self.submit("text", session_id, [source_name], run)
+
+    async def submit_directory(self, directory_path: str, session_id: str) -> dict:
+        # Keyed like the pipeline reports progress: by path relative to the directory
+        file_names = [os.path.relpath(p, directory_path) for p in list_ingestible_files(directory_path)]
+
+        async def run(progress):
+            return await ingest_directory(directory_path, session_id, progress=progress)
+
+        return await self.submit("directory", session_id, file_names, run)
+
+_job_manager = None
+
+def get_job_manager() -> JobManager:
+    global _job_manager
+    if _job_manager is None:
+        store = MongoJobStore() if JOB_STORE_BACKEND == "mongodb" else InMemoryJobStore()
+        _job_manager = JobManager(store)
+    return _job_manager
@@ -0,0 +1,193 @@
+import asyncio
+import heapq
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from langchain_core.documents import Document
+from src.config import LEXICAL_INDEX_MAX_SESSIONS, LEXICAL_INDEX_MAX_AGE_SECONDS, LEXICAL_FAST_PATH_MAX_TERMS
+from src.database import get_repository
+from src.utils.cache import register_cache_stats
+from src.services.query_translation.fusion import ScoredDocs, doc_key, document_from_record
+
+# Okapi BM25 parameters (the usual defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Keeps terms like "c++", "c#", "node.js" and email addresses whole
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#@._-]*")
+_TRAILING = "._-"
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from has have how i in is it me of on or "
+    "show the their them there these they this to was what which who whom whose why will with "
+    "any all find list give candidate candidates someone somebody anyone".split()
+)
+
+def tokenize(text: str, keep_stopwords: bool = False) -> List[str]:
+    terms = (match.rstrip(_TRAILING) for match in _TOKEN_RE.findall(text.lower()))
+    return [t for t in terms if t and (keep_stopwords or t not in STOPWORDS)]
+
+def _copy(doc: Document) -> Document:
+    return Document(page_content=doc.page_content, metadata=dict(doc.metadata), id=doc.id)
+
+class _SessionIndex:
+    """Inverted index of one session's chunks: term -> {chunk key: term frequency}."""
+
+    def __init__(self):
+        self.docs: Dict[str, Document] = {}
+        self.lengths: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.by_email: Dict[Optional[str], Set[str]] = {}
+        self.total_length = 0
+        self.built_at = time.monotonic()
+
+    def add(self, doc: Document):
+        key = doc_key(doc)
+        if key in self.docs:
+            return
+        terms = tokenize(doc.page_content)
+        self.docs[key] = doc
+        self.lengths[key] = len(terms)
+        self.total_length += len(terms)
+        self.by_email.setdefault(doc.metadata.get("email"), set()).add(key)
+        frequencies = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        for term, tf in frequencies.items():
+            self.postings.setdefault(term, {})[key] = tf
+
+    def remove_email(self, email: Optional[str]):
+        for key in self.by_email.pop(email, set()):
+            doc = self.docs.pop(key)
+            self.total_length -= self.lengths.pop(key)
+            for term in set(tokenize(doc.page_content)):
+                postings = self.postings.get(term)
+                if postings is not None:
+                    postings.pop(key, None)
+                    if not postings:
+                        del self.postings[term]
+
+    def search(self, terms: List[str], k: int) -> ScoredDocs:
+        n = len(self.docs)
+        if not n or not terms:
+            return []
+        avg_length = self.total_length / n or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, tf in postings.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[key] / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        # Copies: callers annotate metadata (retrievalScore) and the index is shared
+        return [(_copy(self.docs[key]), score) for key, score in best]
+
+class LexicalIndex:
+    """
+    In-process BM25 index per session. A session is built from the stored chunks on
+    its first search and then kept current by ingestion (replace_candidate) and wipe
+    (drop_session) in this process. Entries older than max_age_seconds are rebuilt
+    so changes made by other replicas show up; the least recently used sessions are
+    evicted beyond max_sessions.
+    """
+
+    def __init__(self, max_sessions: int = LEXICAL_INDEX_MAX_SESSIONS, max_age_seconds: float = LEXICAL_INDEX_MAX_AGE_SECONDS):
+        self.max_sessions = max(1, max_sessions)
+        self.max_age_seconds = max_age_seconds
+        self._sessions: "OrderedDict[str, _SessionIndex]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Sessions changed while being built; rebuilt on their next search
+        self._stale: Set[str] = set()
+
+    def _expired(self, index: _SessionIndex) -> bool:
+        return bool(self.max_age_seconds) and time.monotonic() - index.built_at > self.max_age_seconds
+
+    async def _session(self, session_id: str) -> _SessionIndex:
+        index = self._sessions.get(session_id)
+        if index is not None and not self._expired(index) and session_id not in self._stale:
+            self._sessions.move_to_end(session_id)
+            return index
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            index = self._sessions.get(session_id)
+            if index is None or self._expired(index) or session_id in self._stale:
+                self._stale.discard(session_id)
+                started = time.perf_counter()
+                records = await get_repository().find_session_chunks(session_id)
+                index = _SessionIndex()
+                for record in records:
+                    index.add(document_from_record(record))
+                self._sessions[session_id] = index
+                while len(self._sessions) > self.max_sessions:
+                    evicted, _ = self._sessions.popitem(last=False)
+                    self._locks.pop(evicted, None)
+                print(f"Lexical index built for session '{session_id}': {len(index.docs)} chunks, "
+                      f"{len(index.postings)} terms in {time.perf_counter() - started:.3f}s")
+            self._sessions.move_to_end(session_id)
+            return index
+
+    async def search(self, session_id: str, query: str, k: int) -> ScoredDocs:
+        """BM25 top-k chunks of the session, best first."""
+        index = await self._session(session_id)
+        return index.search(tokenize(query), k)
+
+    async def is_keyword_query(self, session_id: str, query: str) -> bool:
+        """
+        A short query made only of terms the session contains ("HRIS", "Kubernetes",
+        an email address), with no question words: lexical matching answers it alone.
+        """
+        if "?" in query:
+            return False
+        raw = tokenize(query, keep_stopwords=True)
+        if not raw or len(raw) > LEXICAL_FAST_PATH_MAX_TERMS or any(t in STOPWORDS for t in raw):
+            return False
+        index = await self._session(session_id)
+        return all(term in index.postings for term in raw)
+
+    async def term_coverage(self, session_id: str, query: str) -> Tuple[int, int]:
+        """(distinct query terms found in the session, distinct query terms), stopwords excluded."""
+        terms = set(tokenize(query))
+        if not terms:
+            return 0, 0
+        index = await self._session(session_id)
+        return sum(1 for term in terms if term in index.postings), len(terms)
+
+    def replace_candidate(self, session_id: str, email: str, documents: List[Document]):
+        """Swaps a candidate's chunks for its current ones, if the session is loaded here."""
+        lock = self._locks.get(session_id)
+        if lock is not None and lock.locked():
+            self._stale.add(session_id)
+            return
+        index = self._sessions.get(session_id)
+        if index is None:
+            return
+        index.remove_email(email)
+        for doc in documents:
+            index.add(doc)
+
+    def drop_session(self, session_id: str):
+        self._sessions.pop(session_id, None)
+        lock = self._locks.get(session_id)
+        if lock is not None and lock.locked():
+            self._stale.add(session_id)
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "maxSessions": self.max_sessions,
+            "chunks": sum(len(index.docs) for index in self._sessions.values()),
+            "terms": sum(len(index.postings) for index in self._sessions.values()),
+        }
+
+_lexical_index = None
+
+def get_lexical_index() -> LexicalIndex:
+    global _lexical_index
+    if _lexical_index is None:
+        _lexical_index = LexicalIndex()
+        register_cache_stats("lexicalIndex", _lexical_index.stats)
+    return _lexical_index
@@ -1,8 +1,9 @@
 import os
 from src.services.ingestion import ingest_directory
+from src.services.snapshot import load_snapshot
 from src.core.constants import PrototypeConstants
-from src.database.helpers import is_session_empty
-from src.config import ENABLE_SAMPLE_SEEDING, SAMPLE_DATA_DIR
+from src.database import get_repository
+from src.config import ENABLE_SAMPLE_SEEDING, SAMPLE_DATA_DIR, SAMPLE_SNAPSHOT_PATH
 
 async def seed_prototype_data_if_needed():
     """Seeds sample data only if ENABLE_SAMPLE_SEEDING is True and the session is empty."""
@@ -11,12 +12,20 @@ async def seed_prototype_data_if_needed():
 
     session_id = PrototypeConstants.SAMPLE_SESSION_ID
     
-    if not is_session_empty(session_id):
+    if not await get_repository().is_session_empty(session_id):
         # We don't want to spam logs on every startup if it's already done
         # But for prototype visibility, a small debug print is fine
         print(f"Sample data already exists for session '{session_id}'.")
         return
 
+    if os.path.exists(SAMPLE_SNAPSHOT_PATH):
+        print(f"Automated Seeding: Loading snapshot {SAMPLE_SNAPSHOT_PATH}...")
+        summary = await load_snapshot(SAMPLE_SNAPSHOT_PATH, session_id)
+        if summary is not None:
+            print(f"Automated Seeding Complete (snapshot). Total: {summary['total']}, Chunks: {summary['chunks']}, Took: {summary['durationSeconds']}s")
+            return
+        print("Falling back to live embedding.")
+
     sample_dir = os.path.join(os.getcwd(), "data", SAMPLE_DATA_DIR)
     if not os.path.exists(sample_dir):
         print(f"Warning: Sample directory '{sample_dir}' not found. Seeding skipped.")
@@ -24,4 +33,4 @@ async def seed_prototype_data_if_needed():
 
     print(f"Automated Seeding: Ingesting sample data from {sample_dir}...")
     summary = await ingest_directory(sample_dir, session_id)
-    print(f"Automated Seeding Complete. Total: {summary['total']}, Successful: {summary['successful']}")
+    print(f"Automated Seeding Complete. Total: {summary['total']}, Successful: {summary['successful']}, Took: {summary['durationSeconds']}s")
@@ -0,0 +1,88 @@
+import re
+from dataclasses import dataclass, field
+from typing import List
+from src.config import QUERY_ANALYSIS_CANDIDATES_TTL_SECONDS
+from src.database import get_repository
+from src.utils.cache import LRUCache, register_cache_stats
+from src.utils.parsing import EMAIL_REGEX, ROLE_KEYWORDS, NOT_FOUND
+
+_EMAIL_RE = re.compile(EMAIL_REGEX)
+# Whole-keyword match with an optional plural: "managers", "a lead", not "leadership"
+_ROLE_RES = [(kw.lower(), re.compile(rf"\b{re.escape(kw.lower())}s?\b")) for kw in ROLE_KEYWORDS]
+
+@dataclass
+class QueryAnalysis:
+    """Candidates a question is about, as found in the session's candidate records."""
+    emails: List[str] = field(default_factory=list)
+    # What matched, e.g. "name:kimberly hill" or "role:manager" (for logging)
+    matched: List[str] = field(default_factory=list)
+    # Exactly one candidate named by email or full name
+    targeted: bool = False
+
+    @property
+    def filter(self) -> dict:
+        """Extra vector search pre_filter clause ({} searches the whole session)."""
+        return {"email": {"$in": self.emails}} if self.emails else {}
+
+class QueryAnalyzer:
+    """
+    Finds the candidates a question refers to: email addresses, full names of
+    candidates in the session, and (when nothing names a candidate) role keywords
+    matched against the candidates' stored roles. The session's candidate records
+    are read once and cached briefly; the analysis itself does no I/O or LLM call.
+    """
+
+    def __init__(self, role_filter: bool = True, cache: LRUCache = None):
+        self.role_filter = role_filter
+        self.cache = cache if cache is not None else _candidates_cache
+
+    async def _candidates(self, session_id: str) -> List[dict]:
+        candidates = self.cache.get(session_id)
+        if candidates is None:
+            candidates = await get_repository().list_candidates(session_id)
+            self.cache.set(session_id, candidates)
+        return candidates
+
+    async def analyze(self, session_id: str, question: str) -> QueryAnalysis:
+        analysis = QueryAnalysis()
+        text = question.lower()
+        candidates = await self._candidates(session_id)
+
+        stored = {(c.get("email") or "").lower(): c.get("email") for c in candidates}
+        for email in _EMAIL_RE.findall(question):
+            # An address that is not a candidate of the session narrows nothing
+            email = stored.get(email.lower())
+            if email and email not in analysis.emails:
+                analysis.emails.append(email)
+                analysis.matched.append(f"email:{email}")
+
+        for candidate in candidates:
+            name = (candidate.get("name") or "").strip().lower()
+            email = candidate.get("email")
+            # Single words ("Lead", a first name) are too ambiguous to narrow the search
+            if name == NOT_FOUND.lower() or len(name.split()) < 2 or email in analysis.emails:
+                continue
+            if re.search(rf"\b{re.escape(name)}\b", text):
+                analysis.emails.append(email)
+                analysis.matched.append(f"name:{name}")
+
+        analysis.targeted = len(analysis.emails) == 1
+        if analysis.emails or not self.role_filter:
+            return analysis
+
+        for keyword, pattern in _ROLE_RES:
+            if not pattern.search(text):
+                continue
+            emails = [c["email"] for c in candidates if keyword in (c.get("role") or "").lower()]
+            # A role every candidate shares does not narrow anything
+            if emails and len(emails) < len(candidates):
+                analysis.emails.extend(e for e in emails if e not in analysis.emails)
+                analysis.matched.append(f"role:{keyword}")
+        return analysis
+
+_candidates_cache = LRUCache(max_size=64, ttl_seconds=QUERY_ANALYSIS_CANDIDATES_TTL_SECONDS)
+register_cache_stats("queryAnalysisCandidates", _candidates_cache.stats)
+
+def forget_session(session_id: str):
+    """Drops the cached candidate list after ingestion or wipe changed the session."""
+    _candidates_cache.delete(session_id)
@@ -1,5 +1,6 @@
 from .base import BaseQueryTranslator, QueryTranslationType
 from .factory import TranslatorFactory
 from .service import QueryTranslationService
+from .cached import CachedQueryTranslator
 
-__all__ = ["BaseQueryTranslator", "QueryTranslationType", "TranslatorFactory", "QueryTranslationService"]
+__all__ = ["BaseQueryTranslator", "QueryTranslationType", "TranslatorFactory", "QueryTranslationService", "CachedQueryTranslator"]
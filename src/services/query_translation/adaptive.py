@@ -0,0 +1,129 @@
+import re
+import time
+from typing import List, Optional
+from src.config import ADAPTIVE_SHORT_QUERY_WORDS, ADAPTIVE_DECOMPOSE_MIN_WORDS
+from src.utils.parsing import EMAIL_REGEX
+from .base import BaseQueryTranslator, QueryTranslationType
+
+_WORD_RE = re.compile(r"\w+")
+_EMAIL_RE = re.compile(EMAIL_REGEX)
+# A conjunction only starts a second ask when a question word or request verb follows:
+# "who knows Go and what did they build", not "Python and Java developers"
+_CLAUSE_START = (
+    r"(?:what|which|who|whom|whose|how|why|when|where|does|do|did"
+    r"|list|show|tell|give|rank|name|describe|summari[sz]e|find)"
+)
+# Several asks in one question: joined clauses, "compare X ... with Y", "X vs Y", "...; ..."
+_COMPOUND_RE = re.compile(
+    rf"\b(?:and|or|as well as|whereas)\s+(?:also\s+)?{_CLAUSE_START}\b"
+    r"|\b(?:compar(?:e|es|ed|ing)|versus|vs)\b|;",
+    re.IGNORECASE,
+)
+
+# Weight of the newest sample in the running latency average per strategy
+_LATENCY_SMOOTHING = 0.2
+
+class RoutingStats:
+    """Decisions and translation latencies, shared by the per-request translator instances."""
+
+    def __init__(self):
+        self.decisions = {}
+        self.latency = {}
+        self.saved_seconds = 0.0
+
+    def record_latency(self, strategy: str, seconds: float):
+        previous = self.latency.get(strategy)
+        self.latency[strategy] = seconds if previous is None else previous + _LATENCY_SMOOTHING * (seconds - previous)
+
+    def llm_latency(self) -> Optional[float]:
+        """Mean running latency of the LLM-backed strategies seen so far."""
+        return sum(self.latency.values()) / len(self.latency) if self.latency else None
+
+    def stats(self) -> dict:
+        return {
+            "decisions": dict(self.decisions),
+            "meanLatencySeconds": {s: round(v, 4) for s, v in self.latency.items()},
+            "estimatedSavedSeconds": round(self.saved_seconds, 3),
+        }
+
+class AdaptiveTranslator(BaseQueryTranslator):
+    """
+    Picks identity, multi-query or decomposition per question from local signals,
+    so simple questions skip the translation LLM call:
+
+    - a question about one known candidate (email or full name) -> identity
+    - several asks (clauses joined by and/or, compare/vs, ";", several "?") or
+      several named candidates, long enough to split -> decomposition
+    - a short question -> identity
+    - every term found in the session's lexical index -> identity; some terms
+      missing (vocabulary gap) -> multi-query, whose rephrasings help recall
+    - otherwise -> multi-query
+
+    Each decision is logged with the running average latency of the LLM
+    strategies, which is what an identity route saves.
+    """
+
+    session_aware = True
+
+    def __init__(
+        self,
+        identity: BaseQueryTranslator,
+        multi_query: BaseQueryTranslator,
+        decomposition: BaseQueryTranslator,
+        lexical_index=None,
+        query_analyzer=None,
+        short_query_words: int = ADAPTIVE_SHORT_QUERY_WORDS,
+        decompose_min_words: int = ADAPTIVE_DECOMPOSE_MIN_WORDS,
+        stats: Optional[RoutingStats] = None,
+    ):
+        self.translators = {
+            QueryTranslationType.IDENTITY: identity,
+            QueryTranslationType.MULTI_QUERY: multi_query,
+            QueryTranslationType.DECOMPOSITION: decomposition,
+        }
+        self.lexical_index = lexical_index
+        self.query_analyzer = query_analyzer
+        self.short_query_words = short_query_words
+        self.decompose_min_words = decompose_min_words
+        self.stats = stats if stats is not None else RoutingStats()
+
+    async def _named_candidates(self, query: str, session_id: Optional[str]) -> int:
+        if self.query_analyzer is not None and session_id is not None:
+            analysis = await self.query_analyzer.analyze(session_id, query)
+            return len(analysis.emails)
+        return len(set(_EMAIL_RE.findall(query)))
+
+    async def route(self, query: str, session_id: Optional[str] = None):
+        """(strategy, reason) for a question."""
+        words = len(_WORD_RE.findall(query))
+        named = await self._named_candidates(query, session_id)
+        if named == 1:
+            return QueryTranslationType.IDENTITY, "one named candidate"
+        compound = bool(_COMPOUND_RE.search(query)) or query.count("?") > 1
+        if (compound or named > 1) and words >= self.decompose_min_words:
+            return QueryTranslationType.DECOMPOSITION, f"{named} named candidates" if named > 1 else "compound question"
+        if words <= self.short_query_words:
+            return QueryTranslationType.IDENTITY, f"short ({words} words)"
+        if self.lexical_index is not None and session_id is not None:
+            hits, terms = await self.lexical_index.term_coverage(session_id, query)
+            if terms and hits == terms:
+                return QueryTranslationType.IDENTITY, f"all {terms} terms found in the session"
+            return QueryTranslationType.MULTI_QUERY, f"{hits}/{terms} terms found in the session"
+        return QueryTranslationType.MULTI_QUERY, "default"
+
+    async def translate(self, query: str, session_id: Optional[str] = None) -> List[str]:
+        strategy, reason = await self.route(query, session_id)
+        self.stats.decisions[strategy.value] = self.stats.decisions.get(strategy.value, 0) + 1
+        if strategy == QueryTranslationType.IDENTITY:
+            saved = self.stats.llm_latency()
+            if saved is not None:
+                self.stats.saved_seconds += saved
+            note = f", ~{saved:.2f}s saved" if saved is not None else ""
+            print(f"Adaptive translation: identity ({reason}{note})")
+            return await self.translators[strategy].translate(query)
+
+        print(f"Adaptive translation: {strategy.value} ({reason})")
+        started = time.perf_counter()
+        queries = await self.translators[strategy].translate(query)
+        self.stats.record_latency(strategy.value, time.perf_counter() - started)
+        return queries
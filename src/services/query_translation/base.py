@@ -9,9 +9,13 @@ class QueryTranslationType(Enum):
     HYDE = "hyde"
     DECOMPOSITION = "decomposition"
     STEP_BACK = "step_back"
+    ADAPTIVE = "adaptive"
 
 class BaseQueryTranslator(ABC):
     """Abstract base class for query translation techniques."""
+
+    # Session-aware translators also accept translate(query, session_id=...)
+    session_aware = False
     
     @abstractmethod
     async def translate(self, query: str) -> List[str]:
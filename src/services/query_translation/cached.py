@@ -0,0 +1,81 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from src.utils.cache import LRUCache, normalize_query
+from .base import BaseQueryTranslator
+
+class MongoTranslationStore:
+    """
+    Shared translation tier in MongoDB, so replicas reuse each other's LLM calls.
+    Entries expire through a TTL index on expiresAt; reads also check it because
+    the TTL monitor only runs about once a minute.
+    """
+
+    def __init__(self, collection, ttl_seconds: float):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self._indexed = False
+
+    async def _ensure_index(self):
+        if not self._indexed:
+            await self.collection.create_index("expiresAt", expireAfterSeconds=0)
+            self._indexed = True
+
+    async def get(self, key: str) -> Optional[List[str]]:
+        doc = await self.collection.find_one(
+            {"_id": key, "expiresAt": {"$gt": datetime.now(timezone.utc)}}, projection={"queries": 1}
+        )
+        return doc["queries"] if doc else None
+
+    async def set(self, key: str, queries: List[str], **fields):
+        await self._ensure_index()
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.ttl_seconds) if self.ttl_seconds else datetime.max.replace(tzinfo=timezone.utc)
+        await self.collection.replace_one(
+            {"_id": key},
+            {"_id": key, "queries": queries, "createdAt": now, "expiresAt": expires_at, **fields},
+            upsert=True,
+        )
+
+class CachedQueryTranslator(BaseQueryTranslator):
+    """
+    Caches another translator's output by (strategy, model, normalised query).
+    Translations do not depend on the session, so a repeated question skips the
+    LLM round trip. Lookups go to the in-process LRU first, then the optional
+    shared store; failed translations are not cached.
+    """
+
+    def __init__(self, translator: BaseQueryTranslator, strategy: str, model: str, cache: LRUCache,
+                 shared_store: Optional[MongoTranslationStore] = None):
+        self.translator = translator
+        self.strategy = strategy
+        self.model = model
+        self.cache = cache
+        self.shared_store = shared_store
+
+    def _key(self, query: str) -> str:
+        return hashlib.sha256(f"{self.strategy}:{self.model}:{normalize_query(query)}".encode()).hexdigest()
+
+    async def translate(self, query: str) -> List[str]:
+        key = self._key(query)
+        queries = self.cache.get(key)
+        if queries is not None:
+            return list(queries)
+
+        if self.shared_store is not None:
+            try:
+                queries = await self.shared_store.get(key)
+            except Exception as e:
+                print(f"Warning: translation cache lookup failed: {e}")
+            if queries is not None:
+                self.cache.set(key, queries)
+                return list(queries)
+
+        queries = await self.translator.translate(query)
+        self.cache.set(key, list(queries))
+        if self.shared_store is not None:
+            try:
+                await self.shared_store.set(key, list(queries), strategy=self.strategy, model=self.model)
+            except Exception as e:
+                print(f"Warning: translation cache write failed: {e}")
+        return queries
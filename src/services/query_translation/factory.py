@@ -4,18 +4,56 @@ from .multi_query import MultiQueryTranslator
 from .hyde import HyDETranslator
 from .decomposition import DecompositionTranslator
 from .step_back import StepBackTranslator
+from .cached import CachedQueryTranslator, MongoTranslationStore
+from .adaptive import AdaptiveTranslator, RoutingStats
+from src.utils.cache import LRUCache, register_cache_stats
+from src.core.providers import model_name
+from src.config import (
+    DB_NAME,
+    QUERY_TRANSLATION_CACHE_BACKEND,
+    QUERY_TRANSLATION_CACHE_COLLECTION,
+    QUERY_TRANSLATION_CACHE_SIZE,
+    QUERY_TRANSLATION_CACHE_TTL_SECONDS,
+)
+
+# Process-wide translation cache shared by every translator instance
+_translation_cache = LRUCache(QUERY_TRANSLATION_CACHE_SIZE, QUERY_TRANSLATION_CACHE_TTL_SECONDS)
+register_cache_stats("queryTranslations", _translation_cache.stats)
+# Routing decisions of the adaptive translator, across requests
+_routing_stats = RoutingStats()
+register_cache_stats("adaptiveTranslation", _routing_stats.stats)
+_shared_store = None
+
+def _get_shared_store():
+    global _shared_store
+    if QUERY_TRANSLATION_CACHE_BACKEND != "mongodb":
+        return None
+    if _shared_store is None:
+        from src.database import get_async_db_client
+        collection = get_async_db_client()[DB_NAME][QUERY_TRANSLATION_CACHE_COLLECTION]
+        _shared_store = MongoTranslationStore(collection, QUERY_TRANSLATION_CACHE_TTL_SECONDS)
+    return _shared_store
 
 class TranslatorFactory:
     """Factory for creating and managing query translators."""
     
     @staticmethod
-    def get_translator(translator_type: str | QueryTranslationType, llm=None) -> BaseQueryTranslator:
+    def get_translator(
+        translator_type: str | QueryTranslationType,
+        llm=None,
+        cache: bool = True,
+        lexical_index=None,
+        query_analyzer=None,
+    ) -> BaseQueryTranslator:
         """
         Returns a concrete implementation of BaseQueryTranslator.
         
         Args:
             translator_type: The type of translator (str or QueryTranslationType enum)
             llm: Optional LLM instance required for some translators.
+            cache: Wrap LLM-backed translators in the translation cache.
+            lexical_index: Optional LexicalIndex, a routing signal of the adaptive translator.
+            query_analyzer: Optional QueryAnalyzer, a routing signal of the adaptive translator.
             
         Returns:
             A BaseQueryTranslator instance.
@@ -27,6 +65,19 @@ class TranslatorFactory:
             except ValueError:
                 translator_type = QueryTranslationType.IDENTITY
 
+        if translator_type == QueryTranslationType.ADAPTIVE:
+            if not llm:
+                return IdentityTranslator()
+            # Routing is cheap and local; only the strategies it delegates to are cached
+            return AdaptiveTranslator(
+                identity=IdentityTranslator(),
+                multi_query=TranslatorFactory.get_translator(QueryTranslationType.MULTI_QUERY, llm=llm, cache=cache),
+                decomposition=TranslatorFactory.get_translator(QueryTranslationType.DECOMPOSITION, llm=llm, cache=cache),
+                lexical_index=lexical_index,
+                query_analyzer=query_analyzer,
+                stats=_routing_stats,
+            )
+
         translators = {
             QueryTranslationType.MULTI_QUERY: MultiQueryTranslator,
             QueryTranslationType.HYDE: HyDETranslator,
@@ -44,4 +95,13 @@ class TranslatorFactory:
         if translator_class == IdentityTranslator:
             return IdentityTranslator()
             
-        return translator_class(llm=llm)
+        translator = translator_class(llm=llm)
+        if not cache or (QUERY_TRANSLATION_CACHE_SIZE <= 0 and QUERY_TRANSLATION_CACHE_BACKEND != "mongodb"):
+            return translator
+        return CachedQueryTranslator(
+            translator,
+            strategy=translator_type.value,
+            model=model_name(llm),
+            cache=_translation_cache,
+            shared_store=_get_shared_store(),
+        )
@@ -0,0 +1,67 @@
+import hashlib
+from typing import Dict, List, Sequence, Tuple
+from langchain_core.documents import Document
+
+ScoredDocs = List[Tuple[Document, float]]
+
+# Constant of reciprocal rank fusion: 1 / (k + rank); 60 is the usual choice
+DEFAULT_RRF_K = 60
+
+def doc_key(doc: Document) -> str:
+    """
+    Stable identity of a retrieved chunk: candidate + chunk hash when stored, else
+    the document id, else a hash of the text. The same chunk found by several
+    sub-queries collapses to one entry without keeping whole texts in a set.
+    """
+    metadata = doc.metadata
+    if metadata.get("chunkHash") and metadata.get("email"):
+        return f"{metadata['email']}:{metadata['chunkHash']}"
+    if doc.id:
+        return str(doc.id)
+    return hashlib.sha256(doc.page_content.encode()).hexdigest()
+
+def document_from_record(record: dict) -> Document:
+    """Document of a stored chunk record (text and metadata, vector dropped)."""
+    metadata = {k: v for k, v in record.items() if k not in ("_id", "text", "embedding")}
+    return Document(page_content=record.get("text", ""), metadata=metadata, id=str(record["_id"]))
+
+def reciprocal_rank_fusion(result_lists: Sequence[ScoredDocs], k: int = DEFAULT_RRF_K) -> ScoredDocs:
+    """Sum of 1 / (k + rank) over the lists a chunk appears in; rewards agreement between queries."""
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for results in result_lists:
+        seen = set()
+        for rank, (doc, _) in enumerate(sorted(results, key=lambda item: -item[1]), start=1):
+            key = doc_key(doc)
+            if key in seen:
+                continue
+            seen.add(key)
+            docs.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return _ranked(docs, scores)
+
+def max_score_fusion(result_lists: Sequence[ScoredDocs]) -> ScoredDocs:
+    """Best similarity a chunk got from any query (scores share one embedding space)."""
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for results in result_lists:
+        for doc, score in results:
+            key = doc_key(doc)
+            docs.setdefault(key, doc)
+            if score > scores.get(key, float("-inf")):
+                scores[key] = score
+    return _ranked(docs, scores)
+
+def fuse(result_lists: Sequence[ScoredDocs], method: str = "rrf", rrf_k: int = DEFAULT_RRF_K, top_k: int = 0) -> ScoredDocs:
+    """Merges per-query results into one ranked, deduplicated list (top_k of 0 keeps all)."""
+    if method == "max":
+        fused = max_score_fusion(result_lists)
+    elif method == "rrf":
+        fused = reciprocal_rank_fusion(result_lists, rrf_k)
+    else:
+        raise ValueError(f"Unknown fusion method: {method}")
+    return fused[:top_k] if top_k > 0 else fused
+
+def _ranked(docs: Dict[str, Document], scores: Dict[str, float]) -> ScoredDocs:
+    # Ties keep first-seen order (sorted is stable and dicts keep insertion order)
+    return sorted(((docs[key], score) for key, score in scores.items()), key=lambda item: -item[1])
@@ -1,38 +1,195 @@
-from typing import List, Set
+import asyncio
+from typing import List
+from src.database import aembed_queries, get_repository
 from .base import BaseQueryTranslator
+from .identity import IdentityTranslator
+from .fusion import ScoredDocs, doc_key, document_from_record, fuse, DEFAULT_RRF_K
 
 class QueryTranslationService:
     """Orchestrates query translation and multi-retrieval."""
     
-    def __init__(self, translator: BaseQueryTranslator):
+    def __init__(
+        self,
+        translator: BaseQueryTranslator,
+        top_k: int = 4,
+        max_concurrency: int = 4,
+        query_timeout: float = 10,
+        final_top_k: int = 0,
+        fusion: str = "rrf",
+        rrf_k: int = DEFAULT_RRF_K,
+        speculative: bool = False,
+        deadline: float = 0,
+        lexical_index=None,
+        lexical_top_k: int = 8,
+        lexical_fast_path: bool = True,
+        query_analyzer=None,
+        direct_lookup: bool = True,
+    ):
         self.translator = translator
+        self.top_k = top_k
+        self.max_concurrency = max(1, max_concurrency)
+        # Seconds allowed per sub-query search (0 disables the timeout)
+        self.query_timeout = query_timeout
+        # Chunks kept after fusing all sub-queries (0 keeps every unique chunk)
+        self.final_top_k = final_top_k
+        self.fusion = fusion
+        self.rrf_k = rrf_k
+        # Search the original query while the translation runs (every translator keeps it)
+        self.speculative = speculative and not isinstance(translator, IdentityTranslator)
+        # Speculative mode: seconds after which to answer with the results so far (0 waits for all)
+        self.deadline = deadline
+        # Hybrid retrieval: BM25 results of the original query are fused with the vector results
+        self.lexical_index = lexical_index
+        self.lexical_top_k = lexical_top_k
+        self.lexical_fast_path = lexical_fast_path
+        # Restricts the search to the candidates a question names (see services/query_analysis.py);
+        # a question about exactly one candidate reads that candidate's chunks directly
+        self.query_analyzer = query_analyzer
+        self.direct_lookup = direct_lookup
 
-    async def get_translated_queries(self, query: str) -> List[str]:
+    async def get_translated_queries(self, query: str, session_id: str = None) -> List[str]:
         """Returns a list of unique translated queries."""
+        if self.translator.session_aware and session_id is not None:
+            return await self.translator.translate(query, session_id=session_id)
         return await self.translator.translate(query)
 
     @staticmethod
     def deduplicate_docs(documents):
-        """Helper to deduplicate documents based on page_content/metadata."""
+        """Helper to deduplicate documents by chunk identity (see fusion.doc_key), keeping order."""
         seen = set()
         unique_docs = []
         for doc in documents:
-            # Using content as a simple proxy for uniqueness
-            content = doc.page_content
-            if content not in seen:
-                seen.add(content)
+            key = doc_key(doc)
+            if key not in seen:
+                seen.add(key)
                 unique_docs.append(doc)
         return unique_docs
+
+    def fuse(self, result_lists: List[ScoredDocs]) -> ScoredDocs:
+        """Ranked, deduplicated union of the per-query results, cut to final_top_k."""
+        return fuse(result_lists, self.fusion, self.rrf_k, self.final_top_k)
+
+    async def _search(self, semaphore: asyncio.Semaphore, vector_store, query: str, embedding, pre_filter: dict):
+        async with semaphore:
+            search = vector_store.asimilarity_search_with_score_by_vector(
+                embedding, k=self.top_k, pre_filter=pre_filter
+            )
+            try:
+                results = await asyncio.wait_for(search, self.query_timeout or None)
+            except asyncio.TimeoutError:
+                # A slow sub-query should not fail the whole answer
+                print(f"Retrieval timed out after {self.query_timeout}s for query: '{query[:50]}'")
+                return []
+        return results
         
     async def retrieve_with_translation(self, query: str, vector_store, session_id: str):
         """
-        Translates query and performs multiple searches, returning deduped docs.
+        Translates query and performs multiple searches, returning fused docs, best first.
+        All translated queries are embedded in one batched call, then searched concurrently.
+        Each returned doc carries its fused score in metadata["retrievalScore"].
+        With a lexical index, keyword-only questions are answered from it alone (no
+        translation, no embedding); other questions fuse its results with the vector ones.
         """
-        queries = await self.get_translated_queries(query)
-        all_docs = []
-        
-        for q in queries:
-            results = vector_store.similarity_search(q, pre_filter={"sessionId": session_id})
-            all_docs.extend(results)
-            
-        return self.deduplicate_docs(all_docs)
+        pre_filter = {"sessionId": session_id}
+        analysis = None
+        if self.query_analyzer is not None:
+            analysis = await self.query_analyzer.analyze(session_id, query)
+            if analysis.matched:
+                print(f"Query analysis: {', '.join(analysis.matched)} -> {len(analysis.emails)} candidate(s)")
+            if analysis.targeted and self.direct_lookup:
+                return await self._lookup_candidate(session_id, analysis.emails[0])
+            pre_filter.update(analysis.filter)
+
+        lexical = []
+        if self.lexical_index is not None:
+            lexical = await self.lexical_index.search(session_id, query, self.lexical_top_k)
+            if analysis is not None and analysis.emails:
+                lexical = [(doc, score) for doc, score in lexical if doc.metadata.get("email") in analysis.emails]
+            if self.lexical_fast_path and lexical and await self.lexical_index.is_keyword_query(session_id, query):
+                print(f"Lexical fast path for keyword query '{query[:50]}': {len(lexical)} chunks, no embedding.")
+                return self._ranked([lexical])
+
+        if self.speculative:
+            results = await self._retrieve_speculative(query, vector_store, session_id, pre_filter)
+        else:
+            queries = await self.get_translated_queries(query, session_id)
+            results = await self._search_queries(asyncio.Semaphore(self.max_concurrency), vector_store, queries, pre_filter)
+        if lexical:
+            results.append(self._normalised(lexical) if self.fusion == "max" else lexical)
+        return self._ranked(results)
+
+    def _ranked(self, results: List[ScoredDocs]) -> List:
+        fused = self.fuse(results)
+        for doc, score in fused:
+            doc.metadata["retrievalScore"] = score
+        return [doc for doc, _ in fused]
+
+    async def _lookup_candidate(self, session_id: str, email: str) -> List:
+        """Every chunk of one candidate in stored order, read by the (sessionId, email) index."""
+        records = await get_repository().find_session_chunks(session_id, [email])
+        docs = self.deduplicate_docs([document_from_record(r) for r in records])
+        print(f"Direct lookup for {email}: {len(docs)} chunks, no vector search.")
+        for doc in docs:
+            doc.metadata["retrievalScore"] = 1.0
+        return docs
+
+    @staticmethod
+    def _normalised(results: ScoredDocs) -> ScoredDocs:
+        # BM25 scores are unbounded; scale to [0, 1] to compare with similarity scores
+        top = max(score for _, score in results)
+        return [(doc, score / top if top else 0.0) for doc, score in results]
+
+    async def _search_queries(self, semaphore: asyncio.Semaphore, vector_store, queries: List[str], pre_filter: dict) -> List[ScoredDocs]:
+        embeddings = await aembed_queries(vector_store.embeddings, queries)
+        return await asyncio.gather(*(
+            self._search(semaphore, vector_store, q, embedding, pre_filter)
+            for q, embedding in zip(queries, embeddings)
+        ))
+
+    async def _retrieve_speculative(self, query: str, vector_store, session_id: str, pre_filter: dict) -> List[ScoredDocs]:
+        """
+        Starts the search for the original query together with the translation call,
+        then searches the translated queries as they arrive. Past the deadline it
+        returns what has completed; the original query's results are always included.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline if self.deadline else None
+
+        def remaining():
+            return None if deadline is None else max(0.0, deadline - loop.time())
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        original = asyncio.create_task(self._search_queries(semaphore, vector_store, [query], pre_filter))
+        translation = asyncio.create_task(self.get_translated_queries(query, session_id))
+        results = []
+        try:
+            done, _ = await asyncio.wait({translation}, timeout=remaining())
+            if not done:
+                # Left running so a cached translator still stores the result for next time
+                translation.add_done_callback(_ignore_result)
+                print(f"Translation exceeded the {self.deadline}s retrieval deadline; using the original query only.")
+            else:
+                extra = [q for q in dict.fromkeys(translation.result()) if q != query]
+                if extra:
+                    embeddings = await asyncio.wait_for(aembed_queries(vector_store.embeddings, extra), remaining())
+                    searches = [
+                        asyncio.create_task(self._search(semaphore, vector_store, q, embedding, pre_filter))
+                        for q, embedding in zip(extra, embeddings)
+                    ]
+                    done, pending = await asyncio.wait(searches, timeout=remaining())
+                    for task in pending:
+                        task.cancel()
+                    if pending:
+                        print(f"Retrieval deadline of {self.deadline}s reached; skipped {len(pending)} of {len(searches)} translated queries.")
+                    results.extend(task.result() for task in done)
+        except asyncio.TimeoutError:
+            print(f"Retrieval deadline of {self.deadline}s reached before the translated queries were embedded.")
+        except Exception as e:
+            # The original query's results still give an answer
+            print(f"Query translation failed, using the original query only: {e}")
+        results.extend(await original)
+        return results
+
+def _ignore_result(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()
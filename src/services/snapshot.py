@@ -0,0 +1,144 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+from langchain_core.documents import Document as LCDocument
+
+from src.config import CHUNK_STORAGE_MODE, CHUNK_STORAGE_LAYOUT, TEXT_SPLITTER_MODE, INGEST_EMBED_BATCH_SIZE
+from src.database import get_vector_store, get_embedding_info, get_repository, BulkChunkWriter
+from src.services.lexical_index import get_lexical_index
+from src.services.query_analysis import forget_session
+from src.services.answer_cache import get_answer_cache
+from src.services.ingestion import (
+    list_ingestible_files, _load_and_parse, _create_chunks, _candidate_record, _shared_chunk_id
+)
+
+SNAPSHOT_VERSION = 1
+
+def _to_bytes_array(payload) -> np.ndarray:
+    # JSON stored as raw bytes so the file loads without pickle
+    return np.frombuffer(json.dumps(payload).encode(), dtype=np.uint8)
+
+def _from_bytes_array(array: np.ndarray):
+    return json.loads(array.tobytes().decode())
+
+async def build_snapshot(directory: str, path: str) -> dict:
+    """
+    Parses, chunks and embeds every CV of a directory with the configured embedding
+    model and writes chunks, metadata and float32 vectors into one compressed .npz.
+    """
+    embeddings = get_vector_store().embeddings
+    emb_info = get_embedding_info()
+
+    chunks, candidates, skipped = [], [], []
+    for file_path in sorted(list_ingestible_files(directory)):
+        # Same source name as directory ingestion: the path relative to the directory
+        parsed = _load_and_parse(file_path, os.path.relpath(file_path, directory))
+        if not parsed.email:
+            skipped.append(parsed.source)
+            continue
+        candidates.append({k: v for k, v in _candidate_record(parsed, "").items() if k != "sessionId"})
+        for doc in _create_chunks(parsed, "", layout="per_session"):
+            metadata = {k: v for k, v in doc.metadata.items() if k != "sessionId"}
+            chunks.append({"text": doc.page_content, "metadata": metadata})
+
+    vectors = []
+    for start in range(0, len(chunks), INGEST_EMBED_BATCH_SIZE):
+        batch = chunks[start:start + INGEST_EMBED_BATCH_SIZE]
+        vectors.extend(await embeddings.aembed_documents([c["text"] for c in batch]))
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(chunks), -1)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "provider": emb_info["provider"],
+        "model": emb_info["model"],
+        "dim": int(matrix.shape[1]),
+        "chunkStorageMode": CHUNK_STORAGE_MODE,
+        "textSplitterMode": TEXT_SPLITTER_MODE,
+        "sourceDir": os.path.basename(os.path.normpath(directory)),
+        "files": len(candidates),
+        "chunks": len(chunks),
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez_compressed(
+        path,
+        manifest=_to_bytes_array(manifest),
+        chunks=_to_bytes_array(chunks),
+        candidates=_to_bytes_array(candidates),
+        vectors=matrix,
+    )
+    if skipped:
+        print(f"Skipped {len(skipped)} files without an email: {', '.join(skipped)}")
+    return manifest
+
+def snapshot_mismatch(manifest: dict) -> Optional[str]:
+    """Why a snapshot cannot be used with the current settings (None if it can)."""
+    emb_info = get_embedding_info()
+    expected = {
+        "version": SNAPSHOT_VERSION,
+        "provider": emb_info["provider"],
+        "model": emb_info["model"],
+        "chunkStorageMode": CHUNK_STORAGE_MODE,
+        "textSplitterMode": TEXT_SPLITTER_MODE,
+    }
+    for key, value in expected.items():
+        if manifest.get(key) != value:
+            return f"{key} is '{manifest.get(key)}', expected '{value}'"
+    return None
+
+async def load_snapshot(path: str, session_id: str) -> Optional[dict]:
+    """
+    Bulk-inserts a snapshot into a session (INGEST_WRITE_BATCH_SIZE chunks per write)
+    without any embedding call.
+    Returns an ingestion-style summary, or None if the snapshot does not match the
+    configured embedding model / chunking (the caller then embeds live).
+    A session that already has chunks is left untouched (0 chunks loaded), so
+    loading twice does not store every chunk twice.
+    """
+    started = time.perf_counter()
+    repository = get_repository()
+    with np.load(path, allow_pickle=False) as data:
+        manifest = _from_bytes_array(data["manifest"])
+        reason = snapshot_mismatch(manifest)
+        if reason:
+            print(f"Snapshot {path} not usable: {reason}.")
+            return None
+        if not await repository.is_session_empty(session_id):
+            print(f"Session '{session_id}' already has chunks; snapshot {path} not loaded.")
+            return {
+                "total": manifest["files"],
+                "successful": 0,
+                "failed": 0,
+                "errors": [],
+                "chunks": 0,
+                "durationSeconds": round(time.perf_counter() - started, 3),
+            }
+        chunks = _from_bytes_array(data["chunks"])
+        candidates = _from_bytes_array(data["candidates"])
+        vectors = data["vectors"]
+
+    documents = []
+    for chunk in chunks:
+        metadata = {"sessionId": session_id, **chunk["metadata"]}
+        doc_id = _shared_chunk_id(metadata["email"], metadata["chunkHash"]) if CHUNK_STORAGE_LAYOUT == "shared" else None
+        documents.append(LCDocument(page_content=chunk["text"], metadata=metadata, id=doc_id))
+    await BulkChunkWriter(get_vector_store()).write(documents, vectors.tolist())
+    for record in candidates:
+        await repository.upsert_candidate({"sessionId": session_id, **record})
+    get_lexical_index().drop_session(session_id)
+    forget_session(session_id)
+    await get_answer_cache().invalidate(session_id)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "total": manifest["files"],
+        "successful": manifest["files"],
+        "failed": 0,
+        "errors": [],
+        "chunks": manifest["chunks"],
+        "durationSeconds": round(elapsed, 3),
+    }
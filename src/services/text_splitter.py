@@ -0,0 +1,168 @@
+import re
+from collections import deque
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+Span = Tuple[int, int]
+# A separator is a string (literal or regex; pieces start at each match) or a
+# function (text, start, end) -> iterator of the positions where pieces start
+Boundaries = Callable[[str, int, int], Iterator[int]]
+Separator = Union[str, Boundaries]
+
+# LangChain-compatible separators used for CVs since the first ingestion version
+COMPATIBLE_SEPARATORS = ["\n----------------\n", "\nSECTION\n", "\n\n", "\n", " "]
+
+_UNDERLINE_RE = re.compile(r"\n-{3,}[ \t]*(?=\n|$)")
+_ROLE_RE = re.compile(r"\n+Role:")
+
+def heading_boundaries(text: str, start: int, end: int) -> Iterator[int]:
+    """Before the blank lines preceding a heading underlined with dashes."""
+    for match in _UNDERLINE_RE.finditer(text, start, end):
+        newline = text.rfind("\n", start, match.start())
+        if newline == -1 or newline + 1 == match.start():
+            continue
+        while newline > start and text[newline - 1] == "\n":
+            newline -= 1
+        yield newline
+
+def role_boundaries(text: str, start: int, end: int) -> Iterator[int]:
+    """Before a "Role:" block, unless it directly follows a heading (it stays attached)."""
+    for match in _ROLE_RE.finditer(text, start, end):
+        if match.start() > start and text[match.start() - 1] == "-":
+            continue
+        yield match.start()
+
+# Boundaries of the sample CV layout, coarsest first: headings, "Role:" blocks,
+# bullets, then the usual blank line / line / word fallbacks. Each one is anchored
+# on a literal so the regex engine can skip ahead instead of testing every offset.
+SECTION_SEPARATORS = [heading_boundaries, role_boundaries, r"\n(?=[-*•] )", r"\n\n", r"\n", r" "]
+
+class SectionTextSplitter:
+    """
+    Recursive splitter working on (start, end) offsets into the source text.
+    Separators are tried coarsest first; pieces shorter than chunk_size are merged
+    into chunks with chunk_overlap, longer ones are split with the next separator.
+    Text is only copied when a chunk is emitted.
+
+    With literal separators this reproduces RecursiveCharacterTextSplitter
+    (keep_separator=True, strip_whitespace=True, len as length function) exactly.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        separators: Optional[List[Separator]] = None,
+        is_separator_regex: bool = False,
+    ):
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be > 0, got {chunk_size}")
+        if not 0 <= chunk_overlap <= chunk_size:
+            raise ValueError(f"chunk_overlap must be between 0 and chunk_size, got {chunk_overlap}")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        separators = separators or ["\n\n", "\n", " ", ""]
+        # None stands for the empty separator (split into characters)
+        self._levels = [self._level(s, is_separator_regex) for s in separators]
+
+    @staticmethod
+    def _level(separator: Separator, is_regex: bool) -> Optional[Boundaries]:
+        if callable(separator):
+            return separator
+        if not separator:
+            return None
+        pattern = re.compile(separator if is_regex else re.escape(separator))
+        return lambda text, start, end: (m.start() for m in pattern.finditer(text, start, end))
+
+    @classmethod
+    def compatible(cls, chunk_size: int = 1000, chunk_overlap: int = 200) -> "SectionTextSplitter":
+        return cls(chunk_size, chunk_overlap, COMPATIBLE_SEPARATORS)
+
+    @classmethod
+    def sections(cls, chunk_size: int = 1000, chunk_overlap: int = 200) -> "SectionTextSplitter":
+        return cls(chunk_size, chunk_overlap, SECTION_SEPARATORS, is_separator_regex=True)
+
+    def iter_spans(self, text: str) -> Iterator[Span]:
+        """Chunk offsets, in order."""
+        return self._split(text, 0, len(text), 0)
+
+    def split_text(self, text: str) -> List[str]:
+        return [text[start:end] for start, end in self.iter_spans(text)]
+
+    def _split(self, text: str, start: int, end: int, level: int) -> Iterator[Span]:
+        levels = self._levels
+        # First separator present in the segment; without a match the last one is
+        # used and long pieces are emitted as they are
+        chosen, next_level, boundaries = len(levels) - 1, None, None
+        for i in range(level, len(levels)):
+            if levels[i] is None:
+                chosen, next_level, boundaries = i, None, None
+                break
+            boundaries = levels[i](text, start, end)
+            first = next(boundaries, None)
+            if first is not None:
+                chosen = i
+                next_level = i + 1 if i + 1 < len(levels) else None
+                boundaries = _chain_first(first, boundaries)
+                break
+        else:
+            boundaries = None if levels[chosen] is None else levels[chosen](text, start, end)
+
+        window = deque()
+        total = 0
+        for piece_start, piece_end in self._pieces(start, end, boundaries):
+            length = piece_end - piece_start
+            if length < self.chunk_size:
+                if total + length > self.chunk_size and window:
+                    span = self._strip(text, window[0][0], window[-1][1])
+                    if span:
+                        yield span
+                    # Keep the tail of the window as overlap for the next chunk
+                    while total > self.chunk_overlap or (total + length > self.chunk_size and total > 0):
+                        dropped_start, dropped_end = window.popleft()
+                        total -= dropped_end - dropped_start
+                window.append((piece_start, piece_end))
+                total += length
+                continue
+
+            if window:
+                span = self._strip(text, window[0][0], window[-1][1])
+                if span:
+                    yield span
+                window.clear()
+                total = 0
+            if next_level is None:
+                yield piece_start, piece_end
+            else:
+                yield from self._split(text, piece_start, piece_end, next_level)
+
+        if window:
+            span = self._strip(text, window[0][0], window[-1][1])
+            if span:
+                yield span
+
+    @staticmethod
+    def _pieces(start: int, end: int, boundaries: Optional[Iterator[int]]) -> Iterator[Span]:
+        """Non-empty pieces of the segment, each starting at a boundary."""
+        if boundaries is None:
+            for i in range(start, end):
+                yield i, i + 1
+            return
+        previous = start
+        for position in boundaries:
+            if position > previous:
+                yield previous, position
+                previous = position
+        if end > previous:
+            yield previous, end
+
+    @staticmethod
+    def _strip(text: str, start: int, end: int) -> Optional[Span]:
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return (start, end) if end > start else None
+
+def _chain_first(first: int, rest: Iterator[int]) -> Iterator[int]:
+    yield first
+    yield from rest
@@ -0,0 +1,86 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+_MISSING = object()
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_query(text: str) -> str:
+    """Cache-key form of a user question: case-folded with collapsed whitespace."""
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache with an optional per-entry TTL.
+    A max_size of 0 disables caching; a ttl_seconds of 0 keeps entries until evicted.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float = 0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at and expires_at < time.monotonic():
+                    del self._entries[key]
+                    entry = _MISSING
+                else:
+                    self._entries.move_to_end(key)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxEntries": self.max_size,
+            "ttlSeconds": self.ttl_seconds,
+        }
+
+# Named stats providers, reported by the /metrics/cache endpoint
+_stats_providers: Dict[str, Callable[[], dict]] = {}
+
+def register_cache_stats(name: str, provider: Callable[[], dict]):
+    _stats_providers[name] = provider
+
+def get_cache_stats() -> Dict[str, dict]:
+    return {name: provider() for name, provider in _stats_providers.items()}
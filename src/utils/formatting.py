@@ -6,6 +6,11 @@ def generate_id(email: str, content: str, index: int, session_id: str) -> str:
     hash_hex = hashlib.sha256(raw.encode()).hexdigest()
     return f"{hash_hex[:8]}-{hash_hex[8:12]}-{hash_hex[12:16]}-{hash_hex[16:20]}-{hash_hex[20:32]}"
 
+SECTION_MARKER = "\n\n--- SECTION CONTENT ---\n"
+
+def format_candidate_header(email: str, name: str, address: str, role: str) -> str:
+    return f"CANDIDATE IDENTITY: {email}\nFULL NAME: {name}\nADDRESS: {address}\nJOB ROLE: {role}"
+
 def print_ingestion_info():
     # Log configuration
     emb_info = get_embedding_info()
@@ -0,0 +1,31 @@
+import re
+import threading
+from typing import Callable, Optional, Tuple
+
+_APPROX_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_lock = threading.Lock()
+_counters = {}
+
+def _load_counter(encoding_name: str) -> Tuple[Callable[[str], int], str]:
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding(encoding_name)
+        return (lambda text: len(encoding.encode(text, disallowed_special=()))), encoding_name
+    except Exception as e:
+        # tiktoken downloads its BPE files on first use; without network fall back to
+        # words + punctuation marks, which tracks cl100k_base closely on CV text
+        print(f"Warning: tiktoken encoding '{encoding_name}' unavailable ({type(e).__name__}); using an approximate token count.")
+        return (lambda text: len(_APPROX_TOKEN_RE.findall(text))), "approx (words+punctuation)"
+
+def get_token_counter(encoding_name: str = "cl100k_base") -> Tuple[Callable[[str], int], str]:
+    """(count_tokens, tokenizer name), loaded once per encoding."""
+    counter = _counters.get(encoding_name)
+    if counter is None:
+        with _lock:
+            counter = _counters.get(encoding_name)
+            if counter is None:
+                counter = _counters[encoding_name] = _load_counter(encoding_name)
+    return counter
+
+def count_tokens(text: str, encoding_name: Optional[str] = None) -> int:
+    return get_token_counter(encoding_name or "cl100k_base")[0](text)
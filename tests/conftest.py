@@ -0,0 +1,27 @@
+"""
+Offline configuration for the unit tests: the embedded vector store in a
+temporary directory and deterministic fake embeddings, so no MongoDB, network
+or API key is needed. The other scripts in this folder drive a live server.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.update({
+    "LLM_PROVIDER": "openai",
+    "EMBEDDING_LLM_PROVIDER": "openai",
+    "OPENAI_EMBEDDING_MODEL": "fake",
+    "VECTOR_STORE_PROVIDER": "local",
+    "LOCAL_VECTOR_STORE_DIR": tempfile.mkdtemp(prefix="recruiter-tests-"),
+    "EMBEDDING_CACHE_BACKEND": "none",
+})
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+import src.database.embeddings as embeddings
+
+embeddings._build_embeddings = lambda provider, model: DeterministicFakeEmbedding(size=32)
+
+# Manual scripts against a running server (python tests/<script>.py)
+collect_ignore = ["debug_retrieval.py", "test_wipe_logic.py", "verify_api.py"]
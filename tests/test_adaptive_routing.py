@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from src.services.query_translation.adaptive import AdaptiveTranslator
+from src.services.query_translation.base import QueryTranslationType
+
+IDENTITY = QueryTranslationType.IDENTITY
+MULTI_QUERY = QueryTranslationType.MULTI_QUERY
+DECOMPOSITION = QueryTranslationType.DECOMPOSITION
+
+class StaticLexicalIndex:
+    def __init__(self, hits, terms):
+        self.coverage = (hits, terms)
+
+    async def term_coverage(self, session_id, query):
+        return self.coverage
+
+def _route(query, lexical_index=None):
+    translator = AdaptiveTranslator(None, None, None, lexical_index=lexical_index)
+    strategy, _ = asyncio.run(translator.route(query, "s1" if lexical_index else None))
+    return strategy
+
+@pytest.mark.parametrize("query", [
+    "Which candidates know Python and Java and have worked in finance?",
+    "Find engineers with research and development experience in biotech",
+    "Is there anyone with AWS or GCP certifications on the shortlist?",
+])
+def test_conjunction_inside_one_ask_is_not_compound(query):
+    assert _route(query) == MULTI_QUERY
+
+@pytest.mark.parametrize("query", [
+    "Who has led a data team and what stack did they use there?",
+    "Which candidates know Kubernetes, and how long have they used it?",
+    "List the senior engineers and also summarize their cloud experience",
+    "Compare the Python experience of the first candidate with the second one",
+    "How does the backend candidate stack up versus the frontend candidate?",
+    "Who worked at a startup; who worked at a large enterprise company?",
+    "Who knows Rust at all? Who has shipped it in production systems?",
+])
+def test_several_asks_are_decomposed(query):
+    assert _route(query) == DECOMPOSITION
+
+def test_short_compound_question_is_not_decomposed():
+    assert _route("Compare Rust and Go?") == IDENTITY
+
+def test_named_candidate_goes_straight_to_identity():
+    assert _route("Compare alice@example.com with the other applicants on leadership") == IDENTITY
+    assert _route("Compare alice@example.com with bob@example.com on leadership") == DECOMPOSITION
+
+def test_lexical_coverage_decides_between_identity_and_multi_query():
+    query = "Which candidates have experience with distributed databases?"
+    assert _route(query, StaticLexicalIndex(5, 5)) == IDENTITY
+    assert _route(query, StaticLexicalIndex(3, 5)) == MULTI_QUERY
@@ -0,0 +1,39 @@
+from langchain_core.documents import Document
+
+from src.services.ingestion import _chunk_hash, _diff_chunks
+
+def _document(text):
+    return Document(page_content=text, metadata={"chunkHash": _chunk_hash(text)})
+
+def _stored(doc_id, text, with_hash=True):
+    record = {"_id": doc_id, "text": text}
+    if with_hash:
+        record["chunkHash"] = _chunk_hash(text)
+    return record
+
+def test_unchanged_chunks_are_kept_and_new_ones_added():
+    existing = [_stored(1, "skills"), _stored(2, "education")]
+    added, kept, removed = _diff_chunks(existing, [_document("skills"), _document("experience")])
+    assert [d.page_content for d in added] == ["experience"]
+    assert kept == [1]
+    assert removed == [2]
+
+def test_repeated_chunks_are_matched_one_to_one():
+    existing = [_stored(1, "summary"), _stored(2, "summary"), _stored(3, "summary")]
+    added, kept, removed = _diff_chunks(existing, [_document("summary"), _document("summary")])
+    assert added == []
+    assert len(kept) == 2 and len(removed) == 1
+    assert set(kept) | set(removed) == {1, 2, 3}
+
+    added, kept, removed = _diff_chunks(existing[:1], [_document("summary"), _document("summary")])
+    assert [d.page_content for d in added] == ["summary"]
+    assert kept == [1] and removed == []
+
+def test_chunks_stored_without_a_hash_are_hashed_from_their_text():
+    existing = [_stored(1, "skills", with_hash=False), _stored(2, "hobbies", with_hash=False)]
+    added, kept, removed = _diff_chunks(existing, [_document("skills")])
+    assert added == [] and kept == [1] and removed == [2]
+
+def test_first_ingest_adds_everything():
+    documents = [_document("a"), _document("b")]
+    assert _diff_chunks([], documents) == (documents, [], [])
@@ -0,0 +1,48 @@
+import hashlib
+
+import pytest
+from langchain_core.documents import Document
+
+from src.services.query_translation.fusion import DEFAULT_RRF_K, doc_key, fuse
+
+def _chunk(name, email="a@example.com"):
+    return Document(page_content=f"text of {name}", metadata={"email": email, "chunkHash": name})
+
+def _ids(results):
+    return [doc.metadata["chunkHash"] for doc, _ in results]
+
+def test_doc_key_prefers_email_and_chunk_hash():
+    doc = Document(page_content="x", metadata={"email": "a@example.com", "chunkHash": "h1"}, id="ignored")
+    assert doc_key(doc) == "a@example.com:h1"
+    # The same chunk hash under another candidate is another chunk
+    assert doc_key(_chunk("h1", "b@example.com")) != doc_key(_chunk("h1"))
+
+def test_doc_key_falls_back_to_id_then_text():
+    assert doc_key(Document(page_content="x", metadata={"chunkHash": "h1"}, id="42")) == "42"
+    assert doc_key(Document(page_content="x")) == hashlib.sha256(b"x").hexdigest()
+
+def test_rrf_rewards_chunks_found_by_several_queries():
+    a, b, c = _chunk("a"), _chunk("b"), _chunk("c")
+    fused = fuse([[(a, 0.9), (b, 0.8)], [(c, 0.95), (b, 0.7)]])
+    assert _ids(fused) == ["b", "a", "c"]
+    assert fused[0][1] == pytest.approx(2 / (DEFAULT_RRF_K + 2))
+
+def test_rrf_ranks_each_list_by_score_and_counts_a_chunk_once_per_list():
+    a, b = _chunk("a"), _chunk("b")
+    # Unsorted input, and a appears twice in the list
+    fused = fuse([[(b, 0.1), (a, 0.9), (_chunk("a"), 0.05)]], rrf_k=1)
+    assert _ids(fused) == ["a", "b"]
+    assert [score for _, score in fused] == pytest.approx([1 / 2, 1 / 3])
+
+def test_max_fusion_keeps_the_best_score_of_each_chunk():
+    a, b = _chunk("a"), _chunk("b")
+    fused = fuse([[(a, 0.5), (b, 0.6)], [(_chunk("a"), 0.9)]], method="max")
+    assert _ids(fused) == ["a", "b"]
+    assert [score for _, score in fused] == [0.9, 0.6]
+
+def test_top_k_and_unknown_method():
+    results = [[(_chunk(name), 1.0 - i / 10) for i, name in enumerate("abcd")]]
+    assert _ids(fuse(results, top_k=2)) == ["a", "b"]
+    assert len(fuse(results, top_k=0)) == 4
+    with pytest.raises(ValueError):
+        fuse(results, method="sum")
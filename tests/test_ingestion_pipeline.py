@@ -0,0 +1,96 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from src.database import get_repository
+from src.services.ingestion import IngestionPipeline, ingest_directory, _split_content, shutdown_parse_executor
+
+CV = os.path.join(os.path.dirname(__file__), "..", "data", "top10", "human_like_candidate_0001.txt")
+EMAIL = "kimberly.hill.1@example.com"
+
+def _versions(tmp_path, count):
+    """count copies of one CV, each differing by one word."""
+    with open(CV, encoding="utf-8") as f:
+        text = f.read()
+    paths = []
+    for i in range(count):
+        content = text.replace("MetaLogic", f"MetaLogic{i}")
+        path = tmp_path / f"copy_{i}.txt"
+        path.write_text(content, encoding="utf-8")
+        paths.append((str(path), content))
+    return paths
+
+async def _ingest(paths):
+    session_id = f"test-{uuid.uuid4().hex}"
+    summary = await IngestionPipeline(session_id, parse_workers=2, prepare_concurrency=4).run(paths)
+    chunks = await get_repository().find_candidate_chunks(session_id, EMAIL)
+    return summary, chunks
+
+def test_same_email_files_keep_only_the_last_listed(tmp_path):
+    versions = _versions(tmp_path, 3)
+    try:
+        for order in (versions, versions[::-1]):
+            summary, chunks = asyncio.run(_ingest([path for path, _ in order]))
+            _, last = order[-1]
+            assert summary["failed"] == 0
+            assert summary["successful"] == len(order)
+            # One version of the candidate, and it is the last file's
+            assert len(chunks) == len(_split_content(last))
+            assert {c["contentHash"] for c in chunks} == {hashlib.sha256(last.encode()).hexdigest()}
+    finally:
+        shutdown_parse_executor()
+
+def test_directory_progress_is_keyed_by_relative_path(tmp_path):
+    for folder, number in (("a", "0001"), ("b", "0002")):
+        (tmp_path / folder).mkdir()
+        with open(CV.replace("0001", number), encoding="utf-8") as f:
+            (tmp_path / folder / "cv.txt").write_text(f.read(), encoding="utf-8")
+    events = []
+
+    async def progress(source, status, **info):
+        events.append((source, status))
+
+    try:
+        summary = asyncio.run(ingest_directory(str(tmp_path), f"test-{uuid.uuid4().hex}", progress=progress))
+    finally:
+        shutdown_parse_executor()
+    assert summary["successful"] == 2
+    done = sorted(source for source, status in events if status == "done")
+    assert done == [os.path.join("a", "cv.txt"), os.path.join("b", "cv.txt")]
+
+def test_failed_write_batch_only_fails_its_candidates(tmp_path):
+    paths = []
+    for number in ("0001", "0002", "0003"):
+        with open(CV.replace("0001", number), encoding="utf-8") as f:
+            path = tmp_path / f"{number}.txt"
+            path.write_text(f.read(), encoding="utf-8")
+            paths.append(str(path))
+    session_id = f"test-{uuid.uuid4().hex}"
+    # One embedding batch for all three, written one candidate per write batch
+    pipeline = IngestionPipeline(session_id, prepare_concurrency=1, embed_batch_size=1000)
+    pipeline.writer.batch_size = 1
+    write_batch = pipeline.writer._write_batch
+
+    async def failing_write_batch(documents, vectors):
+        # Stores the chunk, then fails: what a partly successful unordered insert leaves behind
+        await write_batch(documents, vectors)
+        if documents[0].metadata["email"] == EMAIL:
+            raise RuntimeError("write failed")
+
+    pipeline.writer._write_batch = failing_write_batch
+    try:
+        summary = asyncio.run(pipeline.run(paths))
+    finally:
+        shutdown_parse_executor()
+    assert summary["failed"] == 1 and summary["successful"] == 2
+    assert "0001.txt" in summary["errors"][0]
+
+    async def stored():
+        repository = get_repository()
+        candidates = await repository.list_candidates(session_id)
+        chunks = await repository.find_session_chunks(session_id)
+        return {c["email"] for c in candidates}, {c["email"] for c in chunks}
+
+    candidates, chunk_owners = asyncio.run(stored())
+    assert EMAIL not in candidates and EMAIL not in chunk_owners
+    assert len(candidates) == 2 and chunk_owners == candidates
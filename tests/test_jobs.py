@@ -0,0 +1,50 @@
+import asyncio
+from src.services.jobs import InMemoryJobStore, JobManager, JobQueueFullError, _final_status
+
+class SlowCreateStore(InMemoryJobStore):
+    """Yields during create, as a database write would."""
+
+    async def create(self, job: dict):
+        await asyncio.sleep(0.01)
+        await super().create(job)
+
+async def _noop(progress):
+    return None
+
+def test_submit_race_for_the_last_slot_leaves_no_stuck_job():
+    async def run():
+        store = SlowCreateStore()
+        manager = JobManager(store, workers=1, queue_size=1)
+        # Not started: queued jobs stay in the queue
+        results = await asyncio.gather(
+            *(manager.submit("text", "s", ["cv.txt"], _noop) for _ in range(3)), return_exceptions=True
+        )
+        accepted = [r for r in results if isinstance(r, dict)]
+        rejected = [r for r in results if isinstance(r, JobQueueFullError)]
+        assert len(accepted) == 1 and len(rejected) == 2
+        assert [j["jobId"] for j in await store.list()] == [accepted[0]["jobId"]]
+        await manager.stop()
+
+    asyncio.run(run())
+
+def _finished_job(job_id: str, finished_at: str) -> dict:
+    return {"jobId": job_id, "sessionId": "s", "createdAt": finished_at, "finishedAt": finished_at}
+
+def test_memory_store_drops_expired_and_excess_finished_jobs():
+    async def run():
+        store = InMemoryJobStore(retention_seconds=3600, max_finished=2)
+        await store.create(_finished_job("expired", "2000-01-01T00:00:00+00:00"))
+        for i in range(3):
+            await store.create(_finished_job(f"done-{i}", f"2999-01-01T00:00:0{i}+00:00"))
+        await store.create({"jobId": "running", "sessionId": "s", "createdAt": "2999-01-02", "finishedAt": None})
+        # Pruned on create: expired first, then the oldest finished beyond the cap
+        assert sorted(j["jobId"] for j in await store.list()) == ["done-1", "done-2", "running"]
+
+    asyncio.run(run())
+
+def test_final_status_reflects_failed_files():
+    assert _final_status(None) == "done"
+    assert _final_status({"added": 3}) == "done"
+    assert _final_status({"total": 3, "failed": 0}) == "done"
+    assert _final_status({"total": 3, "failed": 1}) == "partial"
+    assert _final_status({"total": 3, "failed": 3}) == "failed"
@@ -0,0 +1,62 @@
+import math
+
+import pytest
+from langchain_core.documents import Document
+
+from src.services.lexical_index import BM25_B, BM25_K1, _SessionIndex, tokenize
+
+def _doc(email, chunk_hash, text):
+    return Document(page_content=text, metadata={"email": email, "chunkHash": chunk_hash})
+
+def test_tokenize_keeps_technical_terms_whole():
+    assert tokenize("Who knows C++, C# and Node.js?") == ["knows", "c++", "c#", "node.js"]
+    assert tokenize("Mail kim@example.com.") == ["mail", "kim@example.com"]
+
+def test_tokenize_drops_stopwords_unless_asked():
+    assert tokenize("Find the candidates with Python") == ["python"]
+    assert tokenize("the Python", keep_stopwords=True) == ["the", "python"]
+
+def _index():
+    index = _SessionIndex()
+    index.add(_doc("a@example.com", "a1", "python python developer"))
+    index.add(_doc("a@example.com", "a2", "team lead"))
+    index.add(_doc("b@example.com", "b1", "java developer with long python experience"))
+    return index
+
+def test_bm25_scores():
+    index = _index()
+    results = index.search(["python"], k=10)
+    assert [doc.metadata["chunkHash"] for doc, _ in results] == ["a1", "b1"]
+
+    # Hand-computed Okapi BM25 of "python" in a1: tf 2, length 3, average length 10/3 ("with" is a stopword)
+    n, df, avg_length = 3, 2, 10 / 3
+    idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * 3 / avg_length)
+    assert results[0][1] == pytest.approx(idf * 2 * (BM25_K1 + 1) / (2 + norm))
+
+def test_search_sums_terms_and_honours_k():
+    index = _index()
+    results = index.search(["java", "python"], k=1)
+    assert [doc.metadata["chunkHash"] for doc, _ in results] == ["b1"]
+    assert index.search(["golang"], k=5) == []
+    assert index.search([], k=5) == []
+
+def test_adding_a_chunk_twice_is_ignored():
+    index = _index()
+    index.add(_doc("a@example.com", "a1", "python python developer"))
+    assert len(index.docs) == 3 and index.total_length == 10
+
+def test_remove_email_drops_its_chunks_and_postings():
+    index = _index()
+    index.remove_email("a@example.com")
+    assert set(index.docs) == {"b@example.com:b1"}
+    assert index.total_length == 5
+    assert "lead" not in index.postings
+    assert index.postings["python"] == {"b@example.com:b1": 1}
+    assert [doc.metadata["chunkHash"] for doc, _ in index.search(["python"], k=5)] == ["b1"]
+
+def test_search_returns_copies():
+    index = _index()
+    doc, _ = index.search(["lead"], k=1)[0]
+    doc.metadata["retrievalScore"] = 1.0
+    assert "retrievalScore" not in index.docs["a@example.com:a2"].metadata
@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+import src.database.local_store as local_store
+from src.database.local_store import LocalVectorStore
+
+DIM = 8
+
+def _vector(i):
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[i % DIM] = 1.0
+    return vector.tolist()
+
+def _add(store, session_id, ids, **metadata):
+    store.add_vectors(
+        [f"text {i}" for i in ids],
+        [_vector(i) for i in ids],
+        [{"sessionId": session_id, "n": i, **metadata} for i in ids],
+        [f"doc-{i}" for i in ids],
+    )
+
+def _ids(store, session_id):
+    return sorted(r["_id"] for r in store.find({"sessionId": session_id}))
+
+def _assert_rows_match_records(store, session_id):
+    # Each row still holds the vector of the record at its position
+    partition = store._partition(session_id)
+    for row, record in zip(partition.matrix(), partition.records):
+        assert np.allclose(row, _vector(record["n"]))
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalVectorStore(str(tmp_path), DeterministicFakeEmbedding(size=DIM))
+
+def test_append_and_swap_remove_delete(store):
+    _add(store, "s1", range(6))
+    assert store.count({"sessionId": "s1"}) == 6
+
+    assert store.delete_where({"sessionId": "s1", "n": {"$in": [1, 5, 2]}}) == 3
+    assert _ids(store, "s1") == ["doc-0", "doc-3", "doc-4"]
+    _assert_rows_match_records(store, "s1")
+
+    # Re-adding an existing id replaces it instead of duplicating it
+    _add(store, "s1", [3, 7])
+    assert _ids(store, "s1") == ["doc-0", "doc-3", "doc-4", "doc-7"]
+    _assert_rows_match_records(store, "s1")
+
+def test_pre_filter_limits_search(store):
+    _add(store, "s1", range(4), email="a@example.com")
+    _add(store, "s1", range(4, 8), email="b@example.com")
+    _add(store, "s2", range(8, 12), email="a@example.com")
+
+    results = store.similarity_search_with_score_by_vector(
+        _vector(1), k=10, pre_filter={"sessionId": "s1", "email": {"$in": ["a@example.com"]}}
+    )
+    assert sorted(doc.id for doc, _ in results) == ["doc-0", "doc-1", "doc-2", "doc-3"]
+    assert results[0][0].id == "doc-1"
+
+def test_reload_replays_the_log(store, tmp_path):
+    _add(store, "s1", range(5))
+    store.delete_where({"sessionId": "s1", "n": 0})
+    store.update_where({"sessionId": "s1", "n": {"$in": [3, 4]}}, {"status": "final"})
+    _add(store, "s1", [9])
+    partition = store._partition("s1")
+    assert os.path.getsize(partition.log_path) > 0
+
+    reloaded = LocalVectorStore(str(tmp_path), DeterministicFakeEmbedding(size=DIM))
+    assert _ids(reloaded, "s1") == ["doc-1", "doc-2", "doc-3", "doc-4", "doc-9"]
+    assert sorted(r["n"] for r in reloaded.find({"sessionId": "s1", "status": "final"})) == [3, 4]
+    _assert_rows_match_records(reloaded, "s1")
+
+def test_torn_log_line_is_dropped_on_reload(store, tmp_path):
+    _add(store, "s1", range(3))
+    _add(store, "s1", [3])
+    with open(store._partition("s1").log_path, "ab") as f:
+        f.write(b'{"op": "append", "rec')
+
+    reloaded = LocalVectorStore(str(tmp_path), DeterministicFakeEmbedding(size=DIM))
+    assert _ids(reloaded, "s1") == ["doc-0", "doc-1", "doc-2", "doc-3"]
+    _add(reloaded, "s1", [4])
+    again = LocalVectorStore(str(tmp_path), DeterministicFakeEmbedding(size=DIM))
+    assert _ids(again, "s1") == ["doc-0", "doc-1", "doc-2", "doc-3", "doc-4"]
+
+def test_log_is_compacted_into_a_new_snapshot(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(local_store, "MIN_COMPACT_BYTES", 0)
+    _add(store, "s1", range(2))
+    for i in range(2, 12):
+        _add(store, "s1", [i])
+    partition = store._partition("s1")
+    assert partition.generation > 1
+    logs = [name for name in os.listdir(partition.path) if name.startswith("log-")]
+    assert logs in ([], [os.path.basename(partition.log_path)])
+
+    reloaded = LocalVectorStore(str(tmp_path), DeterministicFakeEmbedding(size=DIM))
+    assert _ids(reloaded, "s1") == sorted(f"doc-{i}" for i in range(12))
+    _assert_rows_match_records(reloaded, "s1")
+
+def test_reads_of_unknown_sessions_create_no_partition(store):
+    assert store.count({"sessionId": "nobody"}) == 0
+    assert store.find({"sessionId": "nobody"}) == []
+    assert store.similarity_search_by_vector(_vector(0), k=3, pre_filter={"sessionId": "nobody"}) == []
+    assert store.drop_session("nobody") == 0
+    assert store._partitions == {}
+
+    _add(store, "s1", [0])
+    assert list(store._partitions) == ["s1"]
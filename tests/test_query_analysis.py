@@ -0,0 +1,34 @@
+import asyncio
+
+from src.services.query_analysis import QueryAnalyzer, _candidates_cache, forget_session
+from src.utils.cache import LRUCache
+
+CANDIDATES = [
+    {"email": "Kim.Hill@example.com", "name": "Kimberly Hill", "role": "Data Engineer"},
+    {"email": "bob@example.com", "name": "Bob Stone", "role": "Project Manager"},
+]
+
+def _analyze(question):
+    cache = LRUCache(max_size=4)
+    cache.set("s1", CANDIDATES)
+    return asyncio.run(QueryAnalyzer(cache=cache).analyze("s1", question))
+
+def test_stored_email_targets_its_candidate():
+    analysis = _analyze("What did kim.hill@example.com build?")
+    assert analysis.emails == ["Kim.Hill@example.com"] and analysis.targeted
+
+def test_unknown_email_falls_back_to_untargeted_retrieval():
+    analysis = _analyze("Is there a CV from nobody@example.com?")
+    assert analysis.emails == [] and not analysis.targeted
+    assert analysis.filter == {}
+
+def test_full_name_and_role_matches():
+    assert _analyze("Summarize Bob Stone's projects").emails == ["bob@example.com"]
+    analysis = _analyze("Which managers have budget experience?")
+    assert analysis.emails == ["bob@example.com"] and not analysis.targeted
+
+def test_forget_session_removes_the_cached_candidates():
+    _candidates_cache.set("wiped", CANDIDATES)
+    forget_session("wiped")
+    assert "wiped" not in _candidates_cache._entries
+    forget_session("never-cached")
@@ -0,0 +1,115 @@
+import asyncio
+
+from src.database import SharedResumeRepository
+
+class Result:
+    def __init__(self, deleted_count=0, modified_count=0):
+        self.deleted_count = deleted_count
+        self.modified_count = modified_count
+
+class FakeCollection:
+    """The slice of the Motor collection API SharedResumeRepository uses, over a dict."""
+
+    def __init__(self, docs=()):
+        self.docs = {doc["_id"]: doc for doc in docs}
+
+    @staticmethod
+    def _matches(doc, query):
+        for key, condition in query.items():
+            if key == "sessionId.0":
+                value = doc.get("sessionId")
+                present = isinstance(value, list) and len(value) > 0
+                if present != condition["$exists"]:
+                    return False
+                continue
+            value = doc.get(key)
+            if isinstance(condition, dict):
+                if "$in" in condition and value not in condition["$in"]:
+                    return False
+                if "$size" in condition and not (isinstance(value, list) and len(value) == condition["$size"]):
+                    return False
+            elif isinstance(value, list):
+                if condition not in value:
+                    return False
+            elif value != condition:
+                return False
+        return True
+
+    def find(self, query, projection=None):
+        async def cursor():
+            for doc in list(self.docs.values()):
+                if self._matches(doc, query):
+                    yield dict(doc)
+        return cursor()
+
+    async def update_many(self, query, update):
+        modified = 0
+        for doc in self.docs.values():
+            if not self._matches(doc, query):
+                continue
+            sessions = doc["sessionId"]
+            for session_id in update.get("$addToSet", {}).values():
+                if session_id not in sessions:
+                    sessions.append(session_id)
+                    modified += 1
+            for session_id in update.get("$pull", {}).values():
+                if session_id in sessions:
+                    sessions.remove(session_id)
+                    modified += 1
+        return Result(modified_count=modified)
+
+    async def delete_many(self, query):
+        doomed = [doc_id for doc_id, doc in self.docs.items() if self._matches(doc, query)]
+        for doc_id in doomed:
+            del self.docs[doc_id]
+        return Result(deleted_count=len(doomed))
+
+class FakeSharedRepository(SharedResumeRepository):
+    def __init__(self, chunks):
+        self._chunks = FakeCollection(chunks)
+        self._candidates = FakeCollection()
+
+    @property
+    def collection(self):
+        return self._chunks
+
+    @property
+    def candidates(self):
+        return self._candidates
+
+def test_shared_chunk_is_collected_after_its_last_session():
+    repository = FakeSharedRepository([
+        {"_id": "shared", "email": "a@example.com", "sessionId": ["s1"]},
+        {"_id": "only-s1", "email": "a@example.com", "sessionId": ["s1"]},
+        {"_id": "legacy", "email": "a@example.com", "sessionId": "s2"},
+    ])
+
+    async def scenario():
+        linked = await repository.link_chunks("s2", ["shared", "missing"])
+        assert linked == {"shared"}
+        assert repository.collection.docs["shared"]["sessionId"] == ["s1", "s2"]
+
+        # Wiping s1 keeps the chunk s2 still references and collects the one it alone held
+        assert await repository.delete_session_documents("s1") == 2
+        assert set(repository.collection.docs) == {"shared", "legacy"}
+        assert repository.collection.docs["shared"]["sessionId"] == ["s2"]
+
+        # Wiping the last session collects the shared chunk; the legacy one is deleted outright
+        assert await repository.delete_session_documents("s2") == 2
+        assert repository.collection.docs == {}
+
+    asyncio.run(scenario())
+
+def test_removing_one_candidate_only_unlinks_its_chunks():
+    repository = FakeSharedRepository([
+        {"_id": "a1", "email": "a@example.com", "sessionId": ["s1", "s2"]},
+        {"_id": "b1", "email": "b@example.com", "sessionId": ["s1"]},
+    ])
+
+    async def scenario():
+        assert await repository.delete_candidate_documents("s1", "a@example.com") == 1
+        assert repository.collection.docs["a1"]["sessionId"] == ["s2"]
+        assert await repository.remove_chunks("s1", ["b1"]) == 1
+        assert set(repository.collection.docs) == {"a1"}
+
+    asyncio.run(scenario())
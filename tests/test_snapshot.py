@@ -0,0 +1,27 @@
+import asyncio
+import os
+import uuid
+
+from src.database import get_repository
+from src.services.snapshot import build_snapshot, load_snapshot
+
+TOP10 = os.path.join(os.path.dirname(__file__), "..", "data", "top10")
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "top10.npz")
+    session_id = f"test-{uuid.uuid4().hex}"
+
+    async def scenario():
+        manifest = await build_snapshot(TOP10, path)
+        summary = await load_snapshot(path, session_id)
+        # A second load must not store every chunk again
+        reload = await load_snapshot(path, session_id)
+        repository = get_repository()
+        return manifest, summary, reload, await repository.count_session_documents(session_id), await repository.list_candidates(session_id)
+
+    manifest, summary, reload, count, candidates = asyncio.run(scenario())
+    assert manifest["chunks"] > 0
+    assert summary["chunks"] == count == manifest["chunks"]
+    assert reload["chunks"] == 0
+    assert len(candidates) == manifest["files"]
+    assert {c["source"] for c in candidates} <= set(os.listdir(TOP10))
@@ -0,0 +1,15 @@
+import os
+
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.services.text_splitter import COMPATIBLE_SEPARATORS, SectionTextSplitter
+
+TOP10 = os.path.join(os.path.dirname(__file__), "..", "data", "top10")
+
+@pytest.mark.parametrize("name", sorted(os.listdir(TOP10)))
+def test_compatible_mode_matches_the_recursive_splitter(name):
+    with open(os.path.join(TOP10, name), encoding="utf-8") as f:
+        text = f.read()
+    reference = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, separators=COMPATIBLE_SEPARATORS)
+    assert SectionTextSplitter.compatible().split_text(text) == reference.split_text(text)
@@ -16,6 +16,16 @@ if not API_KEY:
 
 HEADERS = {"X-API-Key": API_KEY}
 
+def wait_for_job(job_id, timeout=60):
+    """Polls the ingestion job until it finishes and returns its final state."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = requests.get(f"{BASE_URL}/jobs/{job_id}", headers=HEADERS).json()
+        if job.get("status") in ("done", "partial", "failed"):
+            return job
+        time.sleep(0.5)
+    return {"status": "timeout"}
+
 def run_test():
     session_id = f"wipe-test-{uuid.uuid4().hex[:6]}"
     print(f"\n[TEST] Verifying Wipe for Session: {session_id}")
@@ -37,13 +47,16 @@ def run_test():
         "sessionId": session_id
     }
     r = requests.post(f"{BASE_URL}/ingest/text", json=payload, headers=HEADERS)
-    if r.status_code != 200:
+    if r.status_code != 202:
         print(f"[FAIL] Ingest failed: {r.text}")
         return
-    print("   [OK] Ingest request successful.")
+    print("   [OK] Ingest request accepted.")
 
-    # Wait a moment for persistence (mostly instant for Mongo)
-    time.sleep(1)
+    # Ingestion runs in the background; wait for the job to finish
+    job = wait_for_job(r.json()["jobId"])
+    if job["status"] != "done":
+        print(f"[FAIL] Ingest job did not complete: {job}")
+        return
 
     # 3. Verify Not Empty
     print("3. Verifying persistence...")
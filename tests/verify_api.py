@@ -1,6 +1,7 @@
 import requests
 import os
 import sys
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,6 +15,15 @@ def print_result(name, result, error=None):
     else:
         print(f"[FAIL] {name} - {error}")
 
+def wait_for_job(job_id, headers, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = requests.get(f"{BASE_URL}/jobs/{job_id}", headers=headers).json()
+        if job.get("status") in ("done", "partial", "failed"):
+            return job
+        time.sleep(0.5)
+    return {"status": "timeout"}
+
 def test_health():
     try:
         r = requests.get(f"{BASE_URL}/health")
@@ -43,7 +53,7 @@ def test_ingest_auth():
             "sessionId": "test-session"
         }
         r = requests.post(f"{BASE_URL}/ingest/text", json=payload, headers=headers)
-        if r.status_code == 200:
+        if r.status_code == 202:
             print_result("Ingest Auth", True)
         else:
             print_result("Ingest Auth", False, f"Status {r.status_code} - {r.text}")
@@ -96,10 +106,14 @@ def test_logic_flow():
         "sessionId": session_id
     }
     r = requests.post(f"{BASE_URL}/ingest/text", json=payload, headers=headers)
-    if r.status_code == 200:
+    if r.status_code != 202:
+        print_result("Ingestion", False, r.text)
+        return
+    job = wait_for_job(r.json()["jobId"], headers)
+    if job["status"] == "done":
         print_result("Ingestion", True)
     else:
-        print_result("Ingestion", False, r.text)
+        print_result("Ingestion", False, f"Job {job['status']}: {job.get('error')}")
         return
 
     # 4. Verify Not Empty